@@ -0,0 +1,240 @@
+# bench_discovery.py — micro-benchmarks of GNU Radio discovery and the launcher's caches
+#
+# Runs against a synthetic tree, so no GNU Radio is needed (plain Linux is fine):
+#   * a PATH of --path-dirs directories, nested --depth deep, the first --slow of
+#     them "slow": every stat/scandir/listdir below them sleeps --slow-ms, like a
+#     network share; a fake GNU Radio prefix (launcher + pkg-config file) comes last
+#   * an experiments folder of --files files, only the shipped .grc among them
+#   * an experiment pack holding those flowgraphs and a --pack-mb recording
+# APPDATA, HOME and argv[0] point into the tree, so the real config is never
+# touched. Each function is timed cold (its in-memory and on-disk caches dropped
+# before every call, untimed) and warm (right after a call). Every timing runs
+# enough calls to last about --target-ms, so timer resolution and scheduler
+# jitter stay small next to it. The best of --repeat timings per case (steadier
+# than the median on a busy machine) is compared with the baseline, and the run
+# fails (exit 1) when a case is slower than baseline x --threshold and by more
+# than its floor: --floor-pct of the baseline plus this run's own spread
+# (median - best). --save records the baseline (per machine, under
+# benchmarks/baselines/); it is only compared with runs of the same fixture sizes.
+#
+#   python benchmarks/bench_discovery.py [--save] [--baseline FILE] [--threshold 1.5] [--repeat 7] [--json]
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "launcher"))
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / f"discovery-{platform.node() or 'local'}.json"
+
+
+class Fixture:
+    """The synthetic tree; paths only, built by build()."""
+    def __init__(self, root: Path, a):
+        self.root, self.a = root, a
+        self.home, self.appdata, self.app = root / "home", root / "appdata", root / "app"
+        self.exp = self.app / "experiments"
+        self.slow_root = root / "slow"
+        self.grc = root / "prefix" / "gnuradio-3.10.9" / "bin" / "gnuradio-companion"
+        self.path_dirs: list[Path] = []
+
+    def build(self):
+        a = self.a
+        for i in range(a.path_dirs):
+            base = self.slow_root if i < a.slow else self.root / "fast"
+            d = base.joinpath(*[f"d{i}_{k}" for k in range(a.depth)], "bin")
+            d.mkdir(parents=True)
+            for k in range(4): (d / f"tool{k}").write_bytes(b"")
+            self.path_dirs.append(d)
+        self.grc.parent.mkdir(parents=True)
+        self.grc.write_text("#!/bin/sh\nexit 0\n"); self.grc.chmod(0o755)
+        pc = self.grc.parent.parent / "lib" / "pkgconfig"; pc.mkdir(parents=True)
+        (pc / "gnuradio-runtime.pc").write_text("Name: gnuradio-runtime\nVersion: 3.10.9\n")
+        self.path_dirs.append(self.grc.parent)
+
+        # experiments: the real flowgraphs among thousands of other files
+        self.exp.mkdir(parents=True)
+        for i in range(a.files): (self.exp / f"note_{i:05d}.txt").write_bytes(b"x")
+        for g in sorted((ROOT / "experiments").glob("*.grc")): shutil.copy2(g, self.exp / g.name)
+        # conda-style homes: discovery walks their envs
+        for n in ("miniforge3", "radioconda"):
+            for e in range(10): (self.home / n / "envs" / f"env{e}" / "bin").mkdir(parents=True)
+        self.appdata.mkdir(parents=True)
+
+    def build_pack(self, packs_dir: Path):
+        from exp_packs import build_pack
+        src = self.root / "packsrc"; (src / "recordings").mkdir(parents=True)
+        for g in sorted((ROOT / "experiments").glob("*.grc")): shutil.copy2(g, src / g.name)
+        with open(src / "recordings" / "fm_recever_bench.iq", "wb") as f: f.truncate(self.a.pack_mb << 20)
+        (src / "recordings" / "fm_recever_bench.iq.json").write_text('{"samp_rate": 2000000.0}')
+        packs_dir.mkdir(parents=True, exist_ok=True)
+        build_pack(src, packs_dir / "bench.mmtpack", "bench", "1.0", "Benchmark pack")
+
+    def environ(self) -> dict:
+        env = {k: v for k, v in os.environ.items() if not k.startswith("MMT_") and not k.startswith("CONDA_")}
+        env.update(APPDATA=str(self.appdata), HOME=str(self.home), PATH=os.pathsep.join(map(str, self.path_dirs)))
+        return env
+
+
+@contextlib.contextmanager
+def slow_below(root: Path, delay_s: float):
+    """Every os.stat / os.scandir / os.listdir of a path under root sleeps delay_s first."""
+    prefix = str(root)
+    real = {n: getattr(os, n) for n in ("stat", "scandir", "listdir")}
+    def wrap(f):
+        def slow(path=".", *args, **kw):
+            if isinstance(path, (str, bytes, os.PathLike)) and os.fsdecode(path).startswith(prefix): time.sleep(delay_s)
+            return f(path, *args, **kw)
+        return slow
+    for n, f in real.items(): setattr(os, n, wrap(f))
+    try: yield
+    finally:
+        for n, f in real.items(): setattr(os, n, f)
+
+
+def cases(vl, fx: Fixture) -> list[tuple]:
+    """(function, variant, setup, call, cold); setup runs untimed before every call when cold, else once per timing."""
+    import exp_packs
+    cfg = vl._cfg_dir()
+    grc, missing = str(fx.grc), str(fx.root / "nowhere" / "gnuradio-companion")
+    def drop_mem(): vl._MEM.update(grc_path=None, exp_dir=None)
+    def drop_disk(*names):
+        for n in names: (cfg / n).unlink(missing_ok=True)
+    def cold_find(): drop_mem(); drop_disk("config.json")
+    def disk_find(): drop_mem(); vl._cache_set_grc_disk(grc)
+    def cold_expdir(): drop_mem(); drop_disk("experiments_dir.json")
+    def disk_expdir(): drop_mem(); vl._cache_set_expdir_disk(fx.exp)
+    catalog = {"c": None}
+    def cold_catalog(): drop_disk("catalog.json"); catalog["c"] = vl.ExperimentCatalog(vl._catalog_path())
+    packs = {"p": None}
+    def new_packs(): drop_disk("packs.json"); packs["p"] = exp_packs.PackIndex(cfg / "packs.json", cfg / "packcache")
+    def cold_extract():
+        shutil.rmtree(cfg / "packcache", ignore_errors=True)
+        if packs["p"] is None or not packs["p"].active: new_packs(); packs["p"].scan([vl._packs_dir()])
+    noop = lambda: None
+    return [
+        ("_is_grc_launcher", "hit", noop, lambda: vl._is_grc_launcher(grc), False),
+        ("_is_grc_launcher", "miss", noop, lambda: vl._is_grc_launcher(missing), False),
+        ("_cache_get_grc_disk", "no cache", lambda: drop_disk("config.json"), vl._cache_get_grc_disk, False),
+        ("_cache_get_grc_disk", "cached", lambda: vl._cache_set_grc_disk(grc), vl._cache_get_grc_disk, False),
+        ("find_gnuradio_companion", "cold", cold_find, vl.find_gnuradio_companion, True),
+        ("find_gnuradio_companion", "disk", disk_find, vl.find_gnuradio_companion, True),
+        ("find_gnuradio_companion", "warm", vl.find_gnuradio_companion, vl.find_gnuradio_companion, False),
+        ("resolve_experiments_dir", "cold", cold_expdir, vl.resolve_experiments_dir, True),
+        ("resolve_experiments_dir", "disk", disk_expdir, vl.resolve_experiments_dir, True),
+        ("resolve_experiments_dir", "warm", vl.resolve_experiments_dir, vl.resolve_experiments_dir, False),
+        ("ExperimentCatalog.scan", "cold", cold_catalog, lambda: catalog["c"].scan(fx.exp), True),
+        ("ExperimentCatalog.scan", "warm", lambda: catalog["c"].scan(fx.exp), lambda: catalog["c"].scan(fx.exp), False),
+        ("PackIndex.scan", "cold", new_packs, lambda: packs["p"].scan([vl._packs_dir()]), True),
+        ("PackIndex.scan", "warm", lambda: packs["p"].scan([vl._packs_dir()]), lambda: packs["p"].scan([vl._packs_dir()]), False),
+        ("PackIndex.extract", "cold", cold_extract, lambda: packs["p"].extract("bench!qam_16.grc"), True),
+        ("PackIndex.extract", "warm", lambda: packs["p"].extract("bench!qam_16.grc"),
+         lambda: packs["p"].extract("bench!qam_16.grc"), False),
+    ]
+
+
+def _timing(setup, call, cold: bool, n: int) -> float:
+    """Seconds spent in n calls (setups excluded)."""
+    if not cold:
+        setup(); t = time.perf_counter()
+        for _ in range(n): call()
+        return time.perf_counter() - t
+    spent = 0.0
+    for _ in range(n):
+        setup(); t = time.perf_counter(); call(); spent += time.perf_counter() - t
+    return spent
+
+
+def measure(setup, call, cold: bool, repeat: int, target_ms: float) -> dict:
+    """Per-call ms over repeat timings of about target_ms each."""
+    one = max(_timing(setup, call, cold, 1), 1e-7)
+    n = max(1, math.ceil(target_ms / 1e3 / one))
+    runs = [_timing(setup, call, cold, n) / n * 1e3 for _ in range(repeat)]
+    return {"median_ms": statistics.median(runs), "min_ms": min(runs), "calls": n * repeat}
+
+
+def compare(results: dict, baseline: dict, threshold: float, floor_pct: float) -> dict[str, str]:
+    """Case -> "ok" / "REGRESSED" / "faster" / "new" against the baseline's best timings."""
+    out = {}
+    for k, r in results.items():
+        b = baseline.get(k)
+        if b is None: out[k] = "new"; continue
+        m, bm = r["min_ms"], b["min_ms"]
+        floor = bm * floor_pct / 100 + (r["median_ms"] - m)    # scaled to the case, plus this run's noise
+        out[k] = ("REGRESSED" if m > bm * threshold and m - bm > floor else
+                  "faster" if bm > m * threshold and bm - m > floor else "ok")
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Micro-benchmarks of GNU Radio discovery and the launcher's caches")
+    ap.add_argument("--path-dirs", type=int, default=300, help="directories on the synthetic PATH")
+    ap.add_argument("--depth", type=int, default=6, help="nesting of each PATH directory")
+    ap.add_argument("--slow", type=int, default=40, help="how many PATH directories are slow")
+    ap.add_argument("--slow-ms", type=float, default=2.0, help="latency of every filesystem call under a slow directory")
+    ap.add_argument("--files", type=int, default=5000, help="other files in the experiments folder")
+    ap.add_argument("--pack-mb", type=int, default=64, help="size of the recording in the experiment pack")
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--save", action="store_true", help="store these results as the baseline")
+    ap.add_argument("--threshold", type=float, default=1.5, help="fail when a best timing exceeds baseline x this")
+    ap.add_argument("--floor-pct", type=float, default=25.0,
+                    help="ignore differences below this share of the baseline (plus the run's spread)")
+    ap.add_argument("--target-ms", type=float, default=10.0, help="length of every timing")
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    a = ap.parse_args()
+    params = {k: getattr(a, k) for k in ("path_dirs", "depth", "slow", "slow_ms", "files", "pack_mb", "target_ms")}
+
+    with tempfile.TemporaryDirectory(prefix="mmt_bench_") as tmp:
+        fx = Fixture(Path(tmp), a); fx.build()
+        os.environ.clear(); os.environ.update(fx.environ())
+        sys.argv[0] = str(fx.app / "virtual_lab_launcher.py")      # app_base_dir() -> the fixture
+        import virtual_lab_launcher as vl                           # reads config at import: only after the env is set
+        fx.build_pack(vl._packs_dir())
+        results = {}
+        with slow_below(fx.slow_root, a.slow_ms / 1e3):
+            for name, variant, setup, call, cold in cases(vl, fx):
+                results[f"{name} [{variant}]"] = measure(setup, call, cold, a.repeat, a.target_ms)
+        found = vl.find_gnuradio_companion()
+        if found != str(fx.grc):
+            print(f"discovery found {found!r}, expected the fixture's {fx.grc}", file=sys.stderr); return 2
+
+    base = {}
+    try: base = json.loads(a.baseline.read_text(encoding="utf-8"))
+    except (OSError, ValueError): pass
+    comparable = base.get("params") == params and base.get("python") == platform.python_version()
+    status = compare(results, base.get("results", {}) if comparable else {}, a.threshold, a.floor_pct)
+    if a.save:
+        a.baseline.parent.mkdir(parents=True, exist_ok=True)
+        a.baseline.write_text(json.dumps({"params": params, "python": platform.python_version(), "machine": platform.node(),
+                                          "saved": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, indent=1),
+                              encoding="utf-8")
+    regressed = [k for k, s in status.items() if s == "REGRESSED"]
+
+    if a.json:
+        print(json.dumps({"params": params, "baseline": str(a.baseline) if comparable else None, "threshold": a.threshold,
+                          "results": {k: {**r, "status": status[k]} for k, r in results.items()}}, indent=2))
+    else:
+        bres = base.get("results", {}) if comparable else {}
+        print(f"{'case':<46}{'median ms':>11}{'min ms':>10}{'baseline':>11}  status")
+        for k, r in results.items():
+            b = f"{bres[k]['min_ms']:.4f}" if k in bres else "-"
+            print(f"{k:<46}{r['median_ms']:>11.4f}{r['min_ms']:>10.4f}{b:>11}  {status[k]}")
+        if base and not comparable:
+            print(f"\n{a.baseline} was recorded with other fixture sizes or another Python; not compared (--save to replace it).")
+        elif not base and not a.save:
+            print(f"\nNo baseline at {a.baseline}; run with --save to record one.")
+        if a.save: print(f"\nbaseline saved: {a.baseline}")
+    return 1 if regressed and not a.save else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
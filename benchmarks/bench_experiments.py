@@ -0,0 +1,56 @@
+# bench_experiments.py — headless throughput of every shipped experiment
+#
+# Each .grc is rewritten by grc_headless (GUI sinks -> head + null sink,
+# optionally without its throttle), compiled with grcc and run to completion.
+# Reports samples/s (over the flowgraph run only), run and process wall time,
+# CPU time and peak RSS per experiment as a table or JSON.
+# Run it with GNU Radio's python (or set MMT_GR_PYTHON to it):
+#
+#   python benchmarks/bench_experiments.py [experiments_dir or .grc …] [--samples N] [--no-throttle] [--json out.json]
+import argparse, json, platform, sys, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "launcher"))
+from grc_headless import gr_python, run_headless
+
+
+def _fmt(v, spec):
+    return format(v, spec) if isinstance(v, (int, float)) else "-"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Headless throughput benchmark over the experiments")
+    ap.add_argument("paths", nargs="*", default=[str(Path(__file__).resolve().parent.parent / "experiments")])
+    ap.add_argument("--samples", type=int, default=2_000_000, help="items pushed through each displayed stream")
+    ap.add_argument("--no-throttle", action="store_true", help="bypass blocks_throttle to measure raw throughput")
+    ap.add_argument("--timeout", type=float, default=300.0)
+    ap.add_argument("--json", metavar="FILE", help="also write results as JSON ('-' for stdout only)")
+    a = ap.parse_args()
+
+    files = []
+    for p in map(Path, a.paths):
+        files += sorted(p.glob("*.grc")) if p.is_dir() else [p]
+    results = []
+    for f in files:
+        print(f"… {f.name}", file=sys.stderr, flush=True)
+        results.append(run_headless(f, a.samples, keep_throttle=not a.no_throttle, timeout=a.timeout))
+
+    doc = {"when": time.strftime("%Y-%m-%dT%H:%M:%S"), "host": platform.node(), "machine": platform.machine(),
+           "python": gr_python(), "samples": a.samples, "throttle": not a.no_throttle, "results": results}
+    if a.json == "-":
+        print(json.dumps(doc, indent=2)); return 0
+    if a.json:
+        Path(a.json).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    print(f"{'experiment':<20}{'Msamples/s':>12}{'run s':>9}{'wall s':>9}{'cpu s':>9}{'cpu %':>8}{'peak MiB':>10}  note")
+    for r in results:
+        note = r.get("skipped") or r.get("error") or ""
+        sps = r.get("samples_per_s")
+        print(f"{r['experiment']:<20}{_fmt(sps / 1e6 if sps else None, '.2f'):>12}{_fmt(r.get('run_s'), '.2f'):>9}{_fmt(r.get('wall_s'), '.2f'):>9}"
+              f"{_fmt(r.get('cpu_s'), '.2f'):>9}{_fmt(r['cpu_util'] * 100 if r.get('cpu_util') is not None else None, '.0f'):>8}"
+              f"{_fmt(r.get('peak_rss_mb'), '.0f'):>10}  {note}")
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# bench_warm_pool.py — cold vs. warm GRC time-to-window
+#
+# Cold: spawn a GRC host and hand it the .grc straight away (full interpreter +
+#       gnuradio + GTK import on the clock, same as a plain `-m gnuradio.grc`).
+# Warm: spawn a host, wait until it reports imports done, then start the clock
+#       at handoff — what a click costs when the pool has a ready host.
+# "Window" is the first GLib idle after GRC built its main window.
+#
+#   python benchmarks/bench_warm_pool.py [experiment.grc] [--rounds 3] [--timeout 60]
+import argparse, json, queue, statistics, subprocess, sys, threading, time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "launcher"))
+import virtual_lab_launcher as vl
+
+
+def _spawn_host(argv: list[str], wd: str) -> tuple[subprocess.Popen, queue.Queue]:
+    proc = subprocess.Popen(argv, cwd=wd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT, text=True, bufsize=1)
+    lines: queue.Queue = queue.Queue()
+    def pump():
+        for line in proc.stdout: lines.put(line.strip())
+        lines.put(None)
+    threading.Thread(target=pump, daemon=True).start()
+    return proc, lines
+
+
+def _wait_for(lines: queue.Queue, marker: str, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        left = deadline - time.monotonic()
+        if left <= 0: return False
+        try: line = lines.get(timeout=left)
+        except queue.Empty: return False
+        if line is None: return False
+        if line == marker: return True
+
+
+def _one(argv, wd, grc_file: str, warm: bool, timeout: float) -> float | None:
+    proc, lines = _spawn_host(argv, wd)
+    try:
+        if warm and not _wait_for(lines, vl._HOST_READY, timeout): return None
+        t0 = time.monotonic()
+        proc.stdin.write(grc_file + "\n"); proc.stdin.flush()
+        return time.monotonic() - t0 if _wait_for(lines, vl._HOST_WINDOW, timeout) else None
+    finally:
+        proc.kill(); proc.wait()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Cold vs. warm GRC time-to-window")
+    ap.add_argument("grc", nargs="?", help="flowgraph to open (default: first experiment)")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    ap.add_argument("--json", action="store_true", help="print results as JSON")
+    a = ap.parse_args()
+
+    grc = vl.find_gnuradio_companion()
+    if not grc:
+        print("GNU Radio Companion was not found on this system.", file=sys.stderr); return 2
+    pool = vl.GrcWarmPool(vl._PROCS, 1)
+    spec = pool._host_argv(grc)
+    if not spec:
+        print(f"No python next to {grc}; the warm pool can't host GRC here.", file=sys.stderr); return 2
+    argv, wd = spec
+    grc_file = a.grc or str((vl.resolve_experiments_dir() or Path(".")) / next(iter(vl.experiments().values())))
+
+    res = {}
+    for mode in ("cold", "warm"):
+        runs = [_one(argv, wd, grc_file, mode == "warm", a.timeout) for _ in range(a.rounds)]
+        ok = [r for r in runs if r is not None]
+        res[mode] = {"runs_s": ok, "failed": len(runs) - len(ok),
+                     "median_s": statistics.median(ok) if ok else None}
+
+    if a.json:
+        print(json.dumps({"grc": grc, "file": grc_file, **res}, indent=2)); return 0
+    print(f"GRC:  {grc}\nFile: {grc_file}")
+    for mode, r in res.items():
+        med = f"{r['median_s']:.2f}s" if r["median_s"] is not None else "n/a"
+        print(f"  {mode:<5} median {med:>8}  runs {[round(x, 2) for x in r['runs_s']]}  failed {r['failed']}")
+    if res["cold"]["median_s"] and res["warm"]["median_s"]:
+        print(f"  speed-up x{res['cold']['median_s'] / res['warm']['median_s']:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,12 @@
 setlocal ENABLEDELAYEDEXPANSION
 
 rem === MMT Virtual Lab — Qt Launcher build (matching your filenames) ===
+rem   build_launcher_qt.bat            one-folder build (default): dist\virtual_lab_launcher\
+rem                                    starts fast, nothing is unpacked per launch
+rem   build_launcher_qt.bat onefile    single dist\virtual_lab_launcher.exe (unpacks to %%TEMP%% on every start)
+
+set "MODE=onedir"
+if /i "%~1"=="onefile" set "MODE=onefile"
 
 set "PROJ=%~dp0"
 cd /d "%PROJ%"
@@ -40,24 +46,31 @@ set "VENV_PY=.venv\Scripts\python.exe"
 echo Upgrading pip/setuptools/wheel...
 "%VENV_PY%" -m pip install --upgrade pip setuptools wheel || (echo [ERROR] pip upgrade failed & exit /b 1)
 
-echo Installing PySide6 + PyInstaller...
-"%VENV_PY%" -m pip install PySide6 pyinstaller || (echo [ERROR] deps install failed & exit /b 1)
+echo Installing PySide6 + PyYAML + NumPy + PyInstaller...
+"%VENV_PY%" -m pip install PySide6 pyyaml numpy pyinstaller || (echo [ERROR] deps install failed & exit /b 1)
 
 if exist build rd /s /q build
 if exist dist rd /s /q dist
 if exist virtual_lab_launcher.spec del /q virtual_lab_launcher.spec
 
-echo Building EXE (name: virtual_lab_launcher.exe)...
-".venv\Scripts\pyinstaller.exe" --onefile --noconsole ^
+rem The Qt window (lab_window) and the capture viewer are imported lazily; name them
+rem so PyInstaller bundles them. Tk is never used.
+echo Building EXE (name: virtual_lab_launcher.exe, %MODE%)...
+".venv\Scripts\pyinstaller.exe" --%MODE% --noconsole ^
   --name virtual_lab_launcher ^
+  --paths launcher ^
+  --hidden-import lab_window --hidden-import capture_viewer ^
+  --exclude-module tkinter ^
   launcher\virtual_lab_launcher.py || (echo [ERROR] build failed & exit /b 1)
 
-if not exist "dist\virtual_lab_launcher.exe" (
-  echo [ERROR] Expected dist\virtual_lab_launcher.exe not found.
+set "OUT=dist\virtual_lab_launcher.exe"
+if /i "%MODE%"=="onedir" set "OUT=dist\virtual_lab_launcher\virtual_lab_launcher.exe"
+if not exist "%OUT%" (
+  echo [ERROR] Expected %OUT% not found.
   exit /b 1
 )
 
 echo.
-echo Build SUCCESS: %CD%\dist\virtual_lab_launcher.exe
+echo Build SUCCESS: %CD%\%OUT%
 pause
 exit /b 0
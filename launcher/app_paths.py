@@ -0,0 +1,20 @@
+# app_paths.py — the one config/cache folder shared by the launcher and its tools
+#
+# %APPDATA%\MMT\VirtualLab when APPDATA is set (Windows), else MMT/VirtualLab
+# next to the launcher: beside the frozen .exe, or in this source folder. It does
+# not follow sys.argv[0], so a tool or benchmark started from another folder
+# finds the same caches, trace and config as the launcher.
+import os
+import sys
+from pathlib import Path
+
+
+def launcher_dir() -> Path:
+    """Folder of the frozen .exe, or of this file when run from source."""
+    return Path(sys.executable if getattr(sys, "frozen", False) else os.path.abspath(__file__)).parent
+
+
+def cfg_dir() -> Path:
+    d = Path(os.getenv("APPDATA") or launcher_dir()) / "MMT" / "VirtualLab"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
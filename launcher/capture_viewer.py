@@ -0,0 +1,273 @@
+# capture_viewer.py — offline Time / Spectrum / Constellation view of IQ captures
+#
+# Opened from the launcher ("View captures…"). All numbers come from
+# iq_capture.Capture, which memory-maps the raw file and only reads what a
+# window needs, so scrubbing stays interactive on multi-GB recordings. The
+# min/max pyramid behind wide time windows is built on a worker thread (a
+# coarse envelope is drawn until it is ready), and a capture that is still
+# being written is re-mapped as it grows.
+# ReferencePreview shows the same plots for an experiment's NumPy reference
+# model (ref_models), so the launcher can preview it without GNU Radio.
+from pathlib import Path
+
+import numpy as np
+from PySide6.QtCore import Qt, QTimer, QPointF, QRect, QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QColor, QImage, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import (
+    QComboBox, QDialog, QGridLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem,
+    QPushButton, QSizePolicy, QSlider, QSplitter, QVBoxLayout, QWidget
+)
+
+from iq_capture import Capture, list_captures
+from ref_models import RRC_SPAN, reference, rrc_taps
+
+SPANS = [("1 k", 1_000), ("10 k", 10_000), ("100 k", 100_000), ("1 M", 1_000_000),
+         ("10 M", 10_000_000), ("100 M", 100_000_000), ("All", 0)]
+NFFTS = (256, 1024, 4096, 16384)
+I_PEN, Q_PEN = QColor("#0A66C2"), QColor("#E67E22")
+GRID = QColor("#DFE3EA")
+GROW_POLL_MS = 1000          # how often an open capture is checked for new samples
+
+
+def _lut() -> np.ndarray:
+    """white -> brand blue -> near black, as 0xAARRGGBB."""
+    x = np.linspace(0, 1, 256)
+    stops, cols = [0, 0.5, 1], np.array([[255, 255, 255], [10, 102, 194], [10, 20, 40]])
+    rgb = np.stack([np.interp(x, stops, cols[:, k]) for k in range(3)], axis=1).astype(np.uint32)
+    return 0xFF000000 | (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+
+
+class _Plot(QWidget):
+    """Plain QPainter plot: a title, a frame and whatever draw() puts inside."""
+
+    def __init__(self, title: str):
+        super().__init__()
+        self.title = title; self.note = ""
+        self.setMinimumSize(260, 160); self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def inner(self):
+        return self.rect().adjusted(8, 22, -8, -8)
+
+    def paintEvent(self, _):
+        p = QPainter(self); p.fillRect(self.rect(), Qt.white)
+        p.setPen(QColor("#6B7280")); p.drawText(8, 15, f"{self.title}   {self.note}")
+        r = self.inner(); p.setPen(GRID); p.drawRect(r)
+        p.setRenderHint(QPainter.Antialiasing, False)
+        self.draw(p, r)
+
+    def draw(self, p: QPainter, r):
+        pass
+
+
+class EnvelopePlot(_Plot):
+    def set_data(self, mm: np.ndarray):
+        self.mm = mm; self.update()
+
+    def draw(self, p, r):
+        mm = getattr(self, "mm", None)
+        if mm is None or not len(mm): return
+        lo, hi = float(mm.min()), float(mm.max())
+        if hi <= lo: hi = lo + 1
+        sy = (r.height() - 2) / (hi - lo); sx = r.width() / len(mm)
+        y = lambda v: r.bottom() - 1 - (v - lo) * sy
+        for k, pen in ((0, I_PEN), (2, Q_PEN))[: mm.shape[1] // 2]:
+            p.setPen(QPen(pen, 1))
+            for i, (a, b) in enumerate(mm[:, k:k + 2]):
+                x = r.left() + i * sx
+                p.drawLine(QPointF(x, y(a)), QPointF(x, y(b) - 0.5))
+
+
+class SpectrumPlot(_Plot):
+    def set_data(self, freqs: np.ndarray, db: np.ndarray):
+        self.freqs, self.db = freqs, db; self.update()
+
+    def draw(self, p, r):
+        db = getattr(self, "db", None)
+        if db is None or not len(db): return
+        lo, hi = float(np.percentile(db, 1)) - 3, float(db.max()) + 3
+        xs = np.linspace(r.left(), r.right(), len(db))
+        ys = r.bottom() - (np.clip(db, lo, hi) - lo) / (hi - lo) * r.height()
+        p.setRenderHint(QPainter.Antialiasing, True); p.setPen(QPen(I_PEN, 1.2))
+        p.drawPolyline(QPolygonF([QPointF(a, b) for a, b in zip(xs, ys)]))
+
+
+class DensityPlot(_Plot):
+    _LUT = None
+
+    def set_data(self, dens):
+        self.img = None
+        if dens is not None:
+            h, _ = dens
+            if DensityPlot._LUT is None: DensityPlot._LUT = _lut()
+            idx = (h / (h.max() or 1) * 255).astype(np.uint8)
+            argb = np.ascontiguousarray(DensityPlot._LUT[idx])
+            self.img = QImage(argb.data, argb.shape[1], argb.shape[0], argb.shape[1] * 4, QImage.Format_RGB32).copy()
+        self.update()
+
+    def draw(self, p, r):
+        img = getattr(self, "img", None)
+        if img is None:
+            p.setPen(QColor("#6B7280")); p.drawText(r, Qt.AlignCenter, getattr(self, "empty", "real-valued capture")); return
+        side = min(r.width(), r.height()) - 2
+        tgt = QRect(r.left() + (r.width() - side) // 2, r.top() + (r.height() - side) // 2, side, side)
+        p.setRenderHint(QPainter.SmoothPixmapTransform, False)
+        p.drawImage(tgt, img)
+
+
+class ReferencePreview(QWidget):
+    """Spectrum + time/constellation thumbnails of an experiment's reference model."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.spec, self.time, self.const = SpectrumPlot("Reference spectrum"), EnvelopePlot("Time"), DensityPlot("Constellation")
+        self.const.empty = "analog"
+        l = QHBoxLayout(self); l.setContentsMargins(0, 0, 0, 0); l.setSpacing(6)
+        for w in (self.spec, self.time, self.const):
+            w.setMinimumSize(120, 100); l.addWidget(w, 2 if w is self.spec else 1)
+        self.setFixedHeight(120)
+
+    def show_reference(self, grc) -> bool:
+        """Plot grc's reference; hides itself (False) when there is no model for it."""
+        try:
+            ref = reference(grc)
+        except (ValueError, OSError, KeyError, StopIteration, TypeError):
+            self.hide(); return False
+        p, x = ref["params"], ref["x"]
+        self.spec.note = p["kind"].upper(); self.spec.set_data(ref["freqs"], ref["psd_db"])
+        # Time: a few hundred samples, or a few dozen symbols
+        n = min(len(x), 48 * p["sps"] if "sps" in p else 384)
+        edges = np.linspace(0, n, min(n, 128), endpoint=False).astype(np.int64)
+        comps = (x.real[:n], x.imag[:n]) if np.iscomplexobj(x) else (x[:n],)
+        self.time.set_data(np.stack([f(c, edges) for c in comps for f in (np.minimum.reduceat, np.maximum.reduceat)], axis=1))
+        if len(ref["points"]):
+            sps = p["sps"]; y = np.convolve(x, rrc_taps(sps, p["excess_bw"])[::-1] / sps)[RRC_SPAN * sps::sps]
+            lim = float(np.abs(ref["points"]).max()) * 1.5
+            h, _, _ = np.histogram2d(y.imag, y.real, bins=64, range=[[-lim, lim], [-lim, lim]])
+            self.const.set_data((np.log10(1 + h[::-1]), lim))
+        else:
+            self.const.set_data(None)
+        self.show(); return True
+
+
+class _LodSignals(QObject):
+    done = Signal(object)        # the Capture whose pyramid is built
+
+
+class _LodJob(QRunnable):
+    """Capture.lod() on a pool thread; it reads the whole file the first time."""
+
+    def __init__(self, cap: Capture):
+        super().__init__()
+        self.cap, self.signals = cap, _LodSignals()
+        self.setAutoDelete(False)    # the viewer holds the Python object; Qt must not delete it too
+
+    def run(self):
+        try: self.cap.lod()
+        except (OSError, ValueError, MemoryError): pass
+        self.signals.done.emit(self.cap)
+
+
+class CaptureViewer(QDialog):
+    def __init__(self, root: Path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Captures"); self.resize(1100, 640)
+        self.root = Path(root); self.cap: Capture | None = None
+        self._redraw = QTimer(self); self._redraw.setSingleShot(True); self._redraw.setInterval(30)
+        self._redraw.timeout.connect(self._render)
+        self._pool = QThreadPool(self); self._pool.setMaxThreadCount(1)
+        self._lod_job: _LodJob | None = None
+        self._size = -1
+        self._grow = QTimer(self); self._grow.setInterval(GROW_POLL_MS); self._grow.timeout.connect(self._poll_growth)
+        self._grow.start()
+
+        self.files = QListWidget(); self.files.currentItemChanged.connect(self._open_selected)
+        btn_reload = QPushButton("Reload"); btn_reload.clicked.connect(self.reload)
+        left = QWidget(); ll = QVBoxLayout(left); ll.setContentsMargins(0, 0, 0, 0)
+        ll.addWidget(self.files, 1); ll.addWidget(btn_reload)
+
+        self.time, self.spec, self.const = EnvelopePlot("Time"), SpectrumPlot("Spectrum"), DensityPlot("Constellation")
+        plots = QWidget(); g = QGridLayout(plots); g.setContentsMargins(0, 0, 0, 0)
+        g.addWidget(self.time, 0, 0, 1, 2); g.addWidget(self.spec, 1, 0); g.addWidget(self.const, 1, 1)
+
+        self.pos = QSlider(Qt.Horizontal); self.pos.setRange(0, 10_000); self.pos.valueChanged.connect(self._redraw.start)
+        self.span = QComboBox(); [self.span.addItem(t, n) for t, n in SPANS]; self.span.setCurrentIndex(2)
+        self.nfft = QComboBox(); [self.nfft.addItem(str(n), n) for n in NFFTS]; self.nfft.setCurrentIndex(1)
+        for c in (self.span, self.nfft): c.currentIndexChanged.connect(self._redraw.start)
+        self.info = QLabel(""); self.info.setStyleSheet("color: #6B7280;")
+        ctl = QHBoxLayout(); ctl.addWidget(QLabel("Position")); ctl.addWidget(self.pos, 1)
+        ctl.addWidget(QLabel("Span")); ctl.addWidget(self.span); ctl.addWidget(QLabel("FFT")); ctl.addWidget(self.nfft)
+
+        right = QWidget(); rl = QVBoxLayout(right); rl.setContentsMargins(0, 0, 0, 0)
+        rl.addWidget(plots, 1); rl.addLayout(ctl); rl.addWidget(self.info)
+        split = QSplitter(); split.addWidget(left); split.addWidget(right); split.setSizes([260, 840])
+        QVBoxLayout(self).addWidget(split)
+        self.reload()
+
+    def reload(self):
+        current = self.cap.path if self.cap else None
+        self.files.clear()
+        for p in list_captures(self.root):
+            it = QListWidgetItem(f"{p.parent.name} / {p.stem}"); it.setData(Qt.UserRole, str(p)); self.files.addItem(it)
+            if current == p: self.files.setCurrentItem(it)
+        if self.files.currentItem() is None and self.files.count(): self.files.setCurrentRow(0)
+
+    def open_path(self, path: Path):
+        for i in range(self.files.count()):
+            if self.files.item(i).data(Qt.UserRole) == str(path): self.files.setCurrentRow(i); return
+
+    def _open_selected(self, it, _prev=None):
+        if it is None: return
+        try:
+            self.cap = Capture(it.data(Qt.UserRole)); self._size = self.cap.path.stat().st_size
+        except (OSError, ValueError, RuntimeError) as e:
+            self.cap = None; self.info.setText(f"Can't open capture: {e}"); return
+        self._redraw.start()
+
+    def _poll_growth(self):
+        """Pick up samples a running flowgraph appended since the last look."""
+        cap = self.cap
+        if cap is None: return
+        try: size = cap.path.stat().st_size
+        except OSError: return
+        if size == self._size: return
+        self._size = size
+        try: cap.refresh()
+        except (OSError, ValueError): return
+        self._redraw.start()
+
+    def _build_lod(self, cap: Capture):
+        if self._lod_job is not None: return     # one at a time; _lod_done looks again
+        self._lod_job = job = _LodJob(cap)
+        job.signals.done.connect(self._lod_done)
+        self._pool.start(job)
+
+    def _lod_done(self, cap):
+        self._lod_job = None
+        if cap is self.cap: self._redraw.start()
+
+    def _window(self) -> tuple[int, int]:
+        n = len(self.cap); span = self.span.currentData() or n
+        span = min(span, n)
+        start = int((n - span) * self.pos.value() / self.pos.maximum())
+        return start, start + span
+
+    def _render(self):
+        cap = self.cap
+        if cap is None: return
+        if not len(cap):
+            self.info.setText("empty capture (run the flowgraph to record)"); return
+        a, b = self._window()
+        fs = cap.samp_rate
+        bins = max(1, self.time.inner().width())
+        coarse = cap.needs_lod(a, b, bins) and not cap.lod_ready()
+        _, mm = cap.envelope(a, b, bins, coarse_ok=True)
+        if coarse: self._build_lod(cap)
+        self.time.note = f"{a / fs:.4f} s … {b / fs:.4f} s" + ("   (coarse, building overview…)" if coarse else "")
+        self.time.set_data(mm)
+        f, db = cap.welch(a, b, self.nfft.currentData())
+        self.spec.note = f"±{fs / 2:,.0f} Hz" if cap.is_complex else f"0 … {fs / 2:,.0f} Hz"; self.spec.set_data(f, db)
+        dens = cap.density(a, b)
+        self.const.note = f"±{dens[1]:.3g}" if dens else ""; self.const.set_data(dens)
+        m = cap.meta
+        self.info.setText(f"{m.get('experiment', '?')}  {m.get('sink', '')}  {cap.dtype.name}  {fs:,.0f} S/s  "
+                          f"{len(cap):,} samples ({cap.duration_s:.2f} s, {cap.path.stat().st_size / 2 ** 20:,.0f} MiB)")
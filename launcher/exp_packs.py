@@ -0,0 +1,276 @@
+# exp_packs.py — experiment packs: one versioned zip with a manifest, flowgraphs and recordings
+#
+# A pack (*.mmtpack, a plain zip) holds manifest.json next to its files:
+#   {"id": "mmt-comms", "version": "1.2", "title": "Communication systems",
+#    "experiments": [{"file": "qam_16.grc", "title": "16-QAM", "category": …, "description": …}],
+#    "files": {"qam_16.grc": {"sha256": …, "size": …}, "recordings/fm_recever_1.iq": {…}, …}}
+# The launcher reads only the manifest (the zip's central directory plus one
+# member) and remembers it per pack in packs.json keyed by (mtime, size), so a
+# start with unchanged packs costs one stat() each, whatever their size. The
+# experiments appear in the catalog as "<pack id>!<file>"; a file is extracted
+# on first use into a content-addressed cache (packcache/<sha256>/<name>,
+# checked against the manifest hash) and the cache is trimmed, least recently
+# used first, to a size limit. Packs are looked for in the experiments folder
+# and the packs folder; with one id in several packs the highest version wins.
+# Recordings (recordings/<experiment stem>*.iq + .iq.json sidecar) are only
+# extracted when the SDR replay needs them.
+#
+#   python launcher/exp_packs.py build experiments/ -o comms.mmtpack --id mmt-comms --version 1.0 [--title T]
+#   python launcher/exp_packs.py list comms.mmtpack [--json]
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import zipfile
+from pathlib import Path
+
+PACK_EXT = ".mmtpack"
+MANIFEST = "manifest.json"
+REF_SEP = "!"                     # "<pack id>!<file in pack>"
+
+
+def is_pack_ref(fn: str) -> bool:
+    return REF_SEP in fn
+
+
+def _version_key(v: str) -> tuple:
+    # numeric parts compare as numbers; a text part (2.0-rc1) sorts before the release it leads to
+    parts = [(2, int(x)) if x.isdigit() else (0, x) for x in re.split(r"[.\-+]", str(v)) if x]
+    return tuple(parts + [(1, "")])
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+    return h.hexdigest()
+
+
+def read_manifest(pack) -> dict:
+    """The validated manifest of one pack (raises ValueError / zipfile.BadZipFile / OSError)."""
+    pack = Path(pack)
+    with zipfile.ZipFile(pack) as zf:
+        try: doc = json.loads(zf.read(MANIFEST).decode("utf-8"))
+        except KeyError: raise ValueError(f"{pack.name}: no {MANIFEST}") from None
+        names = set(zf.namelist())
+    files = doc.get("files")
+    if not isinstance(files, dict): raise ValueError(f"{pack.name}: manifest has no files table")
+    for member, rec in files.items():
+        if member not in names: raise ValueError(f"{pack.name}: {member} is in the manifest but not in the archive")
+        if not isinstance(rec, dict) or not rec.get("sha256"): raise ValueError(f"{pack.name}: {member} has no sha256")
+    doc["id"] = str(doc.get("id") or pack.stem)
+    doc["version"] = str(doc.get("version") or "0")
+    doc["experiments"] = [e for e in doc.get("experiments") or [] if isinstance(e, dict) and e.get("file") in files]
+    return doc
+
+
+class PackIndex:
+    """
+    Manifests of the packs found in some folders, persisted in `index_path`,
+    plus the extraction cache under `cache_dir` (bounded to `limit_bytes`).
+    """
+    def __init__(self, index_path: Path, cache_dir: Path, limit_bytes: int = 2 << 30):
+        self.index_path, self.cache_dir, self.limit = Path(index_path), Path(cache_dir), limit_bytes
+        self._lock = threading.Lock()
+        try: data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError): data = {}
+        self.seen: dict[str, dict] = data.get("packs") or {}      # pack path -> {mtime, size, manifest | error}
+        self.active: dict[str, dict] = self._select(self.seen)   # pack id -> seen entry (+ path)
+
+    @staticmethod
+    def _select(seen: dict) -> dict:
+        active = {}
+        for path, e in seen.items():
+            m = e.get("manifest")
+            if not m: continue
+            cur = active.get(m["id"])
+            if cur is None or _version_key(m["version"]) > _version_key(cur["manifest"]["version"]):
+                active[m["id"]] = {**e, "path": path}
+        return active
+
+    def scan(self, dirs) -> bool:
+        """Bring the index in line with the *.mmtpack files in dirs; True if anything changed."""
+        seen, changed = {}, False
+        for d in dict.fromkeys(Path(d) for d in dirs if d):
+            try: packs = [Path(e.path) for e in os.scandir(d) if e.name.lower().endswith(PACK_EXT) and e.is_file()]
+            except OSError: continue
+            for p in packs:
+                try: st = p.stat()
+                except OSError: continue
+                prev = self.seen.get(str(p))
+                if prev and prev.get("mtime") == st.st_mtime and prev.get("size") == st.st_size:
+                    seen[str(p)] = prev; continue
+                try: entry = {"manifest": read_manifest(p)}
+                except (OSError, ValueError, zipfile.BadZipFile) as e: entry = {"error": f"{type(e).__name__}: {e}"}
+                seen[str(p)] = {"mtime": st.st_mtime, "size": st.st_size, **entry}
+                changed = True
+        changed = changed or seen.keys() != self.seen.keys()
+        if changed:
+            with self._lock:
+                self.seen, self.active = seen, self._select(seen)
+            try:
+                self.index_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps({"packs": seen}, indent=1), encoding="utf-8"); os.replace(tmp, self.index_path)
+            except OSError:
+                pass
+        return changed
+
+    def experiments(self) -> dict[str, dict]:
+        """Catalog entries of the active packs: ref -> {title, category, description, pack, version}."""
+        with self._lock:
+            active = dict(self.active)
+        out = {}
+        for pid, e in sorted(active.items()):
+            m = e["manifest"]
+            for x in m["experiments"]:
+                out[f"{pid}{REF_SEP}{x['file']}"] = {
+                    "title": x.get("title") or Path(x["file"]).stem.replace("_", " "),
+                    "category": x.get("category") or m.get("title") or pid,
+                    "description": x.get("description") or "", "pack": pid, "version": m["version"]}
+        return out
+
+    def paths(self) -> list[str]:
+        with self._lock:
+            return [e["path"] for e in self.active.values()]
+
+    def errors(self) -> dict[str, str]:
+        with self._lock:
+            return {p: e["error"] for p, e in self.seen.items() if e.get("error")}
+
+    def _member(self, ref: str) -> tuple[dict, str, dict]:
+        pid, _, member = ref.partition(REF_SEP)
+        with self._lock:
+            e = self.active.get(pid)
+        if not e: raise KeyError(f"experiment pack {pid!r} is not installed")
+        rec = e["manifest"]["files"].get(member)
+        if not rec: raise KeyError(f"{member} is not in pack {pid}")
+        return e, member, rec
+
+    # ----- extraction cache -----
+    def extract(self, ref: str) -> Path:
+        """Path of a pack file on disk, extracted (and hash-checked) on first use."""
+        e, member, rec = self._member(ref)
+        sha = rec["sha256"]
+        out = self.cache_dir / sha / Path(member).name
+        if out.is_file() and out.stat().st_size == rec.get("size", out.stat().st_size):
+            try: os.utime(out.parent)                  # LRU stamp
+            except OSError: pass
+            return out
+        with zipfile.ZipFile(e["path"]) as zf:
+            self._unzip(zf, member, out, sha)
+            side = f"{member}.json"                    # recordings: iq_capture sidecar goes alongside
+            if member.lower().endswith(".iq") and side in e["manifest"]["files"]:
+                self._unzip(zf, side, out.with_name(out.name + ".json"), e["manifest"]["files"][side]["sha256"])
+        self.evict(keep={sha})
+        return out
+
+    @staticmethod
+    def _unzip(zf: zipfile.ZipFile, member: str, out: Path, sha: str):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f"{out.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        h = hashlib.sha256()
+        try:
+            with zf.open(member) as src, open(tmp, "wb") as dst:
+                for chunk in iter(lambda: src.read(1 << 20), b""): h.update(chunk); dst.write(chunk)
+            if h.hexdigest() != sha: raise ValueError(f"{member}: content does not match the manifest hash")
+            os.replace(tmp, out)
+        finally:
+            if tmp.exists(): tmp.unlink()
+
+    def recording(self, ref: str) -> Path | None:
+        """Extracted recordings/<stem>*.iq of a pack experiment (last by name), or None."""
+        pid, _, member = ref.partition(REF_SEP)
+        with self._lock:
+            e = self.active.get(pid)
+        if not e: return None
+        pat = f"{Path(member).stem}*.iq"
+        cands = sorted(m for m in e["manifest"]["files"] if fnmatch.fnmatch(Path(m).name, pat))
+        return self.extract(f"{pid}{REF_SEP}{cands[-1]}") if cands else None
+
+    def cache_size(self) -> tuple[int, int]:
+        """(files, bytes) in the extraction cache."""
+        n = size = 0
+        for f in self.cache_dir.glob("*/*"):
+            try: size += f.stat().st_size; n += 1
+            except OSError: pass
+        return n, size
+
+    def evict(self, keep=()) -> int:
+        """Drop the least recently used extractions until the cache fits; returns bytes freed."""
+        entries = []
+        try: dirs = [Path(e.path) for e in os.scandir(self.cache_dir) if e.is_dir() and not e.name.startswith(".")]
+        except OSError: return 0
+        for d in dirs:
+            try: entries.append((d.stat().st_mtime, sum(f.stat().st_size for f in d.iterdir()), d))
+            except OSError: pass
+        total, freed = sum(s for _, s, _ in entries), 0
+        for _, size, d in sorted(entries):
+            if total <= self.limit: break
+            if d.name in keep: continue
+            shutil.rmtree(d, ignore_errors=True); total -= size; freed += size
+        return freed
+
+
+# --------------------- building packs ---------------------
+def build_pack(src: Path, out: Path, pack_id: str, version: str, title: str = "") -> dict:
+    """Pack src/*.grc and src/recordings/* into `out`; returns the manifest."""
+    from grc_flowgraph import read_meta   # building only; the launcher loads packs at start-up
+    src, out = Path(src), Path(out)
+    grcs = sorted(p for p in src.glob("*.grc") if p.is_file())
+    if not grcs: raise ValueError(f"no .grc files in {src}")
+    members = {p.name: p for p in grcs}
+    members.update({f"recordings/{p.name}": p for p in sorted((src / "recordings").glob("*")) if p.is_file()})
+    files = {m: {"sha256": _sha256_file(p), "size": p.stat().st_size} for m, p in members.items()}
+    experiments = []
+    for p in grcs:
+        meta = read_meta(p)
+        experiments.append({"file": p.name, **{k: meta[k] for k in ("title", "category", "description") if meta.get(k)}})
+    manifest = {"id": pack_id, "version": version, "title": title, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "experiments": experiments, "files": files}
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + ".tmp")
+    with zipfile.ZipFile(tmp, "w") as zf:
+        zf.writestr(MANIFEST, json.dumps(manifest, indent=1), zipfile.ZIP_DEFLATED)
+        for m, p in members.items():
+            # recordings are float samples: deflate gains little and costs every extraction
+            zf.write(p, m, zipfile.ZIP_STORED if p.suffix.lower() == ".iq" else zipfile.ZIP_DEFLATED)
+    os.replace(tmp, out)
+    return manifest
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Build or inspect experiment packs (*.mmtpack)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="pack a folder of .grc files (and its recordings/)")
+    b.add_argument("src"); b.add_argument("-o", "--out", required=True)
+    b.add_argument("--id", required=True); b.add_argument("--version", default="1.0"); b.add_argument("--title", default="")
+    ls = sub.add_parser("list", help="show a pack's manifest")
+    ls.add_argument("pack"); ls.add_argument("--json", action="store_true")
+    a = ap.parse_args(argv)
+    try:
+        if a.cmd == "build":
+            m = build_pack(Path(a.src), Path(a.out), a.id, a.version, a.title)
+            size = Path(a.out).stat().st_size
+            print(f"{a.out}: {m['id']} {m['version']}, {len(m['experiments'])} experiment(s), {len(m['files'])} file(s), {size / 1e6:.1f} MB")
+            return 0
+        m = read_manifest(a.pack)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"{getattr(a, 'pack', None) or a.src}: {e}", file=sys.stderr); return 1
+    if a.json:
+        print(json.dumps(m, indent=2)); return 0
+    print(f"{m['id']} {m['version']}  {m.get('title', '')}")
+    for x in m["experiments"]: print(f"  {x['file']:<32} {x.get('title', '')}")
+    extra = [f for f in m["files"] if f not in {x["file"] for x in m["experiments"]}]
+    for f in extra: print(f"  {f:<32} {m['files'][f].get('size', 0) / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
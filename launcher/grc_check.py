@@ -0,0 +1,167 @@
+# grc_check.py — static pre-launch check for CPU-burning flowgraph setups
+#
+# Builds the block/connection graph (grc_flowgraph), propagates sample rates
+# from sources through rate-changing blocks, and flags what tends to starve a
+# shared lab machine:
+#   UNTHROTTLED     synthetic source with no throttle/hardware clock downstream
+#   DUP_THROTTLE    more than one throttle on a path
+#   THROTTLE_CLOCK  throttle in a chain already clocked by hardware
+#   SINK_RATE       Qt GUI sink fed at more than `max_sink_rate` S/s
+#   SINK_FFT / SINK_POINTS / SINK_UPDATE  GUI sink sizes / refresh beyond budget
+#
+#   python launcher/grc_check.py [files or dirs…] [--json] [--max-fft N] …
+# Exit status is 1 if any error-level finding was reported.
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from grc_flowgraph import FlowGraph, load_flowgraph
+
+DEFAULT_BUDGET = {
+    "max_sink_rate": 1e6,    # S/s into any single qtgui_* sink
+    "max_fft":       8192,   # qtgui freq/waterfall fft size
+    "max_points":    16384,  # qtgui time/const sink buffer size
+    "min_update_s":  0.05,   # qtgui refresh interval (0.05 s = 20 fps)
+}
+
+HW_SOURCES = ("rtlsdr_source", "osmosdr_source", "uhd_usrp_source", "soapy_", "iio_", "audio_source",
+              "limesdr_source", "hackrf_source", "bladerf_source")
+CLOCKED_SINKS = ("audio_sink", "uhd_usrp_sink", "osmosdr_sink", "soapy_", "iio_", "limesdr_sink")
+THROTTLES = ("blocks_throttle", "blocks_throttle2")
+
+
+def _is(key: str, prefixes: tuple) -> bool:
+    return key.startswith(prefixes)
+
+
+def _finding(level: str, code: str, block: str, msg: str) -> dict:
+    return {"level": level, "code": code, "block": block, "msg": msg}
+
+
+def _rate_factor(fg: FlowGraph, b) -> float:
+    """Output/input sample-rate ratio for the rate-changing blocks we know about."""
+    k = b.key
+    if k == "blocks_unpack_k_bits_bb": return fg.param(b, "k") or 1
+    if k == "blocks_pack_k_bits_bb":   return 1 / (fg.param(b, "k") or 1)
+    if k == "digital_constellation_modulator": return fg.param(b, "samples_per_symbol") or 1
+    if k in ("analog_fm_demod_cf", "analog_nbfm_rx", "analog_wfm_rcv"): return 1 / (fg.param(b, "audio_decim") or 1)
+    f = 1.0
+    interp = fg.param(b, "interpolation", "interp")
+    decim = fg.param(b, "decimation", "decim")
+    if interp: f *= interp
+    if decim:  f /= decim
+    return f
+
+
+def propagate_rates(fg: FlowGraph) -> dict[str, float | None]:
+    """Sample rate on each block's output, in topological order. Throttles and
+    sources report their declared rate; everything else scales its input."""
+    rates: dict[str, float | None] = {}
+    for n in fg.topo_order():
+        b = fg.blocks[n]
+        declared = fg.param(b, "samp_rate", "sample_rate")
+        ups = [rates[u] for u in fg.upstream(n) if rates.get(u)]
+        if _is(b.key, THROTTLES) or not fg.upstream(n):
+            rates[n] = declared
+        elif ups:
+            rates[n] = max(ups) * _rate_factor(fg, b)
+        else:
+            rates[n] = declared
+    return rates
+
+
+def _reach(fg: FlowGraph, start: str) -> set[str]:
+    seen, todo = set(), list(fg.downstream(start))
+    while todo:
+        n = todo.pop()
+        if n in seen: continue
+        seen.add(n); todo.extend(fg.downstream(n))
+    return seen
+
+
+def analyze(fg: FlowGraph, budget: dict | None = None) -> list[dict]:
+    bud = {**DEFAULT_BUDGET, **(budget or {})}
+    out: list[dict] = []
+    rates = propagate_rates(fg)
+    throttles = [b.name for b in fg.active() if _is(b.key, THROTTLES)]
+
+    # Pacing: every source must be clocked by a throttle or by hardware, once.
+    for src in fg.sources():
+        below = _reach(fg, src.name)
+        below_thr = [t for t in throttles if t in below]
+        clocked = _is(src.key, HW_SOURCES) or any(_is(fg.blocks[n].key, CLOCKED_SINKS) for n in below)
+        if not clocked and not below_thr:
+            out.append(_finding("error", "UNTHROTTLED", src.name,
+                                f"{src.key} has no throttle or hardware clock downstream; "
+                                "the flowgraph will run as fast as the CPU allows"))
+        if clocked and below_thr:
+            out.append(_finding("warning", "THROTTLE_CLOCK", below_thr[0],
+                                f"throttle in a chain already clocked by hardware ({src.name}); remove it"))
+    for t in throttles:
+        more = [u for u in _reach(fg, t) if u in throttles]
+        if more:
+            out.append(_finding("warning", "DUP_THROTTLE", t, f"another throttle downstream ({', '.join(sorted(more))})"))
+
+    # GUI sink budgets
+    for b in fg.active():
+        if not b.key.startswith("qtgui_"): continue
+        rin = max((rates[u] or 0 for u in fg.upstream(b.name)), default=0)
+        if rin > bud["max_sink_rate"]:
+            out.append(_finding("warning", "SINK_RATE", b.name,
+                                f"fed at {rin:,.0f} S/s (budget {bud['max_sink_rate']:,.0f}); decimate before the GUI"))
+        fft = fg.param(b, "fftsize", "fft_size")
+        if fft and fft > bud["max_fft"]:
+            out.append(_finding("warning", "SINK_FFT", b.name, f"FFT size {fft:g} > {bud['max_fft']:g}"))
+        if b.key in ("qtgui_time_sink_x", "qtgui_const_sink_x", "qtgui_time_raster_sink_x"):
+            size = fg.param(b, "size")
+            if size and size > bud["max_points"]:
+                out.append(_finding("warning", "SINK_POINTS", b.name, f"{size:g} points > {bud['max_points']:g}"))
+        upd = fg.param(b, "update_time")
+        if upd is not None and 0 < upd < bud["min_update_s"]:
+            out.append(_finding("warning", "SINK_UPDATE", b.name,
+                                f"refresh every {upd:g} s (< {bud['min_update_s']:g} s)"))
+    return out
+
+
+def check_file(path, budget: dict | None = None) -> list[dict]:
+    """analyze() a .grc; load problems come back as a single finding instead of raising."""
+    try:
+        fg = load_flowgraph(path)
+    except RuntimeError as e:
+        return [_finding("info", "SKIPPED", "", str(e))]
+    except Exception as e:
+        return [_finding("error", "PARSE", "", f"{type(e).__name__}: {e}")]
+    return analyze(fg, budget)
+
+
+def _expand(paths: list[str]) -> list[Path]:
+    files = []
+    for p in map(Path, paths):
+        files += sorted(p.glob("*.grc")) if p.is_dir() else [p]
+    return files
+
+
+def main(argv=None) -> int:
+    default_dir = Path(__file__).resolve().parent.parent / "experiments"
+    ap = argparse.ArgumentParser(description="Flag CPU-burning flowgraph configurations")
+    ap.add_argument("paths", nargs="*", default=[str(default_dir)])
+    ap.add_argument("--json", action="store_true")
+    for k, v in DEFAULT_BUDGET.items():
+        ap.add_argument("--" + k.replace("_", "-"), type=float, default=v)
+    a = ap.parse_args(argv)
+    budget = {k: getattr(a, k) for k in DEFAULT_BUDGET}
+
+    report = {str(f): check_file(f, budget) for f in _expand(a.paths)}
+    if a.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for f, found in report.items():
+            print(f"{Path(f).name}: {'ok' if not found else f'{len(found)} finding(s)'}")
+            for x in found:
+                print(f"  {x['level']:<7} {x['code']:<14} {x['block']:<28} {x['msg']}")
+    return 1 if any(x["level"] == "error" for fs in report.values() for x in fs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+# grc_convert.py — legacy XML .grc -> GRC 3.8+ YAML (file_format 1), validated and cached
+#
+# GRC 3.8+ converts <flow_graph> files on every load, and logs about it. This
+# converts once:
+#   * _coordinate / _rotation / _enabled params -> block states (bypass kept);
+#     blocks without a position are laid out left to right in signal order
+#   * wx GUI widgets and sinks (gone since 3.8) -> their Qt GUI equivalents
+#   * hand-written parameter names of the Qt sinks -> the schema's (fft_size -> fftsize …)
+#   * options: unknown generate_options fixed up
+#   * legacy named stream ports ("out", "in", "in1" …) -> their index ("0", "1")
+# and validates the result: block keys against GNU Radio's block library (when
+# it can be found), unique block names, connections between existing blocks on
+# ports the block has (without the library, only numeric stream ports pass:
+# any other name is an error, so the launcher falls back to the original file).
+# Outputs are cached under converted/<sha256 of the source>/, so a
+# flowgraph is converted again only when it changes. The launcher opens the
+# converted copy (native_if_needed); YAML files pass through untouched.
+#
+#   python launcher/grc_convert.py [files or dirs…] [--out DIR] [--check] [--force] [--json]
+# Exit status is 1 if any flowgraph has an error-level finding.
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import grc_flowgraph
+from app_paths import cfg_dir
+from grc_check import _finding
+from grc_flowgraph import FlowGraph, grc_format, load_flowgraph, to_yaml_data, xml_edges
+
+CONVERTER = 2   # bump when the conversion changes; part of the cache key
+
+GENERATE_OPTIONS = ("qt_gui", "bokeh_gui", "no_gui", "hb", "hb_qt_gui")
+# Legacy block key -> file_format 1 key
+KEY_RENAMES = {
+    "variable_slider": "variable_qtgui_range", "variable_chooser": "variable_qtgui_chooser",
+    "variable_check_box": "variable_qtgui_check_box", "variable_text_box": "variable_qtgui_entry",
+    "variable_static_text": "variable_qtgui_label",
+    "wxgui_scopesink2": "qtgui_time_sink_x", "wxgui_fftsink2": "qtgui_freq_sink_x",
+    "wxgui_waterfallsink2": "qtgui_waterfall_sink_x", "wxgui_constellationsink2": "qtgui_const_sink_x",
+    "wxgui_numbersink2": "qtgui_number_sink",
+}
+# Parameter names people (and the wx blocks) used -> the Qt blocks' own
+_FREQ_ALIASES = {"samp_rate": "bw", "fft_size": "fftsize", "title": "name", "baseband_freq": "fc"}
+PARAM_ALIASES = {
+    "qtgui_time_sink_x": {"samp_rate": "srate", "title": "name"},
+    "qtgui_freq_sink_x": _FREQ_ALIASES, "qtgui_waterfall_sink_x": _FREQ_ALIASES,
+    "qtgui_const_sink_x": {"title": "name"}, "qtgui_number_sink": {"title": "name"},
+    "variable_qtgui_range": {"min": "start", "max": "stop"},
+}
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_PORT = re.compile(r"^(\d+|[A-Za-z_][A-Za-z0-9_]*)$")
+_LEGACY_PORT = re.compile(r"^(?:in|out)(\d*)$")     # hand-written XML names for stream ports
+_LIBS: dict = {}
+_PORTS: dict = {}
+
+
+def cache_dir() -> Path:
+    return cfg_dir() / "converted"
+
+
+# --------------------- block library ---------------------
+def library_dirs(grc_launcher: str | None = None) -> list[Path]:
+    """Where GNU Radio keeps its *.block.yml: GRC_BLOCKS_PATH, this python's prefix, GRC's prefix."""
+    dirs = [Path(d) for d in (os.getenv("GRC_BLOCKS_PATH") or "").split(os.pathsep) if d]
+    prefixes = [Path(sys.prefix)]
+    if grc_launcher:
+        p = Path(grc_launcher).resolve().parent.parent   # <prefix>/bin/gnuradio-companion
+        prefixes += [p, p / "Library"]                    # conda on Windows: <env>/Library/bin
+    dirs += [pre / "share" / "gnuradio" / "grc" / "blocks" for pre in prefixes]
+    return [d for d in dirs if d.is_dir()]
+
+
+def block_library(dirs) -> dict[str, Path] | None:
+    """Block id -> its *.block.yml, for every one under dirs (None if there are none to check against)."""
+    key = tuple(str(d) for d in dirs)
+    if key not in _LIBS:
+        ids = {}
+        for d in dirs:
+            for f in Path(d).rglob("*.block.yml"):
+                try:
+                    with open(f, encoding="utf-8", errors="replace") as fh:
+                        ids.update((line[3:].strip().strip("'\""), f) for line in fh if line.startswith("id:"))
+                except OSError:
+                    continue
+        _LIBS[key] = ids or None
+    return _LIBS[key]
+
+
+def block_ports(yml: Path) -> dict | None:
+    """{"inputs"|"outputs": (stream port count or None if it depends on parameters,
+    message port ids)} from a *.block.yml; None if it can't be read."""
+    if yml not in _PORTS:
+        try: data = grc_flowgraph.yaml.safe_load(Path(yml).read_text(encoding="utf-8", errors="replace"))
+        except Exception: data = None
+        ports = None
+        if isinstance(data, dict):
+            ports = {}
+            for side in ("inputs", "outputs"):
+                n, msgs = 0, set()
+                for p in data.get(side) or []:
+                    if not isinstance(p, dict): continue
+                    if p.get("domain") == "message": msgs.add(str(p.get("id", ""))); continue
+                    m = p.get("multiplicity", 1)
+                    n = n + m if isinstance(n, int) and isinstance(m, int) else None
+                ports[side] = (n, msgs)
+        _PORTS[yml] = ports
+    return _PORTS[yml]
+
+
+def _port_problem(port: str, side: str, yml: Path | None) -> str | None:
+    """Why `port` can't be a port of that block (None when it can, or can't be told)."""
+    if not _PORT.match(port): return "is not valid"
+    ports = block_ports(yml) if yml is not None and grc_flowgraph.yaml is not None else None
+    if ports is None:
+        return None if port.isdigit() else "is not a stream port index (no block library to check it against)"
+    n, msgs = ports[side]
+    if port.isdigit():
+        return None if n is None or int(port) < n else f"is out of range ({n} stream {side})"
+    return None if port in msgs else f"is not one of its message {side} {sorted(msgs)}"
+
+
+# --------------------- conversion ---------------------
+def _coordinate(v: str | None) -> list | None:
+    nums = re.findall(r"-?\d+(?:\.\d+)?", v or "")
+    return [float(n) if "." in n else int(n) for n in nums[:2]] if len(nums) >= 2 else None
+
+
+def _layout(fg: FlowGraph) -> dict[str, list]:
+    """Column = depth in the signal chain, variables across the top."""
+    depth = dict.fromkeys(fg.blocks, 0)
+    edges = [(c[0], c[2]) for c in fg.connections if c[0] in depth and c[2] in depth]
+    for _ in range(len(depth)):                         # longest path; a cycle just stops growing
+        grew = False
+        for a, b in edges:
+            if depth[b] <= depth[a] < len(depth): depth[b] = depth[a] + 1; grew = True
+        if not grew: break
+    pos, rows, nvar = {}, {}, 0
+    for b in fg.blocks.values():
+        if not (b.key.startswith("variable") or b.key in ("parameter", "import")):
+            continue
+        pos[b.name] = [200 + 160 * nvar, 8]; nvar += 1
+    for b in fg.blocks.values():
+        if b.name in pos: continue
+        col = depth.get(b.name, 0); row = rows.get(col, 0); rows[col] = row + 1
+        pos[b.name] = [8 + 240 * col, 120 + 110 * row]
+    return pos
+
+
+def _state(enabled: str | None) -> str:
+    v = (enabled or "True").strip()
+    return "bypassed" if v == "2" else "disabled" if v in ("False", "0") else "enabled"
+
+
+def _states(coordinate: list, rotation, state: str) -> dict:
+    try: rot = int(float(rotation or 0))
+    except ValueError: rot = 0
+    return {"bus_sink": False, "bus_source": False, "bus_structure": None,
+            "coordinate": coordinate, "rotation": rot, "state": state}
+
+
+def convert_flowgraph(fg: FlowGraph, root=None, library: set | None = None) -> tuple[dict, list[dict]]:
+    """(file_format 1 document, findings) for a flowgraph read from legacy XML. `root`, the
+    parsed <flow_graph>, adds checks the loaded model can't (duplicate names, disabled wiring)."""
+    out: list[dict] = []
+    fg = fg.copy()
+    names = []
+    if root is not None:
+        names = [(next((p.findtext("value") for p in el.findall("param") if p.findtext("key") == "id"), None)
+                  or el.get("id") or "") for el in root.findall("block") if (el.findtext("key") or "").strip() != "options"]
+        fg.connections = xml_edges(root)                # keep wiring of disabled blocks too
+    for n in sorted({n for n in names if names.count(n) > 1}):
+        out.append(_finding("error", "DUP_NAME", n, f"{names.count(n)} blocks named {n!r}; only the last one is kept"))
+
+    # Keys and parameter names
+    for b in fg.blocks.values():
+        if b.key in KEY_RENAMES:
+            out.append(_finding("info", "RENAMED_BLOCK", b.name, f"{b.key} -> {KEY_RENAMES[b.key]} (check its settings)"))
+            b.key = KEY_RENAMES[b.key]
+        for old, new in PARAM_ALIASES.get(b.key, {}).items():
+            if old in b.params and new not in b.params:
+                b.params[new] = b.params.pop(old)
+                out.append(_finding("info", "RENAMED_PARAM", b.name, f"{old} -> {new}"))
+        if not _IDENT.match(b.name):
+            out.append(_finding("error", "BAD_NAME", b.name, "block name is not a python identifier"))
+        if not _IDENT.match(b.key):
+            out.append(_finding("error", "BAD_KEY", b.name, f"block key {b.key!r} is not valid"))
+        elif library is not None and b.key not in library:
+            out.append(_finding("error", "UNKNOWN_BLOCK", b.name, f"{b.key} is not in GNU Radio's block library"))
+    if library is None:
+        out.append(_finding("info", "NO_LIBRARY", "", "GNU Radio block library not found; block keys and port ranges not checked"))
+
+    # Connections: legacy stream port names -> indices, then every port checked
+    conns, seen = [], set()
+    for src, sp, dst, dp in fg.connections:
+        old = (sp, dp)
+        sp, dp = (m.group(1) or "0" if (m := _LEGACY_PORT.match(p)) else p for p in old)
+        if (sp, dp) != old:
+            out.append(_finding("info", "RENAMED_PORT", src, f"{src}:{old[0]} -> {dst}:{old[1]} is now {src}:{sp} -> {dst}:{dp}"))
+        conns.append(c := (src, sp, dst, dp))
+        for blk, port, side in ((src, sp, "outputs"), (dst, dp, "inputs")):
+            if blk not in fg.blocks:
+                out.append(_finding("error", "CONN_BLOCK", blk or "?", f"connection {src}:{sp} -> {dst}:{dp} names a missing block"))
+                continue
+            why = _port_problem(port, side, library.get(fg.blocks[blk].key) if library else None)
+            if why:
+                out.append(_finding("error", "CONN_PORT", blk, f"port {port!r} in {src}:{sp} -> {dst}:{dp} {why}"))
+        if c in seen:
+            out.append(_finding("warning", "DUP_CONN", src, f"{src}:{sp} -> {dst}:{dp} appears twice; kept once"))
+        seen.add(c)
+    fg.connections = list(dict.fromkeys(conns))
+
+    # Options
+    opts = fg.options
+    gen = opts.get("generate_options", "qt_gui").strip()
+    if gen not in GENERATE_OPTIONS:
+        fix = "qt_gui" if gen.endswith("gui") or any(b.key.startswith("qtgui_") for b in fg.blocks.values()) else "no_gui"
+        out.append(_finding("warning" if gen != "wx_gui" else "info", "OPTIONS", "options",
+                            f"generate_options {gen!r} -> {fix!r}"))
+        opts["generate_options"] = fix
+    opts.setdefault("id", "top_block"); opts.setdefault("output_language", "python")
+
+    # Document: legacy GUI params become states
+    auto = _layout(fg)
+    doc = to_yaml_data(fg)
+    doc["options"] = {"parameters": {k: v for k, v in opts.items() if not k.startswith("_")},
+                      "states": _states(_coordinate(opts.get("_coordinate")) or [8, 8], opts.get("_rotation"), "enabled")}
+    for d in doc["blocks"]:
+        p = fg.blocks[d["name"]].params
+        d["parameters"] = {k: v for k, v in d["parameters"].items() if not k.startswith("_")}
+        d["states"] = _states(_coordinate(p.get("_coordinate")) or auto[d["name"]], p.get("_rotation"), _state(p.get("_enabled")))
+    return doc, out
+
+
+def _yaml_text(doc: dict) -> str:
+    if grc_flowgraph.yaml is None:
+        raise RuntimeError("PyYAML is required to write YAML flowgraphs (pip install pyyaml)")
+    return grc_flowgraph.yaml.safe_dump(doc, sort_keys=False, default_flow_style=None, allow_unicode=True, width=1000)
+
+
+# --------------------- files + cache ---------------------
+def _key(data: bytes) -> str:
+    return hashlib.sha256(data + b"\0" + str(CONVERTER).encode()).hexdigest()[:24]
+
+
+def convert_file(src, cache: Path | None = None, lib_dirs=None, force: bool = False, out: Path | None = None) -> dict:
+    """Convert one .grc -> {"source", "output", "cached", "findings"}. `output` is the
+    YAML to open: the cached conversion, `out` if given, the file itself if it is
+    already YAML, or None when validation found errors."""
+    src = Path(src).resolve()
+    res = {"source": str(src), "output": None, "cached": False, "findings": []}
+    if grc_format(src) != "xml":
+        res["output"] = str(src); return res
+    data = src.read_bytes()
+    key = _key(data)
+    d = Path(cache or cache_dir()) / key
+    target = Path(out) if out else d / (src.stem + ".grc")
+    meta_path = d / "meta.json"
+    if not force and not out and target.is_file():
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return {**res, "output": str(target), "cached": True, "findings": meta.get("findings", [])}
+        except (OSError, ValueError):
+            pass
+
+    root = ET.fromstring(data)
+    doc, found = convert_flowgraph(load_flowgraph(src), root, block_library(lib_dirs if lib_dirs is not None else library_dirs()))
+    res["findings"] = found
+    if any(x["level"] == "error" for x in found): return res
+    text = _yaml_text(doc)
+    if out:
+        target.parent.mkdir(parents=True, exist_ok=True); target.write_text(text, encoding="utf-8")
+        res["output"] = str(target); return res
+
+    # Drop older conversions of the same file, then publish the directory atomically
+    for old in d.parent.glob("*/meta.json"):
+        try: same = json.loads(old.read_text(encoding="utf-8")).get("source") == str(src)
+        except (OSError, ValueError): same = False
+        if same and old.parent.name != key: shutil.rmtree(old.parent, ignore_errors=True)
+    tmp = d.with_name(f"{key}.{os.getpid()}.tmp"); shutil.rmtree(tmp, ignore_errors=True); tmp.mkdir(parents=True)
+    (tmp / target.name).write_text(text, encoding="utf-8")
+    (tmp / "meta.json").write_text(json.dumps({"source": str(src), "findings": found}, indent=1), encoding="utf-8")
+    shutil.rmtree(d, ignore_errors=True)
+    try: tmp.rename(d)
+    except OSError: shutil.rmtree(tmp, ignore_errors=True)   # a concurrent launch published it first
+    res["output"] = str(target)
+    return res
+
+
+def _expand(paths: list[str]) -> list[Path]:
+    files = []
+    for p in map(Path, paths):
+        files += sorted(p.glob("*.grc")) if p.is_dir() else [p]
+    return files
+
+
+def main(argv=None) -> int:
+    default_dir = Path(__file__).resolve().parent.parent / "experiments"
+    ap = argparse.ArgumentParser(description="Convert legacy XML flowgraphs to GRC's YAML format")
+    ap.add_argument("paths", nargs="*", default=[str(default_dir)])
+    ap.add_argument("--out", help="write <name>.grc files here instead of the cache")
+    ap.add_argument("--check", action="store_true", help="validate only, write nothing")
+    ap.add_argument("--force", action="store_true", help="convert even if a cached copy is current")
+    ap.add_argument("--grc", help="gnuradio-companion path, to find its block library")
+    ap.add_argument("--json", action="store_true")
+    a = ap.parse_args(argv)
+    lib = library_dirs(a.grc)
+
+    report = {}
+    for f in _expand(a.paths):
+        try:
+            if a.check:
+                if grc_format(f) != "xml": r = {"source": str(f), "output": str(f), "cached": False, "findings": []}
+                else:
+                    _, found = convert_flowgraph(load_flowgraph(f), ET.parse(str(f)).getroot(), block_library(lib))
+                    r = {"source": str(f), "output": None, "cached": False, "findings": found}
+            else:
+                r = convert_file(f, lib_dirs=lib, force=a.force, out=Path(a.out) / f.name if a.out else None)
+        except (OSError, ET.ParseError, RuntimeError) as e:
+            r = {"source": str(f), "output": None, "cached": False,
+                 "findings": [_finding("error", "PARSE", "", f"{type(e).__name__}: {e}")]}
+        report[str(f)] = r
+    if a.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for f, r in report.items():
+            errors = any(x["level"] == "error" for x in r["findings"])
+            what = ("not converted" if errors else "ok" if a.check else "YAML already" if r["output"] == r["source"]
+                    else "cached" if r["cached"] else f"-> {r['output']}")
+            print(f"{Path(f).name}: {what}")
+            for x in r["findings"]:
+                print(f"  {x['level']:<7} {x['code']:<14} {x['block']:<28} {x['msg']}")
+    return 1 if any(x["level"] == "error" for r in report.values() for x in r["findings"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+# grc_flowgraph.py — read GNU Radio Companion flowgraphs in either on-disk format
+#
+#   legacy XML  <flow_graph><block><key>…</key><param>…</param></block>…</flow_graph>
+#   YAML        options: / blocks: / connections: (file_format 1, GRC 3.8+)
+#
+# Kept free of Qt and of gnuradio itself so the launcher and the headless
+# tools can use it on machines without either.
+import ast
+import copy
+import json
+import math
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+try:
+    import yaml  # ships with GNU Radio; optional for the launcher itself
+except ImportError:
+    yaml = None
+
+META_KEYS = ("title", "description", "category")
+
+
+def grc_format(path: Path) -> str:
+    """'xml' or 'yaml', judged from the first non-blank character."""
+    with open(path, "rb") as f:
+        head = f.read(256).lstrip()
+    return "xml" if head.startswith(b"<") else "yaml"
+
+
+def _yaml_scalar(v: str) -> str:
+    v = v.strip()
+    if len(v) >= 2 and v[0] == v[-1] == "'":
+        return v[1:-1].replace("''", "'")
+    if len(v) >= 2 and v[0] == v[-1] == '"':
+        try: return json.loads(v)  # YAML double-quoted escapes are a JSON superset
+        except ValueError: return v[1:-1]
+    return v
+
+
+_YAML_META = re.compile(r"^    (%s):(?: (.*))?$" % "|".join(META_KEYS))
+
+
+def _read_meta_yaml(path: Path) -> dict:
+    # Line scan of options.parameters; avoids needing PyYAML in the launcher.
+    meta, in_options, in_params = {}, False, False
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not in_options:
+                in_options = line.startswith("options:")
+                continue
+            if line and not line[0].isspace():
+                break  # next top-level section
+            if line.startswith("  ") and not line.startswith("   "):
+                in_params = line.strip() == "parameters:"
+                continue
+            m = in_params and _YAML_META.match(line)
+            if m:
+                meta[m.group(1)] = _yaml_scalar(m.group(2) or "")
+    return meta
+
+
+def _read_meta_xml(path: Path) -> dict:
+    # Stop at the end of the options block; it is first in every file GRC writes.
+    for _, el in ET.iterparse(str(path), events=("end",)):
+        if el.tag != "block":
+            continue
+        if (el.findtext("key") or "").strip() == "options":
+            return {k: v for k, v in ((p.findtext("key"), p.findtext("value") or "") for p in el.findall("param"))
+                    if k in META_KEYS}
+        el.clear()
+    return {}
+
+
+def read_meta(path: Path) -> dict:
+    """{"format", "title", "description", "category"} from the options block (missing keys -> "")."""
+    path = Path(path)
+    fmt = grc_format(path)
+    try:
+        meta = _read_meta_xml(path) if fmt == "xml" else _read_meta_yaml(path)
+    except (ET.ParseError, OSError, UnicodeError):
+        meta = {}
+    return {"format": fmt, **{k: (meta.get(k) or "").strip() for k in META_KEYS}}
+
+
+# --------------------- full graph model ---------------------
+
+class Block:
+    __slots__ = ("name", "key", "params", "enabled")
+
+    def __init__(self, name: str, key: str, params: dict, enabled: bool = True):
+        self.name, self.key, self.params, self.enabled = name, key, params, enabled
+
+    def __repr__(self):
+        return f"Block({self.name!r}, {self.key!r})"
+
+
+class FlowGraph:
+    """
+    Blocks (by instance name) and connections (src, src_port, dst, dst_port)
+    of one .grc; `options` holds the options block parameters. Disabled blocks
+    are kept but their connections are not.
+    """
+
+    def __init__(self, path: Path, fmt: str, options: dict, blocks: dict, connections: list):
+        self.path, self.format, self.options = Path(path), fmt, options
+        self.blocks: dict[str, Block] = blocks
+        self.connections: list[tuple[str, str, str, str]] = [
+            c for c in connections
+            if c[0] in blocks and c[2] in blocks and blocks[c[0]].enabled and blocks[c[2]].enabled]
+        self._vars: dict | None = None
+
+    # ---- topology ----
+    def active(self) -> list[Block]:
+        return [b for b in self.blocks.values() if b.enabled]
+
+    def downstream(self, name: str) -> list[str]:
+        return [c[2] for c in self.connections if c[0] == name]
+
+    def upstream(self, name: str) -> list[str]:
+        return [c[0] for c in self.connections if c[2] == name]
+
+    def sources(self) -> list[Block]:
+        """Enabled stream blocks with outputs but no inputs."""
+        has_in = {c[2] for c in self.connections}
+        has_out = {c[0] for c in self.connections}
+        return [b for b in self.active() if b.name in has_out and b.name not in has_in]
+
+    def topo_order(self) -> list[str]:
+        indeg = {b.name: 0 for b in self.active()}
+        for c in self.connections: indeg[c[2]] += 1
+        order, ready = [], [n for n, d in indeg.items() if d == 0]
+        while ready:
+            n = ready.pop(0); order.append(n)
+            for m in self.downstream(n):
+                indeg[m] -= 1
+                if indeg[m] == 0: ready.append(m)
+        return order + [n for n, d in indeg.items() if d > 0]  # cycles last, unordered
+
+    # ---- editing (used to derive headless / replay / sweep variants) ----
+    def copy(self) -> "FlowGraph":
+        return copy.deepcopy(self)
+
+    def _touch(self):
+        self._vars = None
+
+    def add_block(self, name: str, key: str, params: dict) -> Block:
+        if name in self.blocks: raise ValueError(f"block {name!r} already exists")
+        self.blocks[name] = b = Block(name, key, dict(params)); self._touch()
+        return b
+
+    def remove_block(self, name: str):
+        self.blocks.pop(name, None)
+        self.connections = [c for c in self.connections if name not in (c[0], c[2])]
+        self._touch()
+
+    def connect(self, src: str, src_port, dst: str, dst_port):
+        self.connections.append((src, str(src_port), dst, str(dst_port)))
+
+    def bypass(self, name: str):
+        """Remove a 1-in/1-out block, wiring its input straight to everything it fed."""
+        ins = [c for c in self.connections if c[2] == name]
+        outs = [c for c in self.connections if c[0] == name]
+        self.remove_block(name)
+        for i in ins[:1]:
+            for o in outs: self.connect(i[0], i[1], o[2], o[3])
+
+    def set_param(self, name: str, key: str, value):
+        self.blocks[name].params[key] = str(value); self._touch()
+
+    def unique_name(self, base: str) -> str:
+        n = 0
+        while f"{base}_{n}" in self.blocks: n += 1
+        return f"{base}_{n}"
+
+    # ---- parameter evaluation ----
+    def variables(self) -> dict:
+        """Numeric values of variable blocks (and `parameter` blocks), resolved iteratively."""
+        if self._vars is None:
+            raw = {b.name: b.params.get("value") for b in self.active()
+                   if (b.key.startswith("variable") or b.key == "parameter") and "value" in b.params}
+            vals: dict = {}
+            for _ in range(len(raw) + 1):
+                progressed = False
+                for n, expr in raw.items():
+                    if n in vals: continue
+                    v = safe_eval(expr, vals)
+                    if v is not None: vals[n] = v; progressed = True
+                if not progressed: break
+            self._vars = vals
+        return self._vars
+
+    def eval(self, expr):
+        return safe_eval(expr, self.variables())
+
+    def param(self, block: Block, *keys: str):
+        """First of `keys` present on block, evaluated (None if absent or not evaluable)."""
+        for k in keys:
+            if k in block.params: return self.eval(block.params[k])
+        return None
+
+
+_SAFE_FUNCS = {"int": int, "float": float, "abs": abs, "min": min, "max": max, "round": round,
+               "pow": pow, "sqrt": math.sqrt, "log10": math.log10, "exp": math.exp}
+_SAFE_CONSTS = {"pi": math.pi, "e": math.e, "True": True, "False": False}
+
+
+def safe_eval(expr, names: dict):
+    """Evaluate a GRC parameter expression made of numbers, names and arithmetic; None otherwise."""
+    if isinstance(expr, (int, float)) and not isinstance(expr, bool):
+        return expr
+    if not isinstance(expr, str) or not expr.strip():
+        return None
+    try:
+        tree = ast.parse(expr.strip(), mode="eval")
+    except SyntaxError:
+        return None
+
+    def ev(n):
+        if isinstance(n, ast.Expression): return ev(n.body)
+        if isinstance(n, ast.Constant) and isinstance(n.value, (int, float)): return n.value
+        if isinstance(n, ast.Name):
+            if n.id in names: return names[n.id]
+            if n.id in _SAFE_CONSTS: return _SAFE_CONSTS[n.id]
+            raise ValueError(n.id)
+        if isinstance(n, ast.UnaryOp) and isinstance(n.op, (ast.USub, ast.UAdd)):
+            v = ev(n.operand); return -v if isinstance(n.op, ast.USub) else v
+        if isinstance(n, ast.BinOp):
+            a, b = ev(n.left), ev(n.right)
+            ops = {ast.Add: lambda: a + b, ast.Sub: lambda: a - b, ast.Mult: lambda: a * b,
+                   ast.Div: lambda: a / b, ast.FloorDiv: lambda: a // b, ast.Mod: lambda: a % b,
+                   ast.Pow: lambda: a ** b}
+            if type(n.op) in ops: return ops[type(n.op)]()
+        if isinstance(n, ast.Call) and isinstance(n.func, ast.Name) and n.func.id in _SAFE_FUNCS and not n.keywords:
+            return _SAFE_FUNCS[n.func.id](*[ev(a) for a in n.args])
+        raise ValueError(ast.dump(n))
+
+    try:
+        v = ev(tree)
+    except (ValueError, TypeError, ZeroDivisionError, OverflowError):
+        return None
+    return v if isinstance(v, (int, float)) and not isinstance(v, bool) else None
+
+
+def _load_xml(path: Path) -> FlowGraph:
+    root = ET.parse(str(path)).getroot()
+    options, blocks = {}, {}
+    for i, el in enumerate(root.findall("block")):
+        key = (el.findtext("key") or "").strip()
+        params = {(p.findtext("key") or "").strip(): (p.findtext("value") or "") for p in el.findall("param")}
+        if key == "options":
+            options = params; continue
+        name = params.get("id") or el.get("id") or f"{key}_{i}"
+        enabled = params.get("_enabled", "True").strip() not in ("False", "0")
+        blocks[name] = Block(name, key, params, enabled)
+    return FlowGraph(path, "xml", options, blocks, xml_edges(root))
+
+
+def xml_edges(root) -> list[tuple[str, str, str, str]]:
+    """Every <connection> of a <flow_graph> root, disabled endpoints included."""
+    # A <connection> normally holds one edge, but hand-written files pack
+    # several in a row; start a new edge whenever a field repeats.
+    conns = []
+    fields = ("source_block_id", "source_key", "sink_block_id", "sink_key")
+    for el in root.findall("connection"):
+        cur: dict = {}
+        for ch in el:
+            if ch.tag not in fields: continue
+            if ch.tag in cur:
+                conns.append(cur); cur = {}
+            cur[ch.tag] = (ch.text or "").strip()
+        if cur: conns.append(cur)
+    return [(c.get("source_block_id", ""), c.get("source_key", "0"), c.get("sink_block_id", ""), c.get("sink_key", "0"))
+            for c in conns]
+
+
+def _load_yaml(path: Path) -> FlowGraph:
+    if yaml is None:
+        raise RuntimeError("PyYAML is required to read YAML flowgraphs (pip install pyyaml)")
+    with open(path, encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    options = {k: str(v) for k, v in ((data.get("options") or {}).get("parameters") or {}).items()}
+    blocks = {}
+    for b in data.get("blocks") or []:
+        state = ((b.get("states") or {}).get("state") or "enabled")
+        params = {k: ("" if v is None else str(v)) for k, v in (b.get("parameters") or {}).items()}
+        blocks[b["name"]] = Block(b["name"], b.get("id", ""), params, state != "disabled")
+    edges = [tuple(str(x) for x in c[:4]) for c in data.get("connections") or [] if len(c) >= 4]
+    return FlowGraph(path, "yaml", options, blocks, edges)
+
+
+def load_flowgraph(path) -> FlowGraph:
+    path = Path(path)
+    return _load_xml(path) if grc_format(path) == "xml" else _load_yaml(path)
+
+
+# --------------------- writers ---------------------
+def _xml_block(parent, key: str, params: dict):
+    b = ET.SubElement(parent, "block")
+    ET.SubElement(b, "key").text = key
+    for k, v in params.items():
+        p = ET.SubElement(b, "param")
+        ET.SubElement(p, "key").text = k
+        ET.SubElement(p, "value").text = v
+
+
+def to_xml(fg: FlowGraph) -> str:
+    """Legacy <flow_graph> text; every block carries its name as the `id` param."""
+    root = ET.Element("flow_graph")
+    _xml_block(root, "options", fg.options)
+    for b in fg.blocks.values():
+        params = {"id": b.name, **{k: v for k, v in b.params.items() if k != "id"}}
+        if not b.enabled: params["_enabled"] = "False"
+        _xml_block(root, b.key, params)
+    for src, sp, dst, dp in fg.connections:
+        c = ET.SubElement(root, "connection")
+        for tag, val in (("source_block_id", src), ("sink_block_id", dst), ("source_key", sp), ("sink_key", dp)):
+            ET.SubElement(c, tag).text = val
+    ET.indent(root)
+    return "<?xml version='1.0' encoding='utf-8'?>\n" + ET.tostring(root, encoding="unicode") + "\n"
+
+
+def to_yaml_data(fg: FlowGraph) -> dict:
+    """The GRC file_format 1 document for fg (parameters as strings, GRC fills in defaults)."""
+    return {
+        "options": {"parameters": dict(fg.options), "states": {"state": "enabled"}},
+        "blocks": [{"name": b.name, "id": b.key,
+                    "parameters": {k: v for k, v in b.params.items() if k not in ("id", "_enabled")},
+                    "states": {"state": "enabled" if b.enabled else "disabled"}}
+                   for b in fg.blocks.values()],
+        "connections": [list(c) for c in fg.connections],
+        "metadata": {"file_format": 1},
+    }
+
+
+def to_yaml(fg: FlowGraph) -> str:
+    if yaml is None:
+        raise RuntimeError("PyYAML is required to write YAML flowgraphs (pip install pyyaml)")
+    return yaml.safe_dump(to_yaml_data(fg), sort_keys=False, default_flow_style=None, allow_unicode=True, width=1000)
+
+
+def save_flowgraph(fg: FlowGraph, path, fmt: str | None = None) -> Path:
+    """Write fg in `fmt` ("xml"/"yaml", default: the format it was read from)."""
+    path = Path(path)
+    text = to_xml(fg) if (fmt or fg.format) == "xml" else to_yaml(fg)
+    path.write_text(text, encoding="utf-8")
+    return path
@@ -0,0 +1,192 @@
+# grc_headless.py — run an experiment flowgraph without any GUI and measure it
+#
+# headless_variant() rewrites a flowgraph for batch runs:
+#   * qtgui_* and audio sinks  -> blocks_head(N) -> blocks_null_sink, per input
+#   * qtgui variable widgets   -> plain variables (same value)
+#   * blocks_throttle          -> optionally bypassed (measure raw throughput)
+#   * options                  -> no_gui, run-to-completion
+# run_headless() compiles it with grcc and runs it in a child process. The
+# child times tb.start() .. tb.wait() itself (run_s, and samples_per_s from it),
+# so interpreter start, the gnuradio import and flowgraph set-up don't count;
+# wall_s, cpu_s and peak_rss_mb are for the whole process. Experiments with an
+# SDR source run from a recording (grc_replay) when one is available.
+#
+# This module must be run by (or pointed at) a python that has gnuradio.
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from grc_check import HW_SOURCES, THROTTLES
+from grc_flowgraph import FlowGraph, load_flowgraph, save_flowgraph
+from grc_replay import find_recording, hw_sources, replay_variant
+
+GUI_SINK_PREFIX = "qtgui_"
+HEADLESS_SINKS = ("audio_sink",)
+GUI_VARIABLES = ("variable_qtgui_range", "variable_qtgui_chooser", "variable_qtgui_check_box",
+                 "variable_qtgui_push_button", "variable_qtgui_entry", "variable_qtgui_label")
+_ITEM_TYPES = ("complex", "float", "int", "short", "byte")
+METRICS = 2            # bump when the reported figures change meaning (sweep cache key)
+RESULT = "__MMT_HEADLESS_RUN__"
+
+# Runs the grcc output in the child: import + set-up untimed, then only the flowgraph run.
+RUNNER_SRC = r'''
+import importlib.util, json, sys, time
+script, cls_name, marker = sys.argv[1], sys.argv[2], sys.argv[3]
+spec = importlib.util.spec_from_file_location("mmt_fg", script)
+mod = importlib.util.module_from_spec(spec); spec.loader.exec_module(mod)
+tb = getattr(mod, cls_name)()
+t0 = time.perf_counter()
+tb.start(); tb.wait()
+print(marker + json.dumps({"run_s": time.perf_counter() - t0}), flush=True)
+'''
+
+
+class NotRunnable(Exception):
+    """The flowgraph can't run headless here (e.g. it needs radio hardware)."""
+
+
+def _item_type(fg: FlowGraph, sink) -> str:
+    t = sink.params.get("type", "complex").strip().lower()
+    if sink.key == "audio_sink": return "float"
+    return t if t in _ITEM_TYPES else "complex"
+
+
+def headless_variant(fg: FlowGraph, samples: int, keep_throttle: bool = True) -> FlowGraph:
+    """Copy of fg that processes `samples` items per displayed stream and exits."""
+    v = fg.copy()
+    hw = [b.name for b in v.active() if b.key.startswith(HW_SOURCES)]
+    if hw:
+        raise NotRunnable(f"needs radio hardware ({', '.join(hw)})")
+    for b in list(v.active()):
+        if b.key in GUI_VARIABLES:
+            b.key = "variable"; b.params = {"value": b.params.get("value", "0")}
+    for b in list(v.active()):
+        if not (b.key.startswith(GUI_SINK_PREFIX) or b.key in HEADLESS_SINKS) or b.key.startswith("variable"):
+            continue
+        feeds = [c for c in v.connections if c[2] == b.name]
+        t = _item_type(v, b)
+        v.remove_block(b.name)
+        for src, sport, _, _ in feeds:
+            head = v.add_block(v.unique_name("mmt_head"), "blocks_head", {"type": t, "num_items": str(int(samples)), "vlen": "1"})
+            null = v.add_block(v.unique_name("mmt_null"), "blocks_null_sink", {"type": t, "vlen": "1", "num_inputs": "1"})
+            v.connect(src, sport, head.name, "0"); v.connect(head.name, "0", null.name, "0")
+    if not keep_throttle:
+        for b in [b for b in v.active() if b.key.startswith(THROTTLES)]:
+            v.bypass(b.name)
+    # Anything the GUI sinks' removal left dangling (e.g. a branch that only fed a plot)
+    for b in [b for b in v.active() if not b.key.startswith(("variable", "parameter", "import"))
+              and not v.upstream(b.name) and not v.downstream(b.name)]:
+        v.remove_block(b.name)
+    v.options.update({"generate_options": "no_gui", "run_options": "run", "id": "mmt_headless", "run": "True"})
+    return v
+
+
+def gr_python() -> str:
+    return os.getenv("MMT_GR_PYTHON") or sys.executable
+
+
+def grcc_argv(python: str) -> list[str]:
+    for cand in (Path(python).parent / "grcc", Path(python).parent / "grcc.exe", Path(python).parent / "Scripts" / "grcc.exe"):
+        if cand.exists(): return [str(cand)]
+    if shutil.which("grcc") and python == sys.executable: return [shutil.which("grcc")]
+    return [python, "-c", "import sys; from gnuradio.grc.compiler import main; sys.exit(main())"]
+
+
+def compile_grc(grc: Path, out_dir: Path, python: str | None = None) -> Path:
+    python = python or gr_python()
+    r = subprocess.run(grcc_argv(python) + ["-o", str(out_dir), str(grc)], capture_output=True, text=True, timeout=300)
+    made = sorted(out_dir.glob("*.py"))
+    if r.returncode != 0 or not made:
+        err = (r.stderr or r.stdout or "").strip().splitlines()
+        raise RuntimeError(f"grcc failed ({r.returncode}): {err[-1] if err else 'no output'}")
+    return made[0]
+
+
+def _measure(argv: list[str], cwd: str, timeout: float) -> dict:
+    """Run argv to completion: wall/CPU seconds and peak RSS of the child."""
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(argv, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    tail: list[bytes] = []
+    def drain():
+        for line in proc.stdout:
+            tail.append(line); del tail[:-20]
+    reader = threading.Thread(target=drain, daemon=True); reader.start()
+    killed = threading.Event()
+    timer = threading.Timer(timeout, lambda: (killed.set(), proc.kill())); timer.start()
+    cpu = rss = None
+    try:
+        if hasattr(os, "wait4"):
+            _, status, ru = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            cpu = ru.ru_utime + ru.ru_stime
+            rss = ru.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)  # -> MiB
+        else:
+            peak = [0.0]
+            try:
+                import psutil
+                ps = psutil.Process(proc.pid)
+                while proc.poll() is None:
+                    try:
+                        peak[0] = max(peak[0], getattr(ps.memory_info(), "peak_wset", ps.memory_info().rss) / 2 ** 20)
+                        t = ps.cpu_times(); cpu = t.user + t.system
+                    except psutil.Error: break
+                    time.sleep(0.05)
+            except ImportError:
+                pass
+            proc.wait(); rss = peak[0] or None
+    finally:
+        timer.cancel()
+    wall = time.perf_counter() - t0
+    reader.join(timeout=1)
+    return {"wall_s": wall, "cpu_s": cpu, "peak_rss_mb": rss, "returncode": proc.returncode,
+            "timed_out": killed.is_set(), "log_tail": b"".join(tail).decode("utf-8", "replace")[-2000:]}
+
+
+def run_headless(grc, samples: int = 2_000_000, keep_throttle: bool = True, timeout: float = 300.0,
+                 python: str | None = None, work_dir: Path | None = None, fg: FlowGraph | None = None,
+                 replay: bool = True) -> dict:
+    """Compile + run a headless variant of `grc` (or of an already edited `fg`); one metrics dict."""
+    grc = Path(grc)
+    res = {"experiment": grc.name, "samples": samples, "throttle": keep_throttle}
+    fg = fg or load_flowgraph(grc)
+    rec = find_recording(grc) if replay and hw_sources(fg) else None
+    try:
+        if rec:
+            fg = replay_variant(fg, rec, pace=keep_throttle); res["replay"] = rec.name
+        v = headless_variant(fg, samples, keep_throttle)
+    except NotRunnable as e:
+        return {**res, "skipped": str(e)}
+    except ValueError as e:
+        return {**res, "error": f"replay: {e}"}
+    python = python or gr_python()
+    tmp = Path(work_dir or tempfile.mkdtemp(prefix="mmt_headless_"))
+    tmp.mkdir(parents=True, exist_ok=True)
+    try:
+        src = save_flowgraph(v, tmp / f"{grc.stem}_headless.grc")
+        script = compile_grc(src, tmp, python)
+        m = _measure([python, "-c", RUNNER_SRC, str(script), v.options["id"], RESULT], str(tmp), timeout)
+    except Exception as e:
+        return {**res, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        if work_dir is None: shutil.rmtree(tmp, ignore_errors=True)
+    out = {**res, **{k: m[k] for k in ("wall_s", "cpu_s", "peak_rss_mb", "returncode")}}
+    if m["timed_out"]: out["error"] = f"timed out after {timeout:g}s"
+    elif m["returncode"] != 0:
+        last = m["log_tail"].strip().splitlines()
+        out["error"] = f"exit {m['returncode']}: {last[-1] if last else 'no output'}"
+    else:
+        run = next((json.loads(l[len(RESULT):]) for l in reversed(m["log_tail"].splitlines()) if l.startswith(RESULT)), {})
+        out["run_s"] = run.get("run_s")
+        out["samples_per_s"] = samples / out["run_s"] if out["run_s"] else None
+        out["cpu_util"] = (m["cpu_s"] / m["wall_s"]) if m["cpu_s"] is not None and m["wall_s"] else None
+    return out
+
+
+if __name__ == "__main__":
+    print(json.dumps(run_headless(sys.argv[1]), indent=2))
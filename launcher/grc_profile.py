@@ -0,0 +1,230 @@
+# grc_profile.py — per-block hot spots of one experiment, from GNU Radio's performance counters
+#
+# The experiment is compiled (grcc) and run by a small host script with the
+# performance counters switched on (GR_CONF_PERFCOUNTERS_ON). Every `interval`
+# the host reads, for every block — including the blocks inside hier blocks
+# such as digital_constellation_modulator — its total work() time, items
+# produced (consumed, for sinks) and input/output buffer fullness. At the end
+# blocks are ranked by their share of the total work time, and the blocks that
+# hold the chain back (inputs full, outputs empty) are marked.
+#
+# By default the flowgraph runs as students see it, Qt sinks included, for
+# --seconds (offscreen unless --show); --headless profiles the grc_headless
+# variant instead (sinks -> head + null, --samples items).
+# The report, <experiment>_<time>.json + .txt, goes to profiles/ next to the
+# launch trace (%APPDATA%\MMT\VirtualLab) unless --out says otherwise.
+# Run it with GNU Radio's python (or set MMT_GR_PYTHON to it):
+#
+#   python launcher/grc_profile.py qam_16 [--seconds 10] [--headless [--samples N]] [--no-throttle]
+#                                  [--interval 0.25] [--show] [--out DIR] [--json]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import launch_trace
+from grc_flowgraph import FlowGraph, load_flowgraph, save_flowgraph
+from grc_check import THROTTLES
+from grc_headless import NotRunnable, compile_grc, gr_python, headless_variant
+
+HOST_SRC = r'''
+import importlib.util, json, os, sys, threading, time
+os.environ.setdefault("GR_CONF_PERFCOUNTERS_ON", "True")
+from gnuradio import gr
+
+script, cls_name, names, out, seconds, interval = sys.argv[1], sys.argv[2], json.loads(sys.argv[3]), sys.argv[4], float(sys.argv[5]), float(sys.argv[6])
+spec = importlib.util.spec_from_file_location("mmt_fg", script)
+mod = importlib.util.module_from_spec(spec); spec.loader.exec_module(mod)
+
+def leaves(obj, prefix, seen):
+    # gr.block instances of a GRC block; hier blocks are searched through their attributes
+    if id(obj) in seen: return []
+    seen.add(id(obj))
+    if hasattr(obj, "pc_work_time_total"): return [(prefix, obj)]
+    found = []
+    for k, v in sorted(vars(obj).items()) if hasattr(obj, "__dict__") else []:
+        if isinstance(v, gr.basic_block) or hasattr(v, "pc_work_time_total"):
+            found += leaves(v, f"{prefix}.{k}", seen)
+    return found
+
+def vec(f):
+    try: v = f()
+    except Exception: return []
+    return list(v) if hasattr(v, "__len__") else [v]
+
+TPS = float(gr.high_res_timer_tps()) if hasattr(gr, "high_res_timer_tps") else 1e9
+
+def read(b):
+    # one entry per port in the fullness vectors, so they also tell sources/sinks apart
+    ins, outs = vec(b.pc_input_buffers_full_avg), vec(b.pc_output_buffers_full_avg)
+    items = sum(b.nitems_written(i) for i in range(len(outs))) if outs else sum(b.nitems_read(i) for i in range(len(ins)))
+    return [b.pc_work_time_total() / TPS, items, ins, outs]
+
+qapp = None
+if hasattr(mod, "Qt"):
+    qapp = mod.Qt.QApplication(sys.argv)
+tb = getattr(mod, cls_name)()
+seen = set(); blocks = []
+for n in names:
+    if hasattr(tb, n): blocks += [(name, n, b) for name, b in leaves(getattr(tb, n), n, seen)]
+timeline, t0 = [], None
+
+def sample():
+    timeline.append({"t": time.perf_counter() - t0, "blocks": {name: read(b) for name, _, b in blocks}})
+
+tb.start(); t0 = time.perf_counter()
+if qapp is not None:
+    tb.show()
+    timer = mod.Qt.QTimer(); timer.timeout.connect(sample); timer.start(int(interval * 1000))
+    mod.Qt.QTimer.singleShot(int(seconds * 1000), qapp.quit)
+    qapp.exec_()
+    tb.stop(); tb.wait()
+else:
+    done = threading.Event()
+    threading.Thread(target=lambda: (tb.wait(), done.set()), daemon=True).start()
+    while not done.wait(interval) and (time.perf_counter() - t0) < seconds:
+        sample()
+    tb.stop(); tb.wait()
+wall = time.perf_counter() - t0
+sample()
+json.dump({"wall_s": wall, "gr_version": gr.version(), "groups": {name: g for name, g, _ in blocks},
+           "timeline": timeline}, open(out, "w"))
+'''
+
+MAX_TIMELINE = 600   # samples kept in the JSON report
+
+
+def default_out_dir() -> Path:
+    return launch_trace.default_path().parent / "profiles"
+
+
+def find_grc(arg: str) -> Path:
+    p = Path(arg)
+    if p.exists(): return p
+    exp = Path(__file__).resolve().parent.parent / "experiments"
+    for cand in (exp / arg, exp / f"{arg}.grc"):
+        if cand.exists(): return cand
+    raise FileNotFoundError(f"no flowgraph {arg!r} (a .grc path, or a name in {exp})")
+
+
+def profile_variant(fg: FlowGraph, headless: bool, samples: int, keep_throttle: bool) -> FlowGraph:
+    if headless:
+        v = headless_variant(fg, samples, keep_throttle)
+    else:
+        v = fg.copy()
+        if not keep_throttle:
+            for b in [b for b in v.active() if b.key.startswith(THROTTLES)]: v.bypass(b.name)
+        v.options.update({"generate_options": "qt_gui", "run_options": "run", "run": "True"})
+    v.options["id"] = "mmt_profile"
+    return v
+
+
+def _avg_peak(series: list[list]) -> tuple[float | None, float | None]:
+    """Mean and max over the run of the fullest port per sample (None: no such ports)."""
+    vals = [max(x) for x in series if x]
+    return (sum(vals) / len(vals), max(vals)) if vals else (None, None)
+
+
+def rank(raw: dict, fg: FlowGraph) -> list[dict]:
+    """Per-block totals and averages over the run, heaviest first."""
+    tl = raw["timeline"]
+    if not tl: return []
+    last, wall = tl[-1]["blocks"], raw["wall_s"] or 1.0
+    total = sum(v[0] for v in last.values()) or 1.0
+    rows = []
+    for name, (work, items, ins, outs) in last.items():
+        group = raw["groups"].get(name, name)
+        in_avg, in_max = _avg_peak([s["blocks"][name][2] for s in tl if name in s["blocks"]])
+        out_avg, out_max = _avg_peak([s["blocks"][name][3] for s in tl if name in s["blocks"]])
+        b = fg.blocks.get(group)
+        row = {"block": name, "key": b.key if b else "", "work_s": work, "work_pct": 100.0 * work / total,
+               "items": items, "items_per_s": items / wall, "ns_per_item": 1e9 * work / items if items else None,
+               "in_full_avg": in_avg, "in_full_max": in_max, "out_full_avg": out_avg, "out_full_max": out_max}
+        row["bottleneck"] = bool((row["in_full_avg"] or 0) > 0.7 and (row["out_full_avg"] is None or row["out_full_avg"] < 0.3)
+                                 and row["work_pct"] >= 10)
+        rows.append(row)
+    rows.sort(key=lambda r: -r["work_s"])
+    return rows
+
+
+def text_report(doc: dict) -> str:
+    pct = lambda v: f"{100 * v:.0f}%" if v is not None else "-"
+    lines = [f"{doc['experiment']}  {doc['mode']}  {doc['wall_s']:.1f} s  GNU Radio {doc.get('gr_version', '?')}  {doc['when']}", "",
+             f"{'#':>2}  {'block':<44}{'key':<34}{'work %':>7}{'work s':>9}{'Mitems/s':>10}{'ns/item':>9}{'in full':>9}{'out full':>9}"]
+    for i, r in enumerate(doc["blocks"], 1):
+        ns = f"{r['ns_per_item']:.0f}" if r["ns_per_item"] else "-"
+        lines.append(f"{i:>2}  {r['block'][:43]:<44}{r['key'][:33]:<34}{r['work_pct']:>6.1f}%{r['work_s']:>9.3f}"
+                     f"{r['items_per_s'] / 1e6:>10.3f}{ns:>9}{pct(r['in_full_avg']):>9}{pct(r['out_full_avg']):>9}"
+                     + ("  <- bottleneck" if r["bottleneck"] else ""))
+    if doc.get("note"): lines += ["", doc["note"]]
+    return "\n".join(lines) + "\n"
+
+
+def profile(grc, seconds: float = 10.0, headless: bool = False, samples: int = 5_000_000, keep_throttle: bool = True,
+            interval: float = 0.25, show: bool = False, python: str | None = None, timeout: float = 600.0) -> dict:
+    """Run one experiment with performance counters on -> the ranked report dict."""
+    grc = Path(grc)
+    fg = load_flowgraph(grc)
+    v = profile_variant(fg, headless, samples, keep_throttle)
+    python = python or gr_python()
+    doc = {"experiment": grc.name, "mode": "headless" if headless else "gui", "throttle": keep_throttle,
+           "when": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": python}
+    with tempfile.TemporaryDirectory(prefix="mmt_profile_") as tmp:
+        tmp = Path(tmp)
+        script = compile_grc(save_flowgraph(v, tmp / f"{grc.stem}_profile.grc"), tmp, python)
+        names = [b.name for b in v.active() if not b.key.startswith(("variable", "parameter", "import"))]
+        env = dict(os.environ, GR_CONF_PERFCOUNTERS_ON="True", GR_CONF_PERFCOUNTERS_EXPORT="False")
+        if not show and not headless: env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        out = tmp / "raw.json"
+        r = subprocess.run([python, "-c", HOST_SRC, str(script), "mmt_profile", json.dumps(names), str(out),
+                            str(seconds if not headless else timeout), str(interval)],
+                           cwd=str(tmp), env=env, capture_output=True, text=True, timeout=timeout + 60)
+        if r.returncode != 0 or not out.exists():
+            err = (r.stderr or r.stdout or "").strip().splitlines()
+            raise RuntimeError(f"profiling run failed ({r.returncode}): {err[-1] if err else 'no output'}")
+        raw = json.loads(out.read_text(encoding="utf-8"))
+    doc.update(wall_s=raw["wall_s"], gr_version=raw.get("gr_version"), blocks=rank(raw, v))
+    if doc["blocks"] and not any(b["work_s"] for b in doc["blocks"]):
+        doc["note"] = "All work times are 0: this GNU Radio was built without performance counters."
+    step = max(1, len(raw["timeline"]) // MAX_TIMELINE)
+    doc["timeline"] = raw["timeline"][::step]
+    return doc
+
+
+def save_report(doc: dict, out_dir: Path | None = None) -> tuple[Path, Path]:
+    d = Path(out_dir or default_out_dir()); d.mkdir(parents=True, exist_ok=True)
+    base = d / f"{Path(doc['experiment']).stem}_{doc['when'].replace(':', '').replace('-', '')}"
+    js, txt = base.with_suffix(".json"), base.with_suffix(".txt")
+    js.write_text(json.dumps(doc, indent=1), encoding="utf-8")
+    txt.write_text(text_report(doc), encoding="utf-8")
+    return js, txt
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Rank an experiment's blocks by work time (GNU Radio performance counters)")
+    ap.add_argument("experiment", help=".grc path or experiment name (qam_16, am_signal …)")
+    ap.add_argument("--seconds", type=float, default=10.0, help="run time of the GUI flowgraph")
+    ap.add_argument("--headless", action="store_true", help="profile the head/null-sink variant instead of the Qt one")
+    ap.add_argument("--samples", type=int, default=5_000_000, help="items per displayed stream with --headless")
+    ap.add_argument("--no-throttle", action="store_true", help="bypass blocks_throttle (find the CPU-bound block)")
+    ap.add_argument("--interval", type=float, default=0.25, help="seconds between counter samples")
+    ap.add_argument("--show", action="store_true", help="show the Qt window instead of rendering offscreen")
+    ap.add_argument("--out", help=f"report folder (default {default_out_dir()})")
+    ap.add_argument("--json", action="store_true", help="print the JSON report instead of the table")
+    a = ap.parse_args(argv)
+    try:
+        doc = profile(find_grc(a.experiment), a.seconds, a.headless, a.samples, not a.no_throttle, a.interval, a.show)
+    except (NotRunnable, OSError, RuntimeError, ValueError, subprocess.TimeoutExpired) as e:
+        print(f"{a.experiment}: {e}", file=sys.stderr); return 1
+    js, txt = save_report(doc, a.out)
+    print(json.dumps(doc, indent=1) if a.json else text_report(doc), end="" if not a.json else "\n")
+    print(f"report: {txt}  ({js.name})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# grc_replay.py — stand in for an SDR source with a recorded IQ file
+#
+# replay_variant() swaps each hardware source (rtlsdr_source, osmosdr_source)
+# for an embedded python block that streams a recording through numpy.memmap.
+# Samples go straight from the page cache into GNU Radio's output buffer, with
+# no read() buffer in between. The block paces itself to the recorded sample
+# rate (pace=False for benchmarks), loops, and seeks: changing its offset_s
+# parameter jumps there.
+#
+# Recordings are raw complex64 with an iq_capture sidecar (<name>.iq.json with
+# samp_rate). "Open with capture" on a hardware experiment already produces one:
+# the RF spectrum sink's input *is* the source output. Place it (or a copy) as
+# recordings/<experiment stem>*.iq next to the experiment, or in MMT_REPLAY_DIR.
+#
+# Many sessions replaying one recording share the same cached pages, so one file
+# can feed a whole lab.
+import ctypes
+import json
+import os
+import sys
+from pathlib import Path
+
+from grc_check import HW_SOURCES
+from grc_flowgraph import FlowGraph
+
+REPLAYABLE = ("rtlsdr_source", "osmosdr_source")       # single-channel complex sources
+# USB vendor:product ids of RTL2832U dongles (rtl-sdr's known_devices list, most common first)
+RTLSDR_USB_IDS = {("0bda", "2838"), ("0bda", "2832"), ("0ccd", "00a9"), ("0ccd", "00b3"), ("0ccd", "00d3"),
+                  ("0ccd", "00e0"), ("185b", "0620"), ("185b", "0650"), ("1f4d", "b803"), ("1f4d", "c803"),
+                  ("1b80", "d3a4"), ("1d19", "1101"), ("1d19", "1102"), ("1d19", "1103"), ("0458", "707f"),
+                  ("1b80", "d393"), ("1b80", "d394"), ("1b80", "d395"), ("1b80", "d39d")}
+
+REPLAY_SRC = '''\
+import time
+import numpy as np
+from gnuradio import gr
+
+
+class blk(gr.sync_block):
+    """MMT IQ replay: streams a memory-mapped complex64 recording (loops, seekable via offset_s)"""
+
+    def __init__(self, path="", samp_rate=1.0e6, loop=True, offset_s=0.0, pace=True):
+        gr.sync_block.__init__(self, name="MMT IQ replay", in_sig=None, out_sig=[np.complex64])
+        self.samp_rate, self.loop, self.pace = float(samp_rate), bool(loop), bool(pace)
+        self.data = np.memmap(path, dtype=np.complex64, mode="r") if path else np.zeros(0, np.complex64)
+        self.pos, self._t0, self._sent = 0, None, 0
+        self.offset_s = offset_s
+
+    @property
+    def offset_s(self):
+        return self.pos / self.samp_rate
+
+    @offset_s.setter
+    def offset_s(self, seconds):
+        n = len(self.data)
+        self.pos = int(float(seconds) * self.samp_rate) % n if n else 0
+        self._t0 = None
+
+    def work(self, input_items, output_items):
+        out, n = output_items[0], len(self.data)
+        if not n: return -1
+        want = len(out)
+        if self.pace:
+            now = time.monotonic()
+            if self._t0 is None: self._t0, self._sent = now, 0
+            ahead = self._sent / self.samp_rate - (now - self._t0)
+            if ahead > 0.02: time.sleep(min(ahead, 0.1))
+            want = min(want, max(1, int(self.samp_rate * 0.02)))
+        done = 0
+        while done < want:
+            k = min(want - done, n - self.pos)
+            out[done:done + k] = self.data[self.pos:self.pos + k]
+            done += k; self.pos += k
+            if self.pos >= n:
+                if not self.loop: return done or -1
+                self.pos = 0
+        self._sent += done
+        return done
+'''
+
+
+# --------------------- recordings ---------------------
+def _rec_dirs(grc_file: Path, extra=None) -> list[Path]:
+    dirs = [Path(d) for d in (extra or []) if d]
+    if os.getenv("MMT_REPLAY_DIR"): dirs.append(Path(os.environ["MMT_REPLAY_DIR"]))
+    dirs.append(Path(grc_file).parent / "recordings")
+    return dirs
+
+
+def read_recording(path) -> dict:
+    """Sidecar of a recording (raises ValueError if it can't be replayed)."""
+    path = Path(path)
+    side = path.with_name(path.name + ".json")
+    try:
+        meta = json.loads(side.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        raise ValueError(f"{side.name}: {e}") from None
+    if meta.get("dtype", "complex64") != "complex64":
+        raise ValueError(f"{path.name}: {meta['dtype']} recording, need complex64")
+    if not meta.get("samp_rate"):
+        raise ValueError(f"{path.name}: sidecar has no samp_rate")
+    if not path.exists() or path.stat().st_size < 8:
+        raise ValueError(f"{path.name}: empty recording")
+    return meta
+
+
+def find_recording(grc_file, dirs=None) -> Path | None:
+    """Newest valid <stem>*.iq for this experiment in the recording dirs (first dir wins)."""
+    stem = Path(grc_file).stem
+    for d in _rec_dirs(grc_file, dirs):
+        try: cands = sorted(d.glob(f"{stem}*.iq"), key=lambda p: -p.stat().st_mtime)
+        except OSError: continue
+        for p in cands:
+            try: read_recording(p); return p
+            except ValueError: continue
+    return None
+
+
+# --------------------- hardware presence ---------------------
+def _usb_ids_linux() -> set[tuple[str, str]]:
+    ids = set()
+    for dev in Path("/sys/bus/usb/devices").glob("*"):
+        try: ids.add(((dev / "idVendor").read_text().strip().lower(), (dev / "idProduct").read_text().strip().lower()))
+        except OSError: pass
+    return ids
+
+
+def _usb_ids_windows() -> set[tuple[str, str]]:
+    # SetupAPI in-process: present USB devices' instance ids, "USB\\VID_0BDA&PID_2838\\..."
+    sa = ctypes.WinDLL("setupapi")
+    DIGCF_PRESENT, DIGCF_ALLCLASSES = 0x2, 0x4
+
+    class SP_DEVINFO_DATA(ctypes.Structure):
+        _fields_ = [("cbSize", ctypes.c_ulong), ("ClassGuid", ctypes.c_byte * 16),
+                    ("DevInst", ctypes.c_ulong), ("Reserved", ctypes.c_void_p)]
+    sa.SetupDiGetClassDevsW.restype = ctypes.c_void_p
+    h = sa.SetupDiGetClassDevsW(None, "USB", None, DIGCF_PRESENT | DIGCF_ALLCLASSES)
+    if not h or h == ctypes.c_void_p(-1).value: return set()
+    ids, i, buf = set(), 0, ctypes.create_unicode_buffer(512)
+    try:
+        info = SP_DEVINFO_DATA(); info.cbSize = ctypes.sizeof(info)
+        while sa.SetupDiEnumDeviceInfo(ctypes.c_void_p(h), i, ctypes.byref(info)):
+            if sa.SetupDiGetDeviceInstanceIdW(ctypes.c_void_p(h), ctypes.byref(info), buf, 512, None):
+                s = buf.value.upper()
+                if "VID_" in s and "PID_" in s:
+                    ids.add((s.split("VID_")[1][:4].lower(), s.split("PID_")[1][:4].lower()))
+            i += 1
+    finally:
+        sa.SetupDiDestroyDeviceInfoList(ctypes.c_void_p(h))
+    return ids
+
+
+def device_present(keys) -> bool | None:
+    """Is a device for these source block keys plugged in? None if we can't tell."""
+    if not any(k.startswith(("rtlsdr_source", "osmosdr_source")) for k in keys): return None
+    try:
+        if sys.platform.startswith("linux"): ids = _usb_ids_linux()
+        elif os.name == "nt": ids = _usb_ids_windows()
+        else: return None
+    except (OSError, AttributeError):
+        return None
+    return bool(ids & RTLSDR_USB_IDS)
+
+
+def hw_sources(fg: FlowGraph) -> list:
+    return [b for b in fg.active() if b.key.startswith(HW_SOURCES)]
+
+
+# --------------------- variant ---------------------
+def replay_variant(fg: FlowGraph, recording, pace: bool = True, loop: bool = True) -> FlowGraph:
+    """Copy of fg with every replayable hardware source streaming `recording` instead."""
+    recording = Path(recording).resolve()
+    rate = float(read_recording(recording)["samp_rate"])
+    v = fg.copy()
+    for b in [b for b in hw_sources(v) if b.key.startswith(REPLAYABLE)]:
+        # Keep the graph's sample rate consistent with the recording
+        rvar = b.params.get("sample_rate", "").strip()
+        if rvar in v.blocks and v.blocks[rvar].key == "variable": v.set_param(rvar, "value", repr(rate))
+        b.key = "epy_block"
+        b.params = {"_source_code": REPLAY_SRC, "path": repr(str(recording)), "samp_rate": repr(rate),
+                    "loop": str(bool(loop)), "offset_s": "0.0", "pace": str(bool(pace))}
+        v._touch()
+    return v
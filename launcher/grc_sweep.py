@@ -0,0 +1,227 @@
+# grc_sweep.py — run a parameter grid over one experiment, headless, in parallel
+#
+# A grid is a set of "target=values" axes; the sweep runs the cartesian product.
+#   target   <variable>            e.g. samp_rate           (sets its value)
+#            <block>.<param>       e.g. digital_constellation_modulator_0.excess_bw
+#   values   comma list  2,4,8     or numeric range  start:stop:step  (stop inclusive)
+# Values are GRC expressions and are written into the flowgraph verbatim.
+#
+# Every variant goes through grc_headless.run_headless() (compile with grcc, run
+# to completion, wall/CPU/RSS). Up to --workers variants run at once, each in its
+# own GNU Radio process. Results are cached per (flowgraph content, parameter
+# set, samples, throttle, python), so re-running a sweep only runs what changed.
+#
+#   python launcher/grc_sweep.py experiments/qam_16.grc \
+#       -p digital_constellation_modulator_0.samples_per_symbol=2,4,8 -p samp_rate=128e3,256e3 \
+#       [--workers N] [--samples N] [--no-throttle] [--emit DIR] [--json FILE|-] [--no-cache]
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+from app_paths import cfg_dir
+from grc_flowgraph import FlowGraph, load_flowgraph, save_flowgraph
+from grc_headless import METRICS, gr_python, run_headless
+
+
+def cache_dir() -> Path:
+    return cfg_dir() / "sweep_cache"
+
+
+# --------------------- grid ---------------------
+def _values(spec: str) -> list[str]:
+    if spec.count(":") == 2 and "," not in spec:
+        try: start, stop, step = (Decimal(x.strip()) for x in spec.split(":"))
+        except InvalidOperation: raise ValueError(f"bad range {spec!r}") from None
+        if step == 0 or (stop - start) / step < 0:
+            raise ValueError(f"empty range {spec!r}")
+        n = int((stop - start) / step) + 1        # exact, so stop is included only when it is on the grid
+        vals = [start + i * step for i in range(n)]   # decimal: 0.1:0.5:0.1 gives 0.3, not 0.30000000000000004
+        return [str(int(v)) if v == v.to_integral_value() else format(v.normalize(), "f") for v in vals]
+    vals = [v.strip() for v in spec.split(",") if v.strip()]
+    if not vals: raise ValueError(f"no values in {spec!r}")
+    return vals
+
+
+def parse_grid(axes: list[str]) -> dict[str, list[str]]:
+    """["a.b=1,2", "c=0:10:5"] -> {"a.b": ["1", "2"], "c": ["0", "5", "10"]}"""
+    grid = {}
+    for ax in axes:
+        target, sep, spec = ax.partition("=")
+        if not sep or not target.strip():
+            raise ValueError(f"expected target=values, got {ax!r}")
+        grid[target.strip()] = _values(spec)
+    return grid
+
+
+def expand_grid(grid: dict[str, list[str]]) -> list[dict[str, str]]:
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def _resolve(fg: FlowGraph, target: str) -> tuple[str, str]:
+    """target -> (block name, param key); raises ValueError with what's available."""
+    if target in fg.blocks and fg.blocks[target].key.startswith("variable"):
+        return target, "value"
+    name, _, key = target.rpartition(".")
+    if name not in fg.blocks:
+        raise ValueError(f"no block or variable {target!r} in {fg.path.name}")
+    if key not in fg.blocks[name].params:
+        raise ValueError(f"{name} has no parameter {key!r} (has: {', '.join(sorted(fg.blocks[name].params))})")
+    return name, key
+
+
+def apply_params(fg: FlowGraph, params: dict[str, str]) -> FlowGraph:
+    v = fg.copy()
+    for target, value in params.items():
+        v.set_param(*_resolve(v, target), value)
+    return v
+
+
+# --------------------- cache ---------------------
+def _cache_key(base_digest: str, params: dict, samples: int, throttle: bool, python: str) -> str:
+    blob = json.dumps([base_digest, sorted(params.items()), samples, throttle, python, METRICS], separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()[:24]
+
+
+def _cache_get(key: str) -> dict | None:
+    try:
+        return json.loads((cache_dir() / f"{key}.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_set(key: str, res: dict):
+    try:
+        d = cache_dir(); d.mkdir(parents=True, exist_ok=True)
+        tmp = d / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(res), encoding="utf-8"); os.replace(tmp, d / f"{key}.json")
+    except OSError:
+        pass
+
+
+# --------------------- run ---------------------
+def sweep(grc, grid: dict[str, list[str]], samples: int = 2_000_000, keep_throttle: bool = True,
+          workers: int | None = None, timeout: float = 300.0, use_cache: bool = True,
+          python: str | None = None, progress=None) -> list[dict]:
+    """Run every grid point headless; one result dict per point, in grid order.
+    `progress(done, total, result)` is called as variants finish."""
+    grc = Path(grc)
+    base = load_flowgraph(grc)
+    points = expand_grid(grid)
+    variants = [apply_params(base, p) for p in points]          # validates every target up front
+    python = python or gr_python()
+    digest = hashlib.sha256(grc.read_bytes()).hexdigest()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(points)))
+
+    results: list[dict | None] = [None] * len(points)
+    todo = []
+    for i, p in enumerate(points):
+        key = _cache_key(digest, p, samples, keep_throttle, python)
+        hit = _cache_get(key) if use_cache else None
+        if hit is not None:
+            results[i] = {**hit, "params": p, "cached": True}
+        else:
+            todo.append((i, key))
+    done = len(points) - len(todo)
+    if progress:
+        for r in results:
+            if r is not None: progress(done, len(points), r)
+
+    def one(i: int) -> dict:
+        with tempfile.TemporaryDirectory(prefix="mmt_sweep_") as wd:
+            return run_headless(grc, samples, keep_throttle, timeout, python, Path(wd), fg=variants[i])
+
+    # Each variant is its own GNU Radio process; the pool only bounds how many run at once.
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sweep") as ex:
+        futs = {ex.submit(one, i): (i, key) for i, key in todo}
+        for fut in as_completed(futs):
+            i, key = futs[fut]
+            try:
+                r = fut.result()
+            except Exception as e:
+                r = {"experiment": grc.name, "error": f"{type(e).__name__}: {e}"}
+            if use_cache and "error" not in r:
+                _cache_set(key, r)
+            results[i] = {**r, "params": points[i], "cached": False}
+            done += 1
+            if progress: progress(done, len(points), results[i])
+    return results
+
+
+def emit_variants(grc, grid: dict[str, list[str]], out_dir) -> list[Path]:
+    """Write each grid point as a normal (GUI) flowgraph, for opening in GRC."""
+    grc, out = Path(grc), Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    base = load_flowgraph(grc)
+    paths = []
+    for n, p in enumerate(expand_grid(grid)):
+        v = apply_params(base, p)
+        paths.append(save_flowgraph(v, out / f"{grc.stem}_sweep{n:03d}{grc.suffix}"))
+    return paths
+
+
+# --------------------- CLI ---------------------
+def _fmt(v, spec):
+    return format(v, spec) if isinstance(v, (int, float)) else "-"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Run a parameter grid over one experiment, headless and in parallel")
+    ap.add_argument("grc")
+    ap.add_argument("-p", "--param", action="append", default=[], metavar="TARGET=VALUES",
+                    help="variable=v1,v2 or block.param=start:stop:step (repeatable)")
+    ap.add_argument("--workers", type=int, default=0, help="variants run at once (default: all cores)")
+    ap.add_argument("--samples", type=int, default=2_000_000)
+    ap.add_argument("--no-throttle", action="store_true")
+    ap.add_argument("--timeout", type=float, default=300.0)
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--emit", metavar="DIR", help="only write the variant .grc files to DIR")
+    ap.add_argument("--json", metavar="FILE", help="also write results as JSON ('-' for stdout only)")
+    a = ap.parse_args(argv)
+
+    try:
+        grid = parse_grid(a.param)
+        if a.emit:
+            for p in emit_variants(a.grc, grid, a.emit): print(p)
+            return 0
+        t0 = time.perf_counter()
+        def progress(done, total, r):
+            note = " (cached)" if r.get("cached") else (f"  {r['error']}" if "error" in r else "")
+            print(f"[{done}/{total}] {r['params']}{note}", file=sys.stderr, flush=True)
+        results = sweep(a.grc, grid, a.samples, not a.no_throttle, a.workers or None, a.timeout,
+                        not a.no_cache, progress=progress)
+    except (ValueError, OSError, RuntimeError) as e:
+        print(f"grc_sweep: {e}", file=sys.stderr); return 2
+
+    doc = {"grc": a.grc, "grid": grid, "samples": a.samples, "throttle": not a.no_throttle,
+           "elapsed_s": round(time.perf_counter() - t0, 3), "results": results}
+    if a.json == "-":
+        print(json.dumps(doc, indent=2)); return 0
+    if a.json:
+        Path(a.json).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+
+    cols = list(grid)
+    w = [max(len(c.rpartition(".")[2]), *(len(v) for v in grid[c])) + 2 for c in cols]
+    print("".join(f"{c.rpartition('.')[2]:<{n}}" for c, n in zip(cols, w))
+          + f"{'Msamples/s':>12}{'run s':>9}{'wall s':>9}{'cpu s':>9}{'cpu %':>8}{'peak MiB':>10}  note")
+    for r in results:
+        sps, util = r.get("samples_per_s"), r.get("cpu_util")
+        note = r.get("skipped") or r.get("error") or ("cached" if r.get("cached") else "")
+        print("".join(f"{r['params'][c]:<{n}}" for c, n in zip(cols, w))
+              + f"{_fmt(sps / 1e6 if sps else None, '.2f'):>12}{_fmt(r.get('run_s'), '.2f'):>9}{_fmt(r.get('wall_s'), '.2f'):>9}"
+              f"{_fmt(r.get('cpu_s'), '.2f'):>9}{_fmt(util * 100 if util is not None else None, '.0f'):>8}"
+              f"{_fmt(r.get('peak_rss_mb'), '.0f'):>10}  {note}")
+    print(f"{len(results)} variant(s) in {doc['elapsed_s']:.1f}s", file=sys.stderr)
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
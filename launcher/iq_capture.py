@@ -0,0 +1,252 @@
+# iq_capture.py — tap an experiment's GUI sinks to raw files, and read them back fast
+#
+# Capture: capture_variant() adds a blocks_file_sink for every stream feeding a
+# qtgui_* sink, writing it as raw samples (complex64 / float32 / …) to
+# <sink>_in<N>.iq, named after the first sink input it feeds. A small JSON
+# sidecar per sink input (<sink>_in<N>.iq.json) records dtype, sample rate,
+# where the tap came from and "file", the .iq it reads: sinks that show the same
+# stream share one file, so it is written once. The raw file stays mmap-able.
+# Each tap goes through a blocks_head first, so a recording stops after
+# max_seconds of its stream or max_bytes on disk, whichever comes first (0 = no
+# limit); the GUI sinks keep running.
+#
+# Viewing: Capture memory-maps the raw file (numpy.memmap, nothing is read up
+# front). envelope(), welch() and density() only touch a bounded number of
+# samples whatever the window size. Wide time windows come from a min/max
+# pyramid (<file>.lod<F>.npy), built once in chunks (a GUI builds it off its
+# thread and draws a strided coarse envelope meanwhile) and extended by only
+# the new rows while a capture is still being written.
+import json
+import os
+import time
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:          # capture still works; viewing needs numpy
+    np = None
+
+from grc_check import propagate_rates
+from grc_flowgraph import FlowGraph, load_flowgraph, save_flowgraph
+
+HEADER_FORMAT = "mmt-iq/1"
+DTYPES = {"complex": "complex64", "float": "float32", "int": "int32", "short": "int16", "byte": "int8"}
+ITEM_SIZE = {"complex": 8, "float": 4, "int": 4, "short": 2, "byte": 1}
+MAX_SECONDS = 60.0           # per tap; config "capture_seconds" in the launcher
+MAX_BYTES = 1 << 30          # per tap; config "capture_mb"
+LOD_FACTOR = 1024            # samples per pyramid bin
+MAX_WELCH_SEGMENTS = 64
+MAX_DENSITY_POINTS = 200_000
+COARSE_PER_BIN = 16          # samples per bin of the envelope drawn before the pyramid is ready
+
+
+# --------------------- capture ---------------------
+def _tap_limit(t: str, rate, max_seconds: float, max_bytes: int) -> int:
+    """Samples a tap may record (0 = unlimited)."""
+    limits = [int(float(rate) * max_seconds)] if rate and max_seconds > 0 else []
+    if max_bytes > 0: limits.append(max_bytes // ITEM_SIZE[t])
+    return max(min(limits), 1) if limits else 0
+
+
+def capture_variant(fg: FlowGraph, out_dir: Path, max_seconds: float = MAX_SECONDS,
+                    max_bytes: int = MAX_BYTES) -> tuple[FlowGraph, list[dict]]:
+    """Copy of fg with a (bounded) file sink per stream shown in a GUI sink -> (variant,
+    one header per GUI sink input; inputs fed by the same output share its "file")."""
+    v = fg.copy()
+    rates = propagate_rates(fg)
+    headers, taps = [], {}     # (src, sport) -> (data file, samples limit)
+    for b in [b for b in v.active() if b.key.startswith("qtgui_")]:
+        t = b.params.get("type", "complex").strip().lower()
+        if t not in DTYPES: t = "complex" if "_c" in b.name else "float"
+        for src, sport, _, dport in [c for c in v.connections if c[2] == b.name]:
+            rate = rates.get(src) or fg.param(b, "samp_rate", "sample_rate")
+            if (src, sport) not in taps:
+                data = Path(out_dir) / f"{b.name}_in{dport}.iq"
+                tap = v.add_block(v.unique_name("mmt_capture"), "blocks_file_sink",
+                                  {"type": t, "file": repr(str(data)), "vlen": "1", "unbuffered": "False", "append": "False"})
+                limit = _tap_limit(t, rate, max_seconds, max_bytes)
+                if limit:
+                    head = v.add_block(v.unique_name("mmt_capture_head"), "blocks_head",
+                                       {"type": t, "num_items": str(limit), "vlen": "1"})
+                    v.connect(src, sport, head.name, "0"); v.connect(head.name, "0", tap.name, "0")
+                else:
+                    v.connect(src, sport, tap.name, "0")
+                taps[(src, sport)] = (data, limit)
+            data, limit = taps[(src, sport)]
+            headers.append({"format": HEADER_FORMAT, "file": data.name, "dtype": DTYPES[t],
+                            "samp_rate": float(rate) if rate else None, "experiment": fg.path.name,
+                            "sink": b.name, "sink_key": b.key, "input": str(dport), "source": src,
+                            "title": b.params.get("name", "").strip("'\""), "created": time.time(),
+                            "max_samples": limit or None})
+    return v, headers
+
+
+def prepare_capture(grc_file, root, max_seconds: float = MAX_SECONDS, max_bytes: int = MAX_BYTES) -> tuple[Path, list[Path]]:
+    """Write a capture variant of grc_file into a fresh folder under root -> (flowgraph, sidecars)."""
+    grc_file = Path(grc_file)
+    out = Path(root) / f"{grc_file.stem}_{time.strftime('%Y%m%d-%H%M%S')}"
+    out.mkdir(parents=True, exist_ok=True)
+    v, headers = capture_variant(load_flowgraph(grc_file), out, max_seconds, max_bytes)
+    if not headers:
+        raise ValueError(f"{grc_file.name} has no GUI sinks to capture")
+    sidecars = []
+    for h in headers:
+        p = out / f"{h['sink']}_in{h['input']}.iq.json"
+        p.write_text(json.dumps(h, indent=2), encoding="utf-8"); sidecars.append(p)
+    return save_flowgraph(v, out / grc_file.name), sidecars
+
+
+def _sidecar_file(side: Path) -> Path:
+    """The raw file a sidecar describes: its "file" (shared streams), else its own name minus .json."""
+    try: name = json.loads(side.read_text(encoding="utf-8")).get("file")
+    except (OSError, ValueError, AttributeError): name = None
+    return side.with_name(name) if name else side.with_suffix("")
+
+
+def list_captures(root) -> list[Path]:
+    """Raw capture files (with a sidecar) under root, once each, newest folder first."""
+    root = Path(root)
+    if not root.is_dir(): return []
+    found = {f for f in map(_sidecar_file, root.rglob("*.iq.json")) if f.exists()}
+    return sorted(found, key=lambda p: (-p.parent.stat().st_mtime, p.name))
+
+
+# --------------------- reading ---------------------
+def _need_numpy():
+    if np is None:
+        raise RuntimeError("numpy is required to view captures (pip install numpy)")
+
+
+class Capture:
+    """A raw capture, memory-mapped. Call refresh() to pick up samples still being written."""
+
+    def __init__(self, path):
+        _need_numpy()
+        self.path = Path(path)
+        side = self.path.with_name(self.path.name + ".json")
+        self.meta = json.loads(side.read_text(encoding="utf-8")) if side.exists() else {}
+        self.dtype = np.dtype(self.meta.get("dtype", "complex64"))
+        self.samp_rate = self.meta.get("samp_rate") or 1.0
+        self.is_complex = self.dtype.kind == "c"
+        self._lod = None
+        self.refresh()
+
+    def refresh(self):
+        """Re-map the file; a capture still being written only grows, so the pyramid so far stays valid."""
+        n = self.path.stat().st_size // self.dtype.itemsize
+        self.data = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(n,)) if n else np.zeros(0, self.dtype)
+        if self._lod is not None and len(self._lod) > n // LOD_FACTOR: self._lod = None   # shrank: a new file
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def duration_s(self) -> float:
+        return len(self) / self.samp_rate
+
+    # Columns: [re_min, re_max(, im_min, im_max)] per bin
+    def _components(self, x):
+        return (x.real, x.imag) if self.is_complex else (x,)
+
+    def _minmax(self, x, edges):
+        cols = []
+        for c in self._components(x):
+            c = c.astype(np.float32, copy=False)
+            cols += [np.minimum.reduceat(c, edges), np.maximum.reduceat(c, edges)]
+        return np.stack(cols, axis=1)
+
+    def _lod_path(self) -> Path:
+        return self.path.with_name(f"{self.path.name}.lod{LOD_FACTOR}.npy")
+
+    def lod_ready(self) -> bool:
+        """Is the pyramid of the whole file at hand (in memory, or a current cache on disk)?"""
+        rows = len(self) // LOD_FACTOR
+        if self._lod is not None and len(self._lod) == rows: return True
+        try:
+            if self._lod_path().stat().st_mtime >= self.path.stat().st_mtime:
+                arr = np.load(self._lod_path(), mmap_mode="r")
+                if len(arr) == rows: self._lod = arr; return True
+        except (OSError, ValueError):
+            pass
+        return False
+
+    def needs_lod(self, start: int, stop: int, bins: int) -> bool:
+        """Does envelope() of this window read the pyramid?"""
+        n = min(len(self), int(stop)) - max(0, int(start))
+        return n > 0 and n // max(1, min(bins, n)) >= 2 * LOD_FACTOR and len(self) >= LOD_FACTOR
+
+    def lod(self):
+        """min/max per LOD_FACTOR samples, cached next to the capture. Rows already built (before the
+        file grew) are kept. Reads the whole file the first time: call it off a GUI thread."""
+        if self.lod_ready(): return self._lod
+        data, have = self.data, self._lod          # refresh() may swap both meanwhile
+        rows = len(data) // LOD_FACTOR
+        arr = np.empty((rows, 4 if self.is_complex else 2), np.float32)
+        done = len(have) if have is not None else 0
+        if done: arr[:done] = have
+        step = LOD_FACTOR * 4096                 # ~32 MiB of complex64 per chunk
+        for i in range(done * LOD_FACTOR, rows * LOD_FACTOR, step):
+            chunk = data[i:min(i + step, rows * LOD_FACTOR)]
+            r0 = i // LOD_FACTOR
+            arr[r0:r0 + len(chunk) // LOD_FACTOR] = self._minmax(chunk, np.arange(0, len(chunk), LOD_FACTOR))
+        try:
+            cache = self._lod_path(); tmp = cache.with_name(cache.name + f".{os.getpid()}.tmp.npy")
+            np.save(tmp, arr); os.replace(tmp, cache)
+        except OSError:
+            pass
+        if rows <= len(self) // LOD_FACTOR: self._lod = arr
+        return arr
+
+    def envelope(self, start: int, stop: int, bins: int, coarse_ok: bool = False):
+        """(sample index of each bin, [bins, 2|4] min/max) for the window, bins <= pixels. With
+        coarse_ok, a window that needs a pyramid not built yet gets min/max of COARSE_PER_BIN
+        evenly spaced samples per bin instead (peaks between them can be missed)."""
+        start, stop = max(0, int(start)), min(len(self), int(stop))
+        n = stop - start
+        if n <= 0: return np.zeros(0), np.zeros((0, 4 if self.is_complex else 2), np.float32)
+        bins = max(1, min(bins, n))
+        if self.needs_lod(start, stop, bins) and coarse_ok and not self.lod_ready():
+            edges = np.linspace(0, n, bins, endpoint=False).astype(np.int64)
+            x = np.asarray(self.data[start + np.linspace(0, n - 1, bins * COARSE_PER_BIN).astype(np.int64)])
+            return start + edges, self._minmax(x, np.arange(0, len(x), COARSE_PER_BIN))
+        if self.needs_lod(start, stop, bins):
+            lod = self.lod()
+            r0, r1 = start // LOD_FACTOR, max(start // LOD_FACTOR + 1, min(len(lod), stop // LOD_FACTOR))
+            edges = np.linspace(0, r1 - r0, bins, endpoint=False).astype(np.int64)
+            part = np.asarray(lod[r0:r1])
+            mm = [np.minimum.reduceat(part[:, k], edges) if k % 2 == 0 else np.maximum.reduceat(part[:, k], edges)
+                  for k in range(part.shape[1])]
+            return start + edges * LOD_FACTOR, np.stack(mm, axis=1)
+        edges = np.linspace(0, n, bins, endpoint=False).astype(np.int64)
+        return start + edges, self._minmax(np.asarray(self.data[start:stop]), edges)
+
+    def welch(self, start: int, stop: int, nfft: int = 1024, max_segments: int = MAX_WELCH_SEGMENTS):
+        """(freqs Hz, PSD dB) averaged over at most max_segments Hann windows spread over the window."""
+        start, stop = max(0, int(start)), min(len(self), int(stop))
+        nfft = max(16, min(nfft, stop - start)) if stop - start >= 16 else 0
+        if not nfft: return np.zeros(0), np.zeros(0)
+        room = stop - start - nfft
+        k = max(1, min(max_segments, room // (nfft // 2) + 1))
+        starts = start + np.linspace(0, room, k).astype(np.int64)
+        segs = self.data[starts[:, None] + np.arange(nfft)[None, :]]          # reads only k*nfft samples
+        w = np.hanning(nfft).astype(np.float32)
+        fs = self.samp_rate
+        if self.is_complex:
+            spec = np.fft.fftshift(np.fft.fft(segs * w, axis=1), axes=1)
+            freqs = np.fft.fftshift(np.fft.fftfreq(nfft, 1 / fs))
+        else:
+            spec = np.fft.rfft((segs - segs.mean(axis=1, keepdims=True)) * w, axis=1)
+            freqs = np.fft.rfftfreq(nfft, 1 / fs)
+        psd = (np.abs(spec) ** 2).mean(axis=0) / (fs * float((w ** 2).sum()))
+        return freqs, 10 * np.log10(psd + 1e-20)
+
+    def density(self, start: int, stop: int, bins: int = 160, max_points: int = MAX_DENSITY_POINTS):
+        """(log10(1+count) [bins, bins] over I/Q, half-extent) or None for real captures."""
+        if not self.is_complex: return None
+        start, stop = max(0, int(start)), min(len(self), int(stop))
+        if stop <= start: return None
+        step = max(1, (stop - start) // max_points)
+        pts = np.asarray(self.data[start:stop:step])
+        lim = float(np.percentile(np.abs(np.concatenate([pts.real, pts.imag])), 99.9)) * 1.1 or 1.0
+        h, _, _ = np.histogram2d(pts.imag, pts.real, bins=bins, range=[[-lim, lim], [-lim, lim]])
+        return np.log10(1 + h[::-1]), lim                                  # row 0 = +Q (top)
@@ -0,0 +1,604 @@
+# lab_window.py — the launcher's Qt window, imported only once the GUI starts
+#
+# virtual_lab_launcher.py (discovery, caches, process supervision, sessions)
+# has no Qt dependency; its main() imports this module after the command line
+# is parsed. Everything that can wait does: GNU Radio discovery and the
+# experiments-folder lookup run on a thread after the first paint, and the logo
+# is decoded and scaled off the GUI thread (a small scaled copy is cached).
+import threading
+import time
+from typing import Optional
+
+from PySide6.QtCore import Qt, QTimer, QThread, QObject, Signal, QFileSystemWatcher
+from PySide6.QtGui import QIcon, QImage, QImageReader, QPixmap
+from PySide6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QLabel, QComboBox, QPushButton,
+    QVBoxLayout, QHBoxLayout, QFrame, QMessageBox, QSpacerItem, QSizePolicy,
+    QStatusBar, QProgressDialog, QPlainTextEdit, QListWidget, QListWidgetItem
+)
+
+from virtual_lab_launcher import (
+    APP_BRAND, APP_TITLE, CLOSE_AFTER_SUCCESS_MS, ProcSupervisor, SessionScheduler,
+    _MEM, _POOL, _PROCS, _SESSIONS, _captures_dir, _cfg_dir, _logo_path, experiment_catalog,
+    experiment_file, experiments, experiment_packs, InstanceServer, find_gnuradio_companion, handle_forwarded, launch, refresh_experiments, resolve_experiments_dir,
+    session_telemetry, startup_mark, startup_report
+)
+
+LOGO_HEIGHT = 120
+PRIMARY = "#0A66C2"; SURFACE = "#FFFFFF"; TEXT = "#111111"; MUTED = "#6B7280"; ACCENT_BG = "#F3F6FB"
+
+QSS = f"""
+* {{ font-family: 'Segoe UI', Arial; color: {TEXT}; }}
+QMainWindow {{ background: {SURFACE}; }}
+QFrame#Header {{ background: {PRIMARY}; border: none; }}
+QLabel#Logo {{ margin: 6px 0; }}
+QLabel#Brand {{ color: white; font-size: 18px; font-weight: 700; }}
+QLabel#Subtitle {{ color: white; font-size: 12px; }}
+QFrame.Card {{ background: {ACCENT_BG}; border-radius: 12px; }}
+QLabel.SectionTitle {{ font-size: 12px; color: {MUTED}; letter-spacing: 1px; }}
+QComboBox {{ padding: 8px 12px; border: 1px solid #DFE3EA; border-radius: 10px; }}
+QComboBox:hover {{ border-color: {PRIMARY}; }}
+QPushButton.Primary {{ background: {PRIMARY}; color: white; padding: 10px 14px; border-radius: 10px; font-weight: 600; }}
+QPushButton.Primary:hover {{ background: #0853a0; }}
+QPlainTextEdit#Log {{ font-family: Consolas, 'Courier New', monospace; font-size: 11px; border: 1px solid #DFE3EA; border-radius: 8px; background: white; }}
+"""
+
+# --------------------- threaded launcher ---------------------
+class LaunchWorker(QObject):
+    finished = Signal(bool, str)   # ok, msg
+    notice   = Signal(str)         # informational lines for the log pane
+
+    def __init__(self, mode: str, exp_name: Optional[str] = None, trace: Optional["LaunchTrace"] = None):
+        super().__init__()
+        self.mode = mode          # "blank", "file", "run" (compiled, no editor) or "capture" (file + IQ taps)
+        self.exp_name = exp_name
+        if trace is None:
+            from launch_trace import LaunchTrace
+            trace = LaunchTrace(mode, exp_name)
+        self.trace = trace  # started at the click, if the UI made it
+
+    def run(self):
+        self.trace.activate()
+        try:
+            ok, msg = self._launch()
+        except Exception as e:
+            # Guarantee we always signal the UI to close the spinner
+            ok, msg = False, f"Unexpected error: {type(e).__name__}: {e}"
+        self.trace.finish(ok, msg)
+        self.finished.emit(ok, msg)
+
+    def _launch(self) -> tuple[bool, str]:
+        return launch(self.mode, self.exp_name, self.notice.emit)
+
+# Re-emits ProcSupervisor events as Qt signals. Pump threads emit; receivers
+# living on the GUI thread get them queued, so slots may touch widgets.
+class ProcBridge(QObject):
+    started = Signal(int, str)         # pid, label
+    output  = Signal(int, str, str)    # pid, stream, line
+    exited  = Signal(int, int)         # pid, returncode
+
+    def __init__(self, sup: ProcSupervisor):
+        super().__init__()
+        self._sup = sup
+        sup.subscribe(self._relay)
+
+    def _relay(self, event: str, pid: int, payload):
+        if event == "output":    self.output.emit(pid, payload[0], payload[1])
+        elif event == "started": self.started.emit(pid, payload)
+        elif event == "exited":  self.exited.emit(pid, payload)
+
+    def detach(self):
+        self._sup.unsubscribe(self._relay)
+
+class SessionBridge(QObject):
+    changed = Signal(str, str, str)    # event, session label, start()'s message for queued sessions
+
+    def __init__(self, sched: SessionScheduler):
+        super().__init__()
+        # an immediate start already reported its message through LaunchWorker.finished
+        sched.subscribe(lambda event, sess: self.changed.emit(event, sess.label, sess.msg if sess.waited else ""))
+
+# Telemetry sampler thread -> GUI thread; samples are batched per tick.
+class TelemetryBridge(QObject):
+    sampled = Signal(int, object)      # root pid, {"cpu_pct", "rss", "threads", "procs", "t"}
+    alert   = Signal(int, object)      # root pid, over_budget payload
+    ended   = Signal(int, object)      # root pid, {"label", "samples", "peak_cpu_pct", "peak_rss"}
+
+    def __init__(self, tel: "ProcTelemetry"):
+        super().__init__()
+        tel.subscribe(self._relay)
+
+    def _relay(self, event: str, pid: int, payload):
+        if event == "sample":        self.sampled.emit(pid, payload)
+        elif event == "over_budget": self.alert.emit(pid, payload)
+        elif event == "ended":       self.ended.emit(pid, payload)
+
+# Commands from later launcher starts (InstanceServer thread) -> GUI thread.
+class InstanceBridge(QObject):
+    command = Signal(str, str)         # cmd, experiment name ("" for none)
+
+    def post(self, cmd: str, name: Optional[str]):
+        self.command.emit(cmd, name or "")
+
+# --------------------- UI ---------------------
+class MainWindow(QMainWindow):
+    catalog_changed = Signal()   # emitted from the rescan thread
+    prewarmed = Signal()         # emitted from the pre-warm thread
+    logo_ready = Signal(QImage)  # QImage (unlike QPixmap) may be built off the GUI thread
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle(APP_TITLE)
+        self.setMinimumSize(900, 500)
+        self.setWindowIcon(QIcon())
+        self.status = QStatusBar(); self.setStatusBar(self.status)
+        self._active_dlg = None  # track any active buffering dialog
+        self._labels: dict[int, str] = {}  # pid -> label for the log pane
+        refresh_experiments(rescan=False)  # persisted index only: no disk walk before first paint
+        self._build_ui()
+        self._procs = ProcBridge(_PROCS)
+        self._procs.started.connect(self._on_proc_started)
+        self._procs.output.connect(self._on_proc_output)
+        self._procs.exited.connect(self._on_proc_exited)
+        self._launches: set = set()  # (QThread, LaunchWorker) still running; several may overlap
+        self._sessions = SessionBridge(_SESSIONS)
+        self._sessions.changed.connect(self._on_session_event)
+        self._figures: dict[int, dict] = {}  # root pid -> latest telemetry sample
+        self.telemetry_lbl = QLabel(""); self.telemetry_lbl.setStyleSheet(f"color: {MUTED};")
+        self.status.addPermanentWidget(self.telemetry_lbl)
+        self._telemetry = None   # TelemetryBridge, made in _prewarm (after first paint)
+        self._refresh_sessions()
+        self.setStyleSheet(QSS)
+        # Pre-warm once the window has painted; the slow parts run on a thread
+        self.prewarmed.connect(self._on_prewarmed)
+        self.logo_ready.connect(lambda img: self.logo_lbl.setPixmap(QPixmap.fromImage(img)))
+        QTimer.singleShot(0, self._prewarm)
+
+    def _build_ui(self):
+        root = QWidget(); self.setCentralWidget(root)
+        outer = QVBoxLayout(root); outer.setContentsMargins(16,16,16,16); outer.setSpacing(14)
+
+        # ---------- Header with LOGO above text ----------
+        # ---------- Header with LOGO above text (LEFT aligned) ----------
+        header = QFrame(objectName="Header")
+        hl = QVBoxLayout(header)  # vertical: logo -> brand -> subtitle
+        hl.setContentsMargins(16, 12, 16, 12)
+        hl.setSpacing(6)
+        # Align the whole column to the LEFT
+        hl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        # Logo space is reserved now; the image arrives from _load_logo()
+        self.logo_lbl = logo_lbl = QLabel(objectName="Logo")
+        # LEFT align the image
+        logo_lbl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        if _logo_path(): logo_lbl.setFixedHeight(LOGO_HEIGHT + 12)   # + the 6px QSS margins
+
+        brand = QLabel(APP_BRAND, objectName="Brand")
+        brand.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        sub = QLabel("Signal Processing Experiments (AM, FM, FSK, QPSK, 16-QAM)", objectName="Subtitle")
+        sub.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        hl.addWidget(logo_lbl)
+        hl.addWidget(brand)
+        hl.addWidget(sub)
+        outer.addWidget(header)
+
+
+        # ---------- Card ----------
+        card = QFrame(); card.setObjectName("Card"); card.setProperty("class", "Card")
+        card_l = QVBoxLayout(card); card_l.setContentsMargins(16,16,16,16); card_l.setSpacing(10)
+
+        section = QLabel("SELECT EXPERIMENT", objectName="SectionTitle"); section.setProperty("class","SectionTitle")
+        card_l.addWidget(section)
+
+        self.combo = QComboBox()
+        self._fill_combo()
+        card_l.addWidget(self.combo)
+        # Reference preview (NumPy model, no GNU Radio); built after the first paint
+        self.preview_box = QVBoxLayout(); self.preview_box.setContentsMargins(0, 0, 0, 0)
+        card_l.addLayout(self.preview_box)
+        self._preview = None
+        self.combo.currentTextChanged.connect(lambda _: self._update_preview())
+
+        self.btn_open = QPushButton("Open GNU Radio"); self.btn_open.setObjectName("Primary"); self.btn_open.setProperty("class","Primary")
+        self.btn_open.clicked.connect(self.on_open)
+        self.btn_run = QPushButton("Run directly"); self.btn_run.setObjectName("Primary"); self.btn_run.setProperty("class","Primary")
+        self.btn_run.setToolTip("Run the experiment without the GRC editor (compiled once, cached until the .grc changes)")
+        self.btn_run.clicked.connect(self.on_run)
+        open_row = QHBoxLayout(); open_row.setSpacing(10)
+        open_row.addWidget(self.btn_open, 1); open_row.addWidget(self.btn_run)
+        card_l.addLayout(open_row)
+
+        self.btn_capture = QPushButton("Open with capture")
+        self.btn_capture.setToolTip("Open a copy that also records every Time/Spectrum/Constellation input to disk")
+        self.btn_capture.clicked.connect(self.on_capture)
+        self.btn_view = QPushButton("View captures…"); self.btn_view.clicked.connect(self.on_view_captures)
+        cap_row = QHBoxLayout(); cap_row.setSpacing(10)
+        cap_row.addWidget(self.btn_capture, 1); cap_row.addWidget(self.btn_view, 1)
+        card_l.addLayout(cap_row)
+
+        self.btn_open_blank = QPushButton("Open GNU Radio (blank)"); self.btn_open_blank.setObjectName("Primary"); self.btn_open_blank.setProperty("class","Primary")
+        self.btn_open_blank.clicked.connect(self.on_open_blank)
+        card_l.addWidget(self.btn_open_blank)
+
+        hint = QLabel("Tip: After GRC opens, press ▶ to run. Use QT GUI sinks for Time/Freq/Constellation.")
+        hint.setStyleSheet(f"color: {MUTED};"); card_l.addWidget(hint)
+
+        outer.addWidget(card)
+
+        # ---------- Sessions (running + queued, with position) ----------
+        ses_card = QFrame(); ses_card.setObjectName("Card"); ses_card.setProperty("class", "Card")
+        ses_l = QVBoxLayout(ses_card); ses_l.setContentsMargins(16,12,16,12); ses_l.setSpacing(6)
+        ses_head = QHBoxLayout()
+        self.sessions_title = QLabel("SESSIONS", objectName="SectionTitle"); self.sessions_title.setProperty("class","SectionTitle")
+        ses_head.addWidget(self.sessions_title); ses_head.addStretch(1)
+        self.btn_stop = QPushButton("Stop selected"); self.btn_stop.clicked.connect(self.on_stop_session)
+        ses_head.addWidget(self.btn_stop)
+        ses_l.addLayout(ses_head)
+        self.sessions = QListWidget(); self.sessions.setMaximumHeight(110)
+        ses_l.addWidget(self.sessions)
+        outer.addWidget(ses_card)
+
+        # ---------- Process log (stdout/stderr of everything we spawned) ----------
+        log_card = QFrame(); log_card.setObjectName("Card"); log_card.setProperty("class", "Card")
+        log_l = QVBoxLayout(log_card); log_l.setContentsMargins(16,12,16,12); log_l.setSpacing(6)
+        log_title = QLabel("LOG", objectName="SectionTitle"); log_title.setProperty("class","SectionTitle")
+        log_l.addWidget(log_title)
+        self.log = QPlainTextEdit(objectName="Log"); self.log.setReadOnly(True)
+        self.log.setMaximumBlockCount(5000)  # bounded, so a chatty child can't bloat the UI
+        log_l.addWidget(self.log)
+        outer.addWidget(log_card, 1)
+
+        # ---------- Footer ----------
+        footer = QHBoxLayout(); footer.addItem(QSpacerItem(20,20,QSizePolicy.Expanding,QSizePolicy.Minimum))
+        foot = QLabel(" MakeMyTechnology"); foot.setStyleSheet(f"color: {MUTED};"); footer.addWidget(foot, 0, Qt.AlignRight)
+        outer.addLayout(footer)
+
+    def _prewarm(self):
+        self._telemetry = TelemetryBridge(session_telemetry())
+        self._telemetry.sampled.connect(self._on_sample)
+        self._telemetry.alert.connect(self._on_budget)
+        self._telemetry.ended.connect(self._on_tree_ended)
+        dpr = self.devicePixelRatioF()
+        def work():
+            self._load_logo(dpr)
+            try: _MEM["grc_path"] = find_gnuradio_companion()
+            except Exception: pass
+            if _MEM["grc_path"]: _POOL.fill_async(_MEM["grc_path"])
+            try: _MEM["exp_dir"]  = resolve_experiments_dir()
+            except Exception: pass
+            startup_mark("prewarm done")
+            self.prewarmed.emit()
+        threading.Thread(target=work, name="prewarm", daemon=True).start()
+
+    def _on_prewarmed(self):
+        self._watch_experiments()
+        self._update_preview()
+
+    def _load_logo(self, dpr: float = 1.0):
+        # Decoding + smooth-scaling the full-size PNG costs more than the rest of the
+        # window; do it once, keep the scaled copy in the config dir (keyed by mtime/size).
+        lp = _logo_path()
+        if not lp: return
+        # make_installer_assets.py pre-renders mmt_logo_header[@2x].png at LOGO_HEIGHT: use as-is
+        for name, scale in (("mmt_logo_header@2x.png", 2), ("mmt_logo_header.png", 1)):
+            if scale > dpr + 0.25: continue
+            img = QImage(str(lp.with_name(name)))
+            if not img.isNull():
+                img.setDevicePixelRatio(scale); self.logo_ready.emit(img); return
+        try: st = lp.stat()
+        except OSError: return
+        cache = _cfg_dir() / f"logo_{LOGO_HEIGHT}_{int(st.st_mtime)}_{st.st_size}.png"
+        img = QImage(str(cache)) if cache.exists() else QImage()
+        if img.isNull():
+            r = QImageReader(str(lp)); size = r.size()
+            if size.isValid() and size.height() > LOGO_HEIGHT:
+                r.setScaledSize(size.scaled(size.width(), LOGO_HEIGHT, Qt.KeepAspectRatio))
+            img = r.read()
+            if img.isNull(): return
+            img.save(str(cache))
+        self.logo_ready.emit(img)
+
+    # ---------- experiment catalog ----------
+    def _fill_combo(self):
+        current = self.combo.currentText()
+        self.combo.blockSignals(True); self.combo.clear()
+        cat = experiment_catalog()
+        for name, fn in experiments().items():
+            self.combo.addItem(name)
+            desc = cat.info(fn).get("description")
+            if desc: self.combo.setItemData(self.combo.count() - 1, desc, Qt.ToolTipRole)
+        i = self.combo.findText(current)
+        if i >= 0: self.combo.setCurrentIndex(i)
+        self.combo.blockSignals(False)
+
+    def _watch_experiments(self):
+        # Incremental refresh: the watcher only triggers a (debounced) rescan,
+        # which stats every file but re-parses just the ones that changed.
+        self._rescan_timer = QTimer(self); self._rescan_timer.setSingleShot(True); self._rescan_timer.setInterval(300)
+        self._rescan_timer.timeout.connect(self._rescan_catalog)
+        self.catalog_changed.connect(self._fill_combo)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(lambda _: self._rescan_timer.start())
+        self._watcher.fileChanged.connect(lambda _: self._rescan_timer.start())
+        self._rescan_catalog()
+
+    def _rescan_catalog(self):
+        def work():
+            try:
+                if refresh_experiments(): self.catalog_changed.emit()
+            except Exception:
+                pass
+        d = _MEM["exp_dir"]
+        if d and d.is_dir():
+            watched = set(self._watcher.directories() + self._watcher.files())
+            from exp_packs import is_pack_ref
+            paths = ([str(d)] + [str(d / fn) for fn in experiments().values() if not is_pack_ref(fn)] + experiment_packs().paths())[:256]
+            new = [p for p in paths if p not in watched]
+            if new: self._watcher.addPaths(new)
+        threading.Thread(target=work, daemon=True).start()
+
+    # ---------- buffering dialog helpers ----------
+    def _show_buffering(self, text: str = "Opening GNU Radio…") -> tuple[QProgressDialog, float]:
+        dlg = QProgressDialog(text, None, 0, 0, self)
+        dlg.setWindowTitle("Please wait")
+        dlg.setCancelButton(None)
+        dlg.setWindowModality(Qt.WindowModal)
+        dlg.setMinimumDuration(0)     # show immediately
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.show()
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        return dlg, time.monotonic()
+
+    def _close_buffering_after(self, dlg: QProgressDialog, delay_ms: int):
+        def _finish():
+            try:
+                if dlg and dlg.isVisible():
+                    dlg.close()
+            except Exception:
+                pass
+            QApplication.restoreOverrideCursor()
+            self._active_dlg = None
+        QTimer.singleShot(delay_ms, _finish)
+
+    # ---------- thread orchestration ----------
+    def _launch_in_thread(self, mode: str, exp_name: Optional[str] = None):
+        from launch_trace import LaunchTrace
+        trace = LaunchTrace(mode, exp_name)  # the clock starts at the click
+        # Close any previously stuck dialog (paranoia)
+        if self._active_dlg is not None:
+            try: self._active_dlg.close()
+            except Exception: pass
+            QApplication.restoreOverrideCursor()
+            self._active_dlg = None
+
+        # 1) Show buffering immediately (GUI thread)
+        dlg, _ = self._show_buffering("Compiling / starting experiment…" if mode == "run" else "Opening GNU Radio…")
+        self._active_dlg = dlg  # keep a handle for safety
+
+        # 2) Prepare worker + thread (kept in self._launches until the thread ends)
+        thr = QThread(self)
+        wrk = LaunchWorker(mode=mode, exp_name=exp_name, trace=trace)
+        wrk.moveToThread(thr)
+        self._launches.add((thr, wrk))
+
+        thr.started.connect(wrk.run)
+
+        def on_finished(ok: bool, msg: str):
+            # Runs on GUI thread (QueuedConnection)
+            self._post_to_gui(lambda: self.status.showMessage(msg, 8000))
+            if not ok:
+                # Close immediately on failure
+                try:
+                    if dlg and dlg.isVisible():
+                        dlg.close()
+                except Exception:
+                    pass
+                QApplication.restoreOverrideCursor()
+                self._active_dlg = None
+                QMessageBox.critical(self, "Launch failed", msg)
+            else:
+                # Close after the fixed 2s buffer on success
+                self._close_buffering_after(dlg, CLOSE_AFTER_SUCCESS_MS)
+            thr.quit()
+
+        # Force queued delivery of the finish signal
+        wrk.finished.connect(on_finished, type=Qt.QueuedConnection)
+        wrk.notice.connect(self.log.appendPlainText, type=Qt.QueuedConnection)
+
+        # SAFETY NET: if the thread finishes for any reason and dialog is still up, close it.
+        def _safety_close():
+            try:
+                if dlg and dlg.isVisible():
+                    dlg.close()
+                QApplication.restoreOverrideCursor()
+            except Exception:
+                pass
+            self._active_dlg = None
+            self._launches.discard((thr, wrk))
+
+        thr.finished.connect(wrk.deleteLater, type=Qt.QueuedConnection)
+        thr.finished.connect(thr.deleteLater, type=Qt.QueuedConnection)
+        thr.finished.connect(_safety_close, type=Qt.QueuedConnection)
+
+        thr.start()
+
+    # ---------- sessions ----------
+    def _on_session_event(self, event: str, label: str, msg: str):
+        self.log.appendPlainText(f"[session] {label} {event}" + (f": {msg}" if msg and event in ("started", "failed") else ""))
+        self._refresh_sessions()
+
+    def _refresh_sessions(self):
+        snap = _SESSIONS.snapshot()
+        self.sessions.clear()
+        for r in snap:
+            if r["state"] == "queued":
+                text = f"#{r['position']} queued   {r['label']}   (waiting {r['waited_s']:.0f}s)"
+            else:
+                text = f"running   {r['label']}   pid {r['pid']}   slot {r['slot']}"
+            it = QListWidgetItem(text); it.setData(Qt.UserRole, r["id"]); self.sessions.addItem(it)
+            it.setData(Qt.UserRole + 1, r.get("pid")); it.setData(Qt.UserRole + 2, text)
+            self._set_figures(it)
+        n_run = sum(1 for r in snap if r["state"] != "queued")
+        n_q = len(snap) - n_run
+        if _SESSIONS.cap:
+            n_fg = sum(1 for r in snap if r["state"] != "queued" and r["limited"])
+            self.sessions_title.setText(f"SESSIONS  {n_run} running ({n_fg}/{_SESSIONS.cap} flowgraphs), {n_q} queued")
+        else:
+            self.sessions_title.setText(f"SESSIONS  {n_run} running")
+
+    # ---------- telemetry ----------
+    def _set_figures(self, it: QListWidgetItem):
+        s = self._figures.get(it.data(Qt.UserRole + 1))
+        if not s: it.setText(it.data(Qt.UserRole + 2)); return
+        from proc_telemetry import fmt_sample
+        it.setText(it.data(Qt.UserRole + 2) + f"   {fmt_sample(s)}")
+
+    def _on_sample(self, pid: int, s: dict):
+        from proc_telemetry import fmt_bytes
+        if pid not in session_telemetry().latest(): return   # queued behind its "ended"
+        self._figures[pid] = s
+        for i in range(self.sessions.count()):
+            if self.sessions.item(i).data(Qt.UserRole + 1) == pid: self._set_figures(self.sessions.item(i))
+        figs = self._figures.values()
+        self.telemetry_lbl.setText(f"Sessions: CPU {sum(f['cpu_pct'] for f in figs):.0f}%   "
+                                   f"RSS {fmt_bytes(sum(f['rss'] for f in figs))}")
+
+    def _on_budget(self, pid: int, a: dict):
+        what = f"CPU {a['value']:.0f}% > {a['limit']:.0f}%" if a["kind"] == "cpu" else f"RSS {a['value']:.0f} MB > {a['limit']:.0f} MB"
+        done = f"stopped pid {a['victim']}" if a["action"] == "killed" else "still running"
+        msg = f"{a['label']} (pid {pid}) over budget: {what}; {done}"
+        self.log.appendPlainText(f"[budget] {msg}"); self.status.showMessage(msg, 15000)
+
+    def _on_tree_ended(self, pid: int, e: dict):
+        self._figures.pop(pid, None)
+        if not self._figures: self.telemetry_lbl.setText("")
+        if e["samples"]:
+            from proc_telemetry import fmt_bytes
+            self.log.appendPlainText(f"[{e['label']} {pid}] peak CPU {e['peak_cpu_pct']:.0f}%, peak RSS {fmt_bytes(e['peak_rss'])}")
+
+    def on_stop_session(self):
+        it = self.sessions.currentItem()
+        if it is not None and not _SESSIONS.cancel(it.data(Qt.UserRole)):
+            self.status.showMessage("Could not stop that session.", 5000)
+
+    # Button 1: open selected .grc (threaded; the worker validates paths)
+    def on_open(self):
+        self._launch_in_thread("file", exp_name=self.combo.currentText())
+
+    # Button 1b: run the selected experiment from the compile cache (threaded)
+    def on_run(self):
+        self._launch_in_thread("run", exp_name=self.combo.currentText())
+
+    # Button 1c: open a capture copy of the selected experiment (threaded)
+    def on_capture(self):
+        self._launch_in_thread("capture", exp_name=self.combo.currentText())
+
+    def _update_preview(self):
+        name = self.combo.currentText(); d = _MEM["exp_dir"]
+        fn = experiments().get(name)
+        if not name or not fn: return
+        try: path = experiment_file(fn, d)   # pack flowgraphs are small: extracting one is cheap
+        except Exception: return
+        if not path: return
+        if self._preview is None:
+            try:
+                from capture_viewer import ReferencePreview   # numpy only when there is something to show
+            except ImportError:
+                self._preview = False; return
+            self._preview = ReferencePreview(); self.preview_box.addWidget(self._preview)
+        if self._preview and self._preview.show_reference(path):
+            need = self.minimumSizeHint().height()
+            if self.height() < need: self.resize(self.width(), need)   # setMinimumSize() is explicit, so grow by hand
+
+    def on_view_captures(self):
+        try:
+            from capture_viewer import CaptureViewer   # numpy + plotting only when asked for
+        except ImportError as e:
+            QMessageBox.warning(self, "Captures", f"The capture viewer needs numpy ({e})."); return
+        if getattr(self, "_viewer", None) is None:
+            self._viewer = CaptureViewer(_captures_dir(), self)
+        else:
+            self._viewer.reload()
+        self._viewer.show(); self._viewer.raise_()
+
+    # ---------- child process events (GUI thread) ----------
+    def _on_proc_started(self, pid: int, label: str):
+        self._labels[pid] = label
+        self.log.appendPlainText(f"[{label} {pid}] started")
+
+    def _on_proc_output(self, pid: int, stream: str, line: str):
+        tag = self._labels.get(pid, str(pid))
+        self.log.appendPlainText(f"[{tag} {pid}]{' !' if stream == 'stderr' else ''} {line}")
+
+    def _on_proc_exited(self, pid: int, code: int):
+        label = self._labels.pop(pid, str(pid))
+        msg = f"{label} (pid {pid}) exited with code {code}"
+        self.log.appendPlainText(f"[{label} {pid}] exited ({code})")
+        self.status.showMessage(msg, 8000)
+
+    # Another start of the launcher handed us its command
+    def on_forwarded(self, cmd: str, name: str):
+        if self.isMinimized(): self.showNormal()
+        self.raise_(); self.activateWindow()
+        if cmd == "show": return
+        if name: self.combo.setCurrentText(name)
+        self._launch_in_thread(cmd, exp_name=name or None)
+
+    # Button 2: open blank (threaded)
+    def on_open_blank(self):
+        self._launch_in_thread("blank")
+
+    def _post_to_gui(self, fn):
+        QTimer.singleShot(0, fn)
+
+    # Ensure cursor/dialog are cleaned up if window is closed mid-launch
+    def closeEvent(self, event):
+        try:
+            if self._active_dlg is not None:
+                self._active_dlg.close()
+            QApplication.restoreOverrideCursor()
+            self._procs.detach()  # children keep running (output goes to their log files); we just stop listening
+            _POOL.shutdown()      # idle warm hosts are ours, though
+        except Exception:
+            pass
+        super().closeEvent(event)
+
+
+class _FirstPaint(QObject):
+    """--profile-startup: marks the window's first paint, reports once pre-warm is done too."""
+
+    def __init__(self, win: MainWindow):
+        super().__init__(win)
+        self.painted = self.warm = False
+        win.installEventFilter(self)
+        win.prewarmed.connect(lambda: self._done("warm"))
+
+    def eventFilter(self, obj, ev):
+        if ev.type() == ev.Type.Paint and not self.painted:
+            startup_mark("first paint"); obj.removeEventFilter(self); self._done("painted")
+        return False
+
+    def _done(self, what: str):
+        setattr(self, what, True)
+        if self.painted and self.warm: startup_report()
+
+
+def run(argv: list[str], profile: bool = False, single_instance: bool = True) -> int:
+    app = QApplication(argv)
+    startup_mark("QApplication")
+    win = MainWindow()
+    startup_mark("MainWindow built")
+    if profile: _FirstPaint(win)
+    win.show()
+    server = None
+    if single_instance:
+        bridge = InstanceBridge(win); bridge.command.connect(win.on_forwarded)
+        server = InstanceServer(lambda msg: handle_forwarded(msg, bridge.post))
+        if not server.start(): server = None   # another launcher owns the address; run standalone
+    try:
+        return app.exec()
+    finally:
+        if server: server.close()
@@ -0,0 +1,178 @@
+# launch_trace.py — span timings for click -> GRC window, appended as JSONL
+#
+# One record per launch: {"ts", "trace", "kind", "exp", "ok", "total_s",
+# "spans": [{"name", "start_s", "dur_s", ...attrs}]}. Later events for the same
+# launch (e.g. the GRC window appearing) are appended as extra records with
+# the same "trace" id. The file rotates at MAX_BYTES, keeping BACKUPS old files.
+#
+#   python launcher/launch_trace.py [trace.jsonl] [--json]   -> p50/p95 per stage
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+from app_paths import cfg_dir
+
+MAX_BYTES = 1_000_000
+BACKUPS = 3
+
+_path: Path | None = None
+_write_lock = threading.Lock()
+_tls = threading.local()   # .trace = the LaunchTrace active on this thread
+
+
+def default_path() -> Path:
+    return cfg_dir() / "launch_trace.jsonl"
+
+
+def configure(path: Path):
+    global _path
+    _path = Path(path)
+
+
+def append(record: dict):
+    p = _path or default_path()
+    with _write_lock:
+        try:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            if p.exists() and p.stat().st_size > MAX_BYTES:
+                for i in range(BACKUPS - 1, 0, -1):
+                    src = p.with_name(f"{p.name}.{i}")
+                    if src.exists(): os.replace(src, p.with_name(f"{p.name}.{i + 1}"))
+                os.replace(p, p.with_name(p.name + ".1"))
+            with open(p, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError:
+            pass
+
+
+class LaunchTrace:
+    """Spans of one launch. Create it at the click; activate() it on the worker thread."""
+
+    def __init__(self, kind: str, exp: str | None = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind, self.exp = kind, exp
+        self.t0 = time.perf_counter()
+        self.spans: list[dict] = []
+        self._deferred: float | None = None    # perf_counter when the launch was queued
+        self._done = False
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time a stage; the yielded dict can be filled with attributes (cache hits …)."""
+        t = time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.spans.append({"name": name, "start_s": round(t - self.t0, 6),
+                               "dur_s": round(time.perf_counter() - t, 6), **attrs})
+
+    def activate(self):
+        _tls.trace = self
+
+    @property
+    def deferred(self) -> bool:
+        return self._deferred is not None
+
+    def defer(self):
+        """The launch waits in a queue: finish() is held off until resume() on the thread that starts it."""
+        self._deferred = time.perf_counter()
+
+    def resume(self):
+        """Activate here; after a defer() the wait is recorded as a "queued" span."""
+        t, self._deferred = self._deferred, None
+        if t is not None:
+            self.spans.append({"name": "queued", "start_s": round(t - self.t0, 6), "dur_s": round(time.perf_counter() - t, 6)})
+        self.activate()
+
+    def finish(self, ok: bool, msg: str = ""):
+        if getattr(_tls, "trace", None) is self: _tls.trace = None
+        if self._done or self._deferred is not None: return   # written once; a queued launch when it starts
+        self._done = True
+        append({"ts": time.time(), "trace": self.id, "kind": self.kind, "exp": self.exp, "ok": ok,
+                "total_s": round(time.perf_counter() - self.t0, 6), "spans": self.spans,
+                **({"msg": msg[:300]} if not ok else {})})
+
+    def event(self, name: str, since: float, **attrs):
+        """Append a late stage (measured from `since`, a perf_counter value) as its own record."""
+        now = time.perf_counter()
+        append({"ts": time.time(), "trace": self.id, "kind": self.kind, "exp": self.exp,
+                "spans": [{"name": name, "start_s": round(since - self.t0, 6), "dur_s": round(now - since, 6), **attrs},
+                          {"name": "click_to_" + name, "start_s": 0.0, "dur_s": round(now - self.t0, 6)}]})
+
+
+def current() -> LaunchTrace | None:
+    return getattr(_tls, "trace", None)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Span on the thread's active trace; a no-op (still yields attrs) without one."""
+    tr = current()
+    if tr is None:
+        yield attrs
+        return
+    with tr.span(name, **attrs) as a:
+        yield a
+
+
+# --------------------- aggregation ---------------------
+def _pct(sorted_vals: list[float], q: float) -> float:
+    i = max(0, min(len(sorted_vals) - 1, int(round(q * (len(sorted_vals) - 1)))))
+    return sorted_vals[i]
+
+
+def summarize(paths: list[Path]) -> dict[str, dict]:
+    """{stage: {"n", "p50_s", "p95_s", "max_s", <attr>_hits: {value: count}}} over all records."""
+    durs: dict[str, list[float]] = {}
+    hits: dict[str, dict] = {}
+    for p in paths:
+        try:
+            lines = p.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            try: rec = json.loads(line)
+            except ValueError: continue
+            stages = [("total", rec["total_s"], {})] if "total_s" in rec else []
+            stages += [(s["name"], s["dur_s"], s) for s in rec.get("spans", [])]
+            for name, dur, s in stages:
+                durs.setdefault(name, []).append(dur)
+                for k in ("source", "cache"):
+                    if k in s:
+                        h = hits.setdefault(name, {}).setdefault(k, {})
+                        h[str(s[k])] = h.get(str(s[k]), 0) + 1
+    out = {}
+    for name, vals in durs.items():
+        vals.sort()
+        out[name] = {"n": len(vals), "p50_s": _pct(vals, 0.50), "p95_s": _pct(vals, 0.95), "max_s": vals[-1],
+                     **{f"{k}_counts": v for k, v in hits.get(name, {}).items()}}
+    return out
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="p50/p95 per launch stage from the launch trace")
+    ap.add_argument("trace", nargs="?", default=str(default_path()))
+    ap.add_argument("--json", action="store_true")
+    a = ap.parse_args(argv)
+    base = Path(a.trace)
+    files = [base.with_name(f"{base.name}.{i}") for i in range(BACKUPS, 0, -1)] + [base]
+    summary = summarize([f for f in files if f.exists()])
+    if a.json:
+        print(json.dumps(summary, indent=2)); return 0
+    if not summary:
+        print(f"No trace records in {base}"); return 1
+    print(f"{'stage':<28}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}  hits")
+    for name, st in sorted(summary.items(), key=lambda kv: -kv[1]["p50_s"]):
+        extra = " ".join(f"{k[:-7]}={v}" for k, v in st.items() if k.endswith("_counts"))
+        print(f"{name:<28}{st['n']:>6}{st['p50_s'] * 1e3:>10.1f}{st['p95_s'] * 1e3:>10.1f}{st['max_s'] * 1e3:>10.1f}  {extra}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+# proc_telemetry.py — CPU / memory / thread figures for every process tree we spawned
+#
+# ProcTelemetry follows a ProcSupervisor: every child it reports "started" is a
+# root, and the root plus all its descendants (GRC -> the flowgraph it runs)
+# are sampled every `interval` seconds into a fixed-size ring per root. The
+# readers are the cheapest each platform offers:
+#   Linux    one read of /proc/<pid>/stat per tree member; the tree itself is
+#            rebuilt from a /proc scan every few samples, when a pid goes, every
+#            sample for a tree's first EAGER_S seconds, and for idle trees (whose
+#            flowgraph may have just started) after 1, 2, 4 … samples of idling,
+#            backing off to the regular cadence
+#   Windows  a Toolhelp snapshot (parents, thread counts), then GetProcessTimes
+#            and K32GetProcessMemoryInfo per tree member
+#   other    psutil, when installed (otherwise telemetry is off)
+# Budgets: a tree above `cpu_pct` (100 = one full core) or `rss_mb` for
+# `grace_s` seconds running is reported once ("over_budget"); with action "kill"
+# its heaviest process on that measure (normally the flowgraph, not the GRC
+# editor) is terminated.
+#
+# Listeners get fn(event, root_pid, payload) with event in
+#   "sample"       {"t", "cpu_pct", "rss", "threads", "procs"}   (every tick, per root)
+#   "over_budget"  {"kind": "cpu"|"rss", "value", "limit", "label", "action", "victim"}
+#   "ended"        {"label", "samples", "peak_cpu_pct", "peak_rss"}   (root exited)
+# Children started with a label in `untracked` (idle warm-pool hosts) are left
+# out until track() adopts them.
+import ctypes
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import psutil  # optional: telemetry on platforms without /proc or Win32
+except ImportError:
+    psutil = None
+
+FIELDS = ("t", "cpu_pct", "rss", "threads", "procs")
+EAGER_S = 5.0      # rescan every tick this long after a tree starts
+IDLE_PCT = 1.0     # a tree below this is idle: rescan on a back-off in case a child started
+
+
+# --------------------- readers ---------------------
+class _LinuxProcs:
+    name = "/proc"
+    rescan_every = 5
+    _TICK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+    _PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+    @staticmethod
+    def _stat(pid: int) -> list | None:
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as f: data = f.read()
+        except OSError:
+            return None
+        return data[data.rindex(b")") + 2:].split()   # fields from "state" on (comm may hold spaces)
+
+    def parents(self) -> dict[int, int]:
+        out = {}
+        for name in os.listdir("/proc"):
+            if name.isdigit():
+                st = self._stat(int(name))
+                if st: out[int(name)] = int(st[1])
+        return out
+
+    def measure(self, pid: int) -> tuple[float, int, int] | None:
+        """(cpu seconds, rss bytes, threads), None once the process is gone."""
+        st = self._stat(pid)
+        if not st or st[0] == b"Z": return None
+        return (int(st[11]) + int(st[12])) / self._TICK, int(st[21]) * self._PAGE, int(st[17])
+
+    def kill(self, pid: int):
+        import signal
+        os.kill(pid, signal.SIGTERM)
+
+
+class _WindowsProcs:
+    name = "Win32"
+    rescan_every = 1          # one snapshot call is as cheap as the per-process reads
+    _QUERY, _TERMINATE = 0x1000, 0x0001   # PROCESS_QUERY_LIMITED_INFORMATION, PROCESS_TERMINATE
+
+    class _Entry(ctypes.Structure):
+        _fields_ = [("dwSize", ctypes.c_ulong), ("cntUsage", ctypes.c_ulong), ("th32ProcessID", ctypes.c_ulong),
+                    ("th32DefaultHeapID", ctypes.c_size_t), ("th32ModuleID", ctypes.c_ulong),
+                    ("cntThreads", ctypes.c_ulong), ("th32ParentProcessID", ctypes.c_ulong),
+                    ("pcPriClassBase", ctypes.c_long), ("dwFlags", ctypes.c_ulong), ("szExeFile", ctypes.c_wchar * 260)]
+
+    class _Mem(ctypes.Structure):
+        _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + \
+                   [(n, ctypes.c_size_t) for n in ("PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                                                   "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                                                   "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+    def __init__(self):
+        self.k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.k32.CreateToolhelp32Snapshot.restype = ctypes.c_void_p
+        self.k32.OpenProcess.restype = ctypes.c_void_p
+        self._threads: dict[int, int] = {}
+
+    def parents(self) -> dict[int, int]:
+        h = self.k32.CreateToolhelp32Snapshot(0x2, 0)   # TH32CS_SNAPPROCESS
+        if not h or h == ctypes.c_void_p(-1).value: return {}
+        out, threads = {}, {}
+        try:
+            e = self._Entry(); e.dwSize = ctypes.sizeof(e)
+            ok = self.k32.Process32FirstW(ctypes.c_void_p(h), ctypes.byref(e))
+            while ok:
+                out[e.th32ProcessID] = e.th32ParentProcessID; threads[e.th32ProcessID] = e.cntThreads
+                ok = self.k32.Process32NextW(ctypes.c_void_p(h), ctypes.byref(e))
+        finally:
+            self.k32.CloseHandle(ctypes.c_void_p(h))
+        self._threads = threads
+        return out
+
+    def measure(self, pid: int) -> tuple[float, int, int] | None:
+        h = self.k32.OpenProcess(self._QUERY, False, pid)
+        if not h: return None
+        try:
+            ft = [ctypes.c_ulonglong() for _ in range(4)]   # creation, exit, kernel, user (100 ns)
+            if not self.k32.GetProcessTimes(ctypes.c_void_p(h), *map(ctypes.byref, ft)): return None
+            code = ctypes.c_ulong()
+            if self.k32.GetExitCodeProcess(ctypes.c_void_p(h), ctypes.byref(code)) and code.value != 259:
+                return None                                  # exited (STILL_ACTIVE = 259)
+            m = self._Mem(); m.cb = ctypes.sizeof(m)
+            rss = m.WorkingSetSize if self.k32.K32GetProcessMemoryInfo(ctypes.c_void_p(h), ctypes.byref(m), m.cb) else 0
+            return (ft[2].value + ft[3].value) / 1e7, rss, self._threads.get(pid, 0)
+        finally:
+            self.k32.CloseHandle(ctypes.c_void_p(h))
+
+    def kill(self, pid: int):
+        h = self.k32.OpenProcess(self._TERMINATE, False, pid)
+        if h:
+            try: self.k32.TerminateProcess(ctypes.c_void_p(h), 1)
+            finally: self.k32.CloseHandle(ctypes.c_void_p(h))
+
+
+class _PsutilProcs:
+    name = "psutil"
+    rescan_every = 5
+
+    def parents(self) -> dict[int, int]:
+        return {p.info["pid"]: p.info["ppid"] or 0 for p in psutil.process_iter(["pid", "ppid"])}
+
+    def measure(self, pid: int) -> tuple[float, int, int] | None:
+        try:
+            p = psutil.Process(pid)
+            with p.oneshot():
+                if p.status() == psutil.STATUS_ZOMBIE: return None
+                t = p.cpu_times()
+                return t.user + t.system, p.memory_info().rss, p.num_threads()
+        except (psutil.Error, OSError):
+            return None
+
+    def kill(self, pid: int):
+        psutil.Process(pid).terminate()
+
+
+def reader():
+    """The process reader for this platform, or None when there is nothing cheap to use."""
+    if sys.platform.startswith("linux") and os.path.exists("/proc/self/stat"): return _LinuxProcs()
+    if psutil is not None: return _PsutilProcs()
+    if os.name == "nt":
+        try: return _WindowsProcs()
+        except (OSError, AttributeError): return None
+    return None
+
+
+# --------------------- sampler ---------------------
+class _Tree:
+    __slots__ = ("label", "born", "members", "cpu", "ring", "over", "flagged", "peak_cpu", "peak_rss",
+                 "idle", "idle_next", "idle_step")
+
+    def __init__(self, label: str, history: int):
+        self.label, self.members, self.born = label, set(), time.monotonic()
+        self.cpu: dict[int, float] = {}             # pid -> cpu seconds at the last sample
+        self.ring: deque = deque(maxlen=history)     # (t, cpu_pct, rss, threads, procs)
+        self.over: dict[str, float] = {}             # kind -> when it went over
+        self.flagged: set[str] = set()
+        self.peak_cpu = self.peak_rss = 0
+        self.idle = True                             # below IDLE_PCT at the last sample
+        self.idle_next, self.idle_step = 0, 1        # tick of the next idle rescan (inf: none), and the gap after it
+
+
+class ProcTelemetry:
+    """Samples the process tree of every supervised child (see the module header)."""
+
+    def __init__(self, sup, interval: float = 1.0, history: int = 600, cpu_pct: float = 0, rss_mb: float = 0,
+                 grace_s: float = 10.0, action: str = "warn", untracked=()):
+        self.interval, self.history, self.untracked = interval, history, frozenset(untracked)
+        self.cpu_pct, self.rss_mb, self.grace_s, self.action = cpu_pct, rss_mb, grace_s, action
+        self._sup = sup
+        self._reader = reader() if interval > 0 else None
+        self._lock = threading.Lock()
+        self._trees: dict[int, _Tree] = {}
+        self._listeners: list = []
+        self._thread: threading.Thread | None = None
+        self._tick = 0; self._rescan = True
+        if self._reader is not None: sup.subscribe(self._on_proc)
+
+    @property
+    def enabled(self) -> bool:
+        return self._reader is not None
+
+    @property
+    def backend(self) -> str:
+        return self._reader.name if self._reader else ""
+
+    def subscribe(self, fn): self._listeners.append(fn)
+    def unsubscribe(self, fn):
+        try: self._listeners.remove(fn)
+        except ValueError: pass
+
+    def _emit(self, event: str, pid: int, payload):
+        for fn in list(self._listeners):
+            try: fn(event, pid, payload)
+            except Exception: pass
+
+    def track(self, pid: int, label: str):
+        """Sample pid's tree from now on (a warm host handed a flowgraph, say)."""
+        if self._reader is None: return
+        with self._lock:
+            self._trees[pid] = t = _Tree(label, self.history); t.members.add(pid)
+            self._rescan = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="telemetry", daemon=True)
+                self._thread.start()
+
+    def _on_proc(self, event: str, pid: int, payload):
+        if event == "started":
+            if payload not in self.untracked: self.track(pid, payload)
+        elif event == "exited":
+            with self._lock:
+                t = self._trees.pop(pid, None)
+            if t is not None:
+                self._emit("ended", pid, {"label": t.label, "samples": len(t.ring),
+                                          "peak_cpu_pct": t.peak_cpu, "peak_rss": t.peak_rss})
+
+    # ---- sampling ----
+    def _loop(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._trees:
+                    self._thread = None; return
+            try: self.sample()
+            except Exception: pass
+
+    def sample(self) -> dict[int, tuple]:
+        """Take one sample of every tree now -> {root pid: latest sample tuple}."""
+        rd = self._reader
+        with self._lock:
+            trees = dict(self._trees)
+            now, tick = time.monotonic(), self._tick
+            rescan = (self._rescan or tick % rd.rescan_every == 0
+                      or any(now - t.born < EAGER_S or (t.idle and tick >= t.idle_next) for t in trees.values()))
+            self._rescan = False; self._tick += 1
+        if rescan:
+            kids: dict[int, list[int]] = {}
+            for pid, ppid in rd.parents().items(): kids.setdefault(ppid, []).append(pid)
+            for root, t in trees.items():
+                found, todo = {root}, [root]
+                while todo:
+                    for c in kids.get(todo.pop(), ()):
+                        if c not in found: found.add(c); todo.append(c)
+                t.members = found
+        now, latest = time.monotonic(), {}
+        for root, t in trees.items():
+            cpu_s = rss = threads = procs = 0; gone = []
+            heavy = {"cpu": (0.0, root), "rss": (0, root)}
+            last_t = t.ring[-1][0] if t.ring else None
+            for pid in list(t.members):
+                m = rd.measure(pid)
+                if m is None: gone.append(pid); continue
+                c, r, n = m
+                d = c - t.cpu.get(pid, c)   # a new member counts from when it was found, not its whole life
+                t.cpu[pid] = c
+                cpu_s += max(d, 0.0); rss += r; threads += n; procs += 1
+                heavy["cpu"] = max(heavy["cpu"], (d, pid)); heavy["rss"] = max(heavy["rss"], (r, pid))
+            for pid in gone:
+                t.members.discard(pid); t.cpu.pop(pid, None)
+            if gone:
+                with self._lock: self._rescan = True
+            pct = 100.0 * cpu_s / (now - last_t) if last_t is not None and now > last_t else 0.0
+            t.idle = pct < IDLE_PCT
+            if not t.idle or gone: t.idle_next, t.idle_step = tick + 1, 1
+            elif rescan:   # back off; past the regular cadence there is nothing extra to do
+                t.idle_next = tick + t.idle_step if t.idle_step < rd.rescan_every else float("inf")
+                t.idle_step *= 2
+            s = (now, pct, rss, threads, procs)
+            t.ring.append(s); latest[root] = s
+            t.peak_cpu = max(t.peak_cpu, pct); t.peak_rss = max(t.peak_rss, rss)
+            self._emit("sample", root, dict(zip(FIELDS, s)))
+            self._budget(root, t, now, {"cpu": (pct, self.cpu_pct), "rss": (rss / 2 ** 20, self.rss_mb)}, heavy)
+        return latest
+
+    def _budget(self, root: int, t: _Tree, now: float, figures: dict, heavy: dict):
+        for kind, (value, limit) in figures.items():
+            if not limit or value <= limit:
+                t.over.pop(kind, None); t.flagged.discard(kind); continue
+            since = t.over.setdefault(kind, now)
+            if kind in t.flagged or now - since < self.grace_s: continue
+            t.flagged.add(kind)
+            victim = heavy[kind][1] if self.action == "kill" else None
+            if victim is not None:
+                try:
+                    if victim == root: self._sup.terminate(root)
+                    else: self._reader.kill(victim)
+                except (OSError, ProcessLookupError):
+                    victim = None
+            self._emit("over_budget", root, {"kind": kind, "value": value, "limit": limit, "label": t.label,
+                                             "action": "killed" if victim is not None else "warn", "victim": victim})
+
+    # ---- readers for the UI ----
+    def latest(self) -> dict[int, dict]:
+        """{root pid: last sample as a dict} for every tree sampled at least once."""
+        with self._lock:
+            return {pid: dict(zip(FIELDS, t.ring[-1])) for pid, t in self._trees.items() if t.ring}
+
+    def history_of(self, pid: int) -> list[tuple]:
+        with self._lock:
+            t = self._trees.get(pid)
+            return list(t.ring) if t else []
+
+
+def fmt_bytes(n: float) -> str:
+    return f"{n / 2 ** 30:.1f} GB" if n >= 2 ** 30 else f"{n / 2 ** 20:.0f} MB"
+
+
+def fmt_sample(s: dict) -> str:
+    return f"CPU {s['cpu_pct']:.0f}%  RSS {fmt_bytes(s['rss'])}  {s['threads']} thr"
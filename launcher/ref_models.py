@@ -0,0 +1,274 @@
+# ref_models.py — NumPy reference models of the shipped experiments
+#
+# params_from_grc() reads the modulation parameters out of a flowgraph (carrier,
+# modulation index, deviation, samples per symbol, RRC excess bandwidth, …) and
+# generate() produces the same signal in a few vectorized NumPy expressions:
+#   am    (1 + m·msg(t)) · cos(2π fc t)                     float
+#   fm    exp(j · Σ k·msg[n])                              complex
+#   fsk   a · cos(Σ k/fs · (2·(bit−0.5)·scale))  (vco_f)    complex (real part only)
+#   psk / qam   bits → symbols (MSB first, differential) → RRC at sps
+# reference() adds a Welch spectrum and, for digital modes, the ideal
+# constellation. Results are cached in memory and as .npz under the config dir.
+# compare() scores captured GRC output against the model: EVM and SNR,
+# decision-directed for digital modes, least-squares fit after alignment for analog ones.
+#
+#   python launcher/ref_models.py experiments/qam_16.grc [--against capture.iq] [--max-evm 5] [--json]
+import argparse
+import ast
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from app_paths import cfg_dir
+from grc_flowgraph import FlowGraph, load_flowgraph
+
+PREVIEW_SAMPLES = 1 << 16
+RRC_SPAN = 11                 # symbols, as digital.generic_mod
+
+
+def cache_dir() -> Path:
+    return cfg_dir() / "refcache"
+
+
+# --------------------- parameters from the .grc ---------------------
+def _first(fg: FlowGraph, key: str):
+    return next((b for b in fg.active() if b.key == key), None)
+
+
+def _byte_vector(expr: str) -> list[int]:
+    m = re.fullmatch(r"\s*list\(\s*range\(\s*(\d+)\s*,\s*(\d+)\s*\)\s*\)\s*", expr or "")
+    if m: return list(range(int(m[1]), int(m[2])))
+    try: v = ast.literal_eval(expr)
+    except (ValueError, SyntaxError): return list(range(256))
+    return [int(x) & 0xFF for x in (v if isinstance(v, (list, tuple)) else [v])]
+
+
+def _sig(fg: FlowGraph, b) -> dict:
+    wave = b.params.get("waveform", "analog.GR_COS_WAVE")
+    return {"freq": fg.param(b, "freq") or 0.0, "ampl": fg.param(b, "ampl") or 1.0,
+            "offset": fg.param(b, "offset") or 0.0, "wave": "sin" if "SIN" in wave else "cos"}
+
+
+def params_from_grc(fg: FlowGraph) -> dict:
+    """{"kind", "samp_rate", …model parameters}; raises ValueError for an unknown structure."""
+    fs = fg.variables().get("samp_rate")
+    mod = _first(fg, "digital_constellation_modulator")
+    if mod:
+        const = mod.params.get("constellation", "")
+        kind = "qam16" if "16qam" in const else "bpsk" if "bpsk" in const else "8psk" if "8psk" in const else "qpsk"
+        unpack = _first(fg, "blocks_unpack_k_bits_bb"); vec = _first(fg, "blocks_vector_source_x")
+        return {"kind": kind, "samp_rate": fs, "sps": int(fg.param(mod, "samples_per_symbol") or 2),
+                "excess_bw": float(fg.param(mod, "excess_bw") or 0.35),
+                "differential": mod.params.get("differential", "True") != "False",
+                "unpack_k": int(fg.param(unpack, "k") or 8) if unpack else 8,
+                "vector": _byte_vector(vec.params.get("vector", "")) if vec else list(range(256))}
+    fmod = _first(fg, "analog_frequency_modulator_fc")
+    if fmod:
+        src = next(b for b in fg.active() if b.name in fg.upstream(fmod.name))
+        return {"kind": "fm", "samp_rate": fs, "sensitivity": fg.param(fmod, "sensitivity"), "msg": _sig(fg, src)}
+    vco = _first(fg, "analog_vco_f")
+    if vco:
+        unpack = _first(fg, "blocks_unpack_k_bits_bb"); vec = _first(fg, "blocks_vector_source_x")
+        add = _first(fg, "blocks_add_const_vxx"); mul = _first(fg, "blocks_multiply_const_vxx")
+        return {"kind": "fsk", "samp_rate": fg.param(vco, "samp_rate") or fs,
+                "sensitivity": fg.param(vco, "sensitivity"), "ampl": fg.param(vco, "ampl") or 1.0,
+                "unpack_k": int(fg.param(unpack, "k") or 1) if unpack else 1,
+                "vector": _byte_vector(vec.params.get("vector", "")) if vec else list(range(256)),
+                "bias": fg.param(add, "const") if add else 0.0, "scale": fg.param(mul, "k", "const") if mul else 1.0}
+    mult = _first(fg, "blocks_multiply_xx")
+    srcs = [b for b in fg.active() if b.key == "analog_sig_source_x"]
+    if mult and len(srcs) >= 2:
+        carrier = next(b for b in srcs if b.name in fg.upstream(mult.name))
+        msg = next(b for b in srcs if b is not carrier)
+        scale = next((b for b in fg.active() if b.key == "blocks_multiply_const_vxx"), None)
+        bias = next((b for b in fg.active() if b.key == "blocks_add_const_vxx"), None)
+        return {"kind": "am", "samp_rate": fs, "carrier": _sig(fg, carrier), "msg": _sig(fg, msg),
+                "m": fg.param(scale, "const", "k") if scale else 1.0, "bias": fg.param(bias, "const") if bias else 1.0}
+    raise ValueError(f"{fg.path.name}: no reference model for this flowgraph")
+
+
+# --------------------- models ---------------------
+def _tone(s: dict, n: int, fs: float) -> np.ndarray:
+    ph = 2 * np.pi * s["freq"] / fs * np.arange(n)
+    return s["ampl"] * (np.sin(ph) if s["wave"] == "sin" else np.cos(ph)) + s["offset"]
+
+
+def _bits(vector: list[int], k: int, count: int) -> np.ndarray:
+    """unpack_k_bits_bb over a repeating byte vector: low k bits of each byte, MSB first."""
+    v = np.asarray(vector, np.uint8)
+    bits = ((v[:, None] >> np.arange(k - 1, -1, -1, dtype=np.uint8)) & 1).reshape(-1)
+    return np.resize(bits, count)
+
+
+def constellation(kind: str) -> np.ndarray:
+    """Unit-power points indexed by symbol value (Gray coded)."""
+    if kind == "qam16":
+        g = np.array([-3, -1, 3, 1])                       # 2-bit Gray per axis
+        s = np.arange(16)
+        return ((g[s >> 2] + 1j * g[s & 3]) / np.sqrt(10)).astype(np.complex64)
+    m = {"bpsk": 2, "qpsk": 4, "8psk": 8}[kind]
+    gray = np.arange(m) ^ (np.arange(m) >> 1)
+    pts = np.exp(1j * (2 * np.pi * np.argsort(gray) / m + (np.pi / 4 if m == 4 else 0)))
+    return pts.astype(np.complex64)
+
+
+def rrc_taps(sps: int, alpha: float, span: int = RRC_SPAN) -> np.ndarray:
+    """Root-raised-cosine at sps samples/symbol, scaled to sum to sps (unit gain per polyphase arm)."""
+    t = (np.arange(span * sps + 1) - span * sps / 2) / sps
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = (np.sin(np.pi * t * (1 - alpha)) + 4 * alpha * t * np.cos(np.pi * t * (1 + alpha))) \
+            / (np.pi * t * (1 - (4 * alpha * t) ** 2))
+    h[np.isclose(t, 0)] = 1 - alpha + 4 * alpha / np.pi
+    if alpha:
+        edge = np.isclose(np.abs(t), 1 / (4 * alpha))
+        h[edge] = alpha / np.sqrt(2) * ((1 + 2 / np.pi) * np.sin(np.pi / (4 * alpha)) + (1 - 2 / np.pi) * np.cos(np.pi / (4 * alpha)))
+    return (h * sps / h.sum()).astype(np.float32)
+
+
+def symbols(p: dict, count: int) -> np.ndarray:
+    """Symbol values for the digital modes (before mapping to points)."""
+    pts = constellation(p["kind"]); bps = int(np.log2(len(pts)))
+    # The modulator unpacks every input byte MSB first; here those bytes are unpack_k_bits output (0/1)
+    packed = _bits(p["vector"], p["unpack_k"], count)
+    bits = ((packed[:, None] >> np.arange(7, -1, -1, dtype=np.uint8)) & 1).reshape(-1)
+    sym = bits[: count * bps].reshape(count, bps) @ (1 << np.arange(bps - 1, -1, -1))
+    return np.cumsum(sym) % len(pts) if p["differential"] else sym
+
+
+def generate(p: dict, n: int = PREVIEW_SAMPLES) -> np.ndarray:
+    fs, kind = p["samp_rate"], p["kind"]
+    if kind == "am":
+        msg = _tone(p["msg"], n, fs)
+        return ((p["bias"] + p["m"] * msg) * _tone(p["carrier"], n, fs)).astype(np.float32)
+    if kind == "fm":
+        return np.exp(1j * np.cumsum(p["sensitivity"] * _tone(p["msg"], n, fs))).astype(np.complex64)
+    if kind == "fsk":
+        f = (_bits(p["vector"], p["unpack_k"], n) + p["bias"]) * p["scale"]
+        return (p["ampl"] * np.cos(np.cumsum(f * p["sensitivity"] / fs))).astype(np.complex64)
+    sps = p["sps"]
+    nsym = n // sps + RRC_SPAN + 1
+    up = np.zeros(nsym * sps, np.complex64); up[::sps] = constellation(kind)[symbols(p, nsym)]
+    return np.convolve(up, rrc_taps(sps, p["excess_bw"]))[:n].astype(np.complex64)
+
+
+def welch(x: np.ndarray, fs: float, nfft: int = 1024) -> tuple[np.ndarray, np.ndarray]:
+    """(freqs, PSD dB), 50 % overlapped Hann segments; two-sided for complex input."""
+    nfft = min(nfft, len(x))
+    segs = np.lib.stride_tricks.sliding_window_view(x, nfft)[:: nfft // 2]
+    w = np.hanning(nfft).astype(np.float32)
+    if np.iscomplexobj(x):
+        spec = np.fft.fftshift(np.fft.fft(segs * w, axis=1), axes=1); f = np.fft.fftshift(np.fft.fftfreq(nfft, 1 / fs))
+    else:
+        spec = np.fft.rfft(segs * w, axis=1); f = np.fft.rfftfreq(nfft, 1 / fs)
+    psd = (np.abs(spec) ** 2).mean(axis=0) / (fs * float((w ** 2).sum()))
+    return f, 10 * np.log10(psd + 1e-20)
+
+
+# --------------------- cached reference ---------------------
+_MEMO: dict[str, dict] = {}
+
+
+def _key(p: dict, n: int) -> str:
+    return hashlib.sha256(json.dumps([p, n], sort_keys=True).encode()).hexdigest()[:24]
+
+
+def reference(grc, n: int = PREVIEW_SAMPLES, use_disk: bool = True) -> dict:
+    """{"params", "x", "freqs", "psd_db", "points" (ideal constellation or None)} for a .grc."""
+    p = params_from_grc(load_flowgraph(grc))
+    key = _key(p, n)
+    if key in _MEMO: return _MEMO[key]
+    f = cache_dir() / f"{key}.npz"
+    ref = None
+    if use_disk:
+        try:
+            with np.load(f) as z: ref = {k: z[k] for k in z.files}
+        except (OSError, ValueError):
+            pass
+    if ref is None:
+        x = generate(p, n)
+        fr, db = welch(x, p["samp_rate"])
+        ref = {"x": x, "freqs": fr, "psd_db": db,
+               "points": constellation(p["kind"]) if p["kind"] in ("bpsk", "qpsk", "8psk", "qam16") else np.zeros(0, np.complex64)}
+        if use_disk:
+            try:
+                f.parent.mkdir(parents=True, exist_ok=True)
+                tmp = f.with_name(f"{key}.{os.getpid()}.tmp.npz")
+                np.savez(tmp, **ref); os.replace(tmp, f)
+            except OSError:
+                pass
+    ref["params"] = p
+    _MEMO[key] = ref
+    return ref
+
+
+# --------------------- comparison ---------------------
+def _align(ref: np.ndarray, y: np.ndarray, search: int) -> int:
+    """Lag of y inside ref (0..search) by FFT cross-correlation."""
+    m = len(y); L = 1 << int(np.ceil(np.log2(m + search)))
+    c = np.fft.ifft(np.fft.fft(ref[: m + search], L) * np.conj(np.fft.fft(y, L)))
+    return int(np.argmax(np.abs(c[: search + 1])))
+
+
+def compare(p: dict, y: np.ndarray, search: int = 4096) -> dict:
+    """Score captured samples y against the model -> {"evm_pct", "snr_db", …}."""
+    y = np.asarray(y)
+    if len(y) < 64: raise ValueError("capture too short to compare")
+    if p["kind"] in ("am", "fm", "fsk"):
+        y = y[: 1 << 18]
+        ref = generate(p, len(y) + search)
+        if not np.iscomplexobj(ref): y = y.real
+        lag = _align(ref, y, search); r = ref[lag: lag + len(y)]
+        g = np.vdot(r, y) / np.vdot(r, r)                          # least-squares gain (and phase)
+        err = y - g * r
+        ratio = float(np.vdot(err, err).real / max(np.vdot(g * r, g * r).real, 1e-30))
+        return {"kind": p["kind"], "lag": lag, "gain": float(abs(g)), "evm_pct": float(100 * np.sqrt(ratio)),
+                "snr_db": float(-10 * np.log10(max(ratio, 1e-30)))}
+    # Digital: matched filter, best symbol phase, then decision-directed EVM
+    sps = p["sps"]; pts = constellation(p["kind"])
+    mf = np.convolve(y[: 1 << 18], rrc_taps(sps, p["excess_bw"])[::-1].conj() / sps)[RRC_SPAN * sps:]
+    phases = mf[: len(mf) // sps * sps].reshape(-1, sps)
+    k = int(np.argmax((np.abs(phases) ** 2).mean(axis=0)))        # eye opening: most energy at the symbol instant
+    s = phases[:, k]
+    g = 1 / (np.sqrt(np.mean(np.abs(s) ** 2)) or 1)
+    for _ in range(3):                                            # refine gain/phase on decisions
+        d = pts[np.argmin(np.abs((g * s)[:, None] - pts[None, :]), axis=1)]
+        g = np.vdot(s, d) / np.vdot(s, s)
+    z = g * s
+    d = pts[np.argmin(np.abs(z[:, None] - pts[None, :]), axis=1)]
+    evm = float(np.sqrt(np.mean(np.abs(z - d) ** 2) / np.mean(np.abs(d) ** 2)))
+    return {"kind": p["kind"], "symbols": len(s), "timing_phase": k, "evm_pct": 100 * evm,
+            "snr_db": float(-20 * np.log10(max(evm, 1e-15)))}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="NumPy reference of an experiment; optionally score a capture against it")
+    ap.add_argument("grc")
+    ap.add_argument("--against", metavar="IQ", help="raw capture (iq_capture format) to compare")
+    ap.add_argument("--max-evm", type=float, default=None, help="exit 1 if EVM %% is above this")
+    ap.add_argument("--json", action="store_true")
+    a = ap.parse_args(argv)
+    try:
+        ref = reference(a.grc)
+        out = {"params": {k: v for k, v in ref["params"].items() if k != "vector"}}
+        if a.against:
+            from iq_capture import Capture
+            out["compare"] = compare(ref["params"], np.asarray(Capture(a.against).data))
+    except (ValueError, OSError, RuntimeError) as e:
+        print(f"ref_models: {e}", file=sys.stderr); return 2
+    if a.json:
+        print(json.dumps(out, indent=2, default=float))
+    else:
+        for k, v in out["params"].items(): print(f"{k:<14}{v}")
+        if "compare" in out:
+            c = out["compare"]; print(f"EVM {c['evm_pct']:.2f} %   SNR {c['snr_db']:.1f} dB")
+    bad = a.max_evm is not None and "compare" in out and out["compare"]["evm_pct"] > a.max_evm
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,60 +1,81 @@
-import os, sys, json, subprocess, time
+import time; _T0 = time.perf_counter()     # --profile-startup counts from here
+import os, sys, json, subprocess, threading, hashlib, shutil, re, struct, itertools, argparse, ctypes, importlib.util
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, List
-from PySide6.QtCore import Qt, QTimer, QThread, QObject, Signal
-from PySide6.QtGui import QIcon, QPixmap
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QLabel, QComboBox, QPushButton,
-    QVBoxLayout, QHBoxLayout, QFrame, QMessageBox, QSpacerItem, QSizePolicy,
-    QStatusBar, QProgressDialog
-)
+from app_paths import cfg_dir
+# The Qt window lives in lab_window.py and is imported by main(); nothing here needs Qt.
+# The flowgraph tools (grc_*: PyYAML), packs, telemetry and tracing are imported by
+# the functions that use them, after first paint; see --profile-startup.
 
 APP_TITLE = "MMT Virtual Lab – GNU Radio"
 APP_BRAND  = "MMT Virtual Lab"
-PRIMARY = "#0A66C2"; SURFACE = "#FFFFFF"; TEXT = "#111111"; MUTED = "#6B7280"; ACCENT_BG = "#F3F6FB"
 
 # ----- Tweak these -----
 CLOSE_AFTER_SUCCESS_MS = 2000  # keep the "Opening..." dialog for this long after success
-PREFERRED_LNK = r"C:\Users\Jaswanth Royal\AppData\Roaming\Microsoft\Windows\Start Menu\Programs\GNU Radio 3.9.4\GNU Radio.lnk"
-
-EXPERIMENTS = {
-    "Experiment 1 (AM)":      "am_signal.grc",
-    "Experiment 2 (FM)":      "fm_signal.grc",
-    "Experiment 3 (2-FSK)":   "fsk_signal.grc",
-    "Experiment 4 (QPSK)":    "psk_qpsk.grc",
-    "Experiment 5 (16-QAM)":  "qam_16.grc",
-    "Experiment 6 (FR)":      "fm_recever.grc"
+PRECHECK = "warn"              # static flowgraph check before launch: "warn", "block" (refuse on errors) or "off"
+MAX_SESSIONS = 0               # concurrent "Run directly" flowgraphs (0 = no limit; editor windows never count; env MMT_MAX_SESSIONS / config "max_sessions")
+WARM_POOL_SIZE = 0             # pre-imported GRC hosts kept ready (0 = off; env MMT_WARM_POOL / config "warm_pool")
+PREFERRED_LNK = os.getenv("MMT_GRC_LNK", "")  # optional GRC shortcut (.lnk) that wins over discovery
+SINGLE_INSTANCE = True         # later starts hand their command to the running window (env MMT_SINGLE_INSTANCE / config "single_instance")
+REPLAY = "auto"                # SDR experiments: "auto" (play a recording when no dongle is plugged in), "always" or "off"
+TELEMETRY_INTERVAL = 1.0       # seconds between samples of each session's process tree (0 = off; config "telemetry_interval")
+BUDGET_CPU_PCT = 0             # CPU budget per session, 100 = one core (0 = fair share, all cores / max_sessions, or none without a limit; -1 = none; config "budget_cpu_pct")
+BUDGET_RSS_MB = 0              # memory budget per session in MB (0 = none; config "budget_rss_mb")
+BUDGET_ACTION = "warn"         # over budget for "budget_grace_s" (10 s): "warn", or "kill" (ends the tree's heaviest process; config "budget_action")
+CONVERT = "auto"               # legacy XML .grc: "auto" (open a cached YAML conversion) or "off" (env MMT_CONVERT / config "convert")
+PACK_CACHE_MB = 2048           # files extracted from experiment packs are kept up to this size (config "pack_cache_mb")
+CAPTURE_SECONDS = 60.0         # "Open with capture" records at most this long per stream (0 = no limit)
+CAPTURE_MB = 1024              # ... and at most this many MB per stream file (0 = no limit)
+
+# Curated names/order for the shipped flowgraphs; any other *.grc in the
+# experiments folder is discovered by the catalog and listed by its title.
+EXPERIMENT_LABELS = {
+    "am_signal.grc":  "Experiment 1 (AM)",
+    "fm_signal.grc":  "Experiment 2 (FM)",
+    "fsk_signal.grc": "Experiment 3 (2-FSK)",
+    "psk_qpsk.grc":   "Experiment 4 (QPSK)",
+    "qam_16.grc":     "Experiment 5 (16-QAM)",
+    "fm_recever.grc": "Experiment 6 (FR)"
 }
+# display name -> file name; filled from the catalog (see refresh_experiments). It is
+# replaced from the rescan thread: read it through experiments(), which copies under the lock.
+EXPERIMENTS = {label: fn for fn, label in EXPERIMENT_LABELS.items()}
+_EXP_LOCK = threading.Lock()
+
+def experiments() -> dict[str, str]:
+    """Consistent snapshot of EXPERIMENTS."""
+    with _EXP_LOCK: return dict(EXPERIMENTS)
 
-QSS = f"""
-* {{ font-family: 'Segoe UI', Arial; color: {TEXT}; }}
-QMainWindow {{ background: {SURFACE}; }}
-QFrame#Header {{ background: {PRIMARY}; border: none; }}
-QLabel#Logo {{ margin: 6px 0; }}
-QLabel#Brand {{ color: white; font-size: 18px; font-weight: 700; }}
-QLabel#Subtitle {{ color: white; font-size: 12px; }}
-QFrame.Card {{ background: {ACCENT_BG}; border-radius: 12px; }}
-QLabel.SectionTitle {{ font-size: 12px; color: {MUTED}; letter-spacing: 1px; }}
-QComboBox {{ padding: 8px 12px; border: 1px solid #DFE3EA; border-radius: 10px; }}
-QComboBox:hover {{ border-color: {PRIMARY}; }}
-QPushButton.Primary {{ background: {PRIMARY}; color: white; padding: 10px 14px; border-radius: 10px; font-weight: 600; }}
-QPushButton.Primary:hover {{ background: #0853a0; }}
-"""
 
 # --------------------- basics & caches ---------------------
 def app_base_dir() -> Path: return Path(os.path.abspath(sys.argv[0])).parent
 def _ext(p: str) -> str:    return Path(p).suffix.lower()
-def _cfg_dir() -> Path:
-    base = Path(os.getenv("APPDATA") or app_base_dir())
-    d = base / "MMT" / "VirtualLab"; d.mkdir(parents=True, exist_ok=True); return d
+def _cfg_dir() -> Path:          return cfg_dir()
 def _cfg_path() -> Path:         return _cfg_dir() / "config.json"
 def _exp_cache_path() -> Path:   return _cfg_dir() / "experiments_dir.json"
+def _compiled_dir() -> Path:     return _cfg_dir() / "compiled"
+def _catalog_path() -> Path:     return _cfg_dir() / "catalog.json"
+def span(name: str):
+    """launch_trace.span(), importing launch_trace on the first traced step."""
+    import launch_trace
+    return launch_trace.span(name)
+def _captures_dir() -> Path:     return Path(_cfg_get("captures_dir") or _cfg_dir() / "captures")
+def _replay_dir() -> Path:       return _cfg_dir() / "replay"
+def _converted_dir() -> Path:    return _cfg_dir() / "converted"
+def _packs_dir() -> Path:        return Path(os.getenv("MMT_PACKS_DIR") or _cfg_get("packs_dir") or _cfg_dir() / "packs")
 def _load_json(p: Path) -> dict:
     try: return json.loads(p.read_text(encoding="utf-8"))
     except Exception: return {}
 def _save_json(p: Path, data: dict):
     try: p.write_text(json.dumps(data, indent=2), encoding="utf-8")
     except Exception: pass
+def _cfg_get(key: str, default=None):
+    return _load_json(_cfg_path()).get(key, default)
+def _cfg_set(key: str, value):
+    data = _load_json(_cfg_path()); data[key] = value; _save_json(_cfg_path(), data)
 
 # Find logo file (assets/mmt_logo.png preferred)
 def _logo_path() -> Optional[Path]:
@@ -70,7 +91,8 @@ def _logo_path() -> Optional[Path]:
 # in-memory hot cache (fast)
 _MEM = {
     "grc_path": None,       # str or None
-    "exp_dir":  None        # Path or None
+    "exp_dir":  None,       # Path or None
+    "gr_version": None      # (grc_launcher, version) or None
 }
 
 def _is_grc_launcher(path: str) -> bool:
@@ -81,16 +103,30 @@ def _is_grc_launcher(path: str) -> bool:
         b=p.stem.lower(); return ("gnu" in b and "radio" in b)
     if p.suffix.lower() in (".exe",".cmd",".bat"):
         return p.stem.lower().startswith("gnuradio-companion")
+    if os.name != "nt" and p.suffix == "":
+        return name.startswith("gnuradio-companion") and os.access(path, os.X_OK)
     return False
 
+# A cached launcher is trusted while one stat() still matches its fingerprint.
+def _fingerprint(path: str) -> dict | None:
+    try: st = os.stat(path)
+    except OSError: return None
+    return {"path": path, "mtime": st.st_mtime, "size": st.st_size, "version": _grc_version_hint(path)}
+
+def _fp_valid(fp: dict) -> bool:
+    try: st = os.stat(fp["path"])
+    except (OSError, KeyError, TypeError): return False
+    return st.st_mtime == fp.get("mtime") and st.st_size == fp.get("size")
+
 def _cache_get_grc_disk() -> str | None:
-    p=_cfg_path()
-    if p.exists():
-        val=_load_json(p).get("grc_path")
-        if _is_grc_launcher(val): return val
+    fp = _cfg_get("grc_fp")
+    if fp and _fp_valid(fp): return fp["path"]
     return None
 def _cache_set_grc_disk(path: str):
-    if _is_grc_launcher(path): _save_json(_cfg_path(), {"grc_path": path})
+    if not _is_grc_launcher(path): return
+    fp = _fingerprint(path)
+    if fp:
+        data = _load_json(_cfg_path()); data.update({"grc_path": path, "grc_fp": fp}); _save_json(_cfg_path(), data)
 def _cache_get_expdir_disk() -> Path | None:
     p=_exp_cache_path()
     if p.exists():
@@ -100,35 +136,292 @@ def _cache_get_expdir_disk() -> Path | None:
 def _cache_set_expdir_disk(d: Path):
     if d and d.is_dir(): _save_json(_exp_cache_path(), {"dir": str(d)})
 
-def _which(cmd: list[str]) -> str | None:
+# --------------- Windows shortcuts (.lnk), parsed in-process ---------------
+def _resolve_shortcut(lnk: str) -> tuple[str | None, str, str]:
+    """(target path, arguments, working dir) of a Shell Link file; (None, "", "") if unreadable."""
+    try: data = Path(lnk).read_bytes()
+    except OSError: return None, "", ""
+    if len(data) < 0x4C or struct.unpack_from("<I", data, 0)[0] != 0x4C: return None, "", ""
+    flags = struct.unpack_from("<I", data, 0x14)[0]
+    pos, target = 0x4C, None
     try:
-        r = subprocess.run(cmd, capture_output=True, text=True, shell=False)
-        if r.returncode==0:
-            out=(r.stdout or "").strip()
-            return out.splitlines()[0] if out else None
-    except Exception:
-        pass
-    return None
+        if flags & 0x01:                       # HasLinkTargetIDList
+            pos += 2 + struct.unpack_from("<H", data, pos)[0]
+        if flags & 0x02:                       # HasLinkInfo
+            size, hdr, li_flags, _, base_off, _, suffix_off = struct.unpack_from("<7I", data, pos)
+            if li_flags & 0x01:                # VolumeIDAndLocalBasePath
+                cstr = lambda o: data[pos + o:data.index(b"\0", pos + o)].decode("mbcs" if os.name == "nt" else "latin-1")
+                target = cstr(base_off) + cstr(suffix_off)
+            pos += size
+        unicode_ = bool(flags & 0x80)
+        strings = {}
+        for bit, key in ((0x04, "name"), (0x08, "rel"), (0x10, "wd"), (0x20, "args"), (0x40, "icon")):
+            if not flags & bit: continue
+            n = struct.unpack_from("<H", data, pos)[0]; pos += 2
+            nbytes = n * 2 if unicode_ else n
+            raw = data[pos:pos + nbytes]; pos += nbytes
+            strings[key] = raw.decode("utf-16-le" if unicode_ else "latin-1", "replace")
+    except (struct.error, ValueError, LookupError):
+        return target, "", ""
+    if not target and strings.get("rel"):
+        target = str((Path(lnk).parent / strings["rel"]).resolve())
+    return target, strings.get("args", ""), strings.get("wd", "")
+
+# --------------- GNU Radio discovery (parallel, no subprocesses) ---------------
+_GRC_NAMES = (["gnuradio-companion.exe", "gnuradio-companion.cmd", "gnuradio-companion.bat"] if os.name == "nt"
+              else ["gnuradio-companion"])
+
+def _grc_version_hint(path: str) -> str:
+    """GNU Radio version without running it: pkg-config file under the prefix, else the path itself."""
+    bin_dir = Path(path).parent
+    for pc in (bin_dir.parent / "lib" / "pkgconfig" / "gnuradio-runtime.pc",
+               bin_dir.parent / "lib64" / "pkgconfig" / "gnuradio-runtime.pc",
+               bin_dir.parent / "Library" / "lib" / "pkgconfig" / "gnuradio-runtime.pc",
+               bin_dir.parent / "lib" / "x86_64-linux-gnu" / "pkgconfig" / "gnuradio-runtime.pc"):
+        try:
+            for line in pc.read_text(encoding="utf-8", errors="replace").splitlines():
+                if line.startswith("Version:"): return line.split(":", 1)[1].strip()
+        except OSError:
+            continue
+    m = re.search(r"(?i)(?:gnu\s*radio|gnuradio)[^\\/]*?(\d+\.\d+(?:\.\d+){0,2})", path)
+    return m.group(1) if m else ""
+
+def _candidate_dirs() -> list[Path]:
+    """Everywhere GRC usually lives, in preference order (PATH first)."""
+    dirs = [Path(p) for p in os.getenv("PATH", "").split(os.pathsep) if p]
+    home = Path.home()
+    conda_roots = [Path(p) for p in (os.getenv("CONDA_PREFIX"), os.getenv("CONDA_ROOT")) if p]
+    conda_roots += [home / n for n in ("radioconda", "miniforge3", "mambaforge", "miniconda3", "anaconda3")]
+    if os.name == "nt":
+        for env in ("LOCALAPPDATA", "ProgramData"):
+            if os.getenv(env): conda_roots += [Path(os.getenv(env)) / "radioconda"]
+    envs = []
+    for root in conda_roots:
+        envs.append(root)
+        try: envs += [e for e in (root / "envs").iterdir() if e.is_dir()]
+        except OSError: pass
+    try: envs += [e for e in (home / ".conda" / "envs").iterdir() if e.is_dir()]
+    except OSError: pass
+    for e in envs:
+        dirs += [e / "Library" / "bin", e / "Scripts"] if os.name == "nt" else [e / "bin"]
+    if os.name == "nt":
+        for pf in {os.getenv("ProgramFiles") or r"C:\Program Files", os.getenv("ProgramW6432") or r"C:\Program Files"}:
+            try: dirs += [d / "bin" for d in Path(pf).iterdir() if d.name.lower().startswith("gnuradio")]
+            except OSError: pass
+    else:
+        dirs += [Path(p) for p in ("/usr/local/bin", "/usr/bin", "/opt/homebrew/bin", "/opt/local/bin")]
+        try: dirs += [d / "bin" for d in Path("/opt").iterdir() if d.name.lower().startswith("gnuradio")]
+        except OSError: pass
+    seen, out = set(), []
+    for d in dirs:
+        k = os.path.normcase(str(d))
+        if k not in seen: seen.add(k); out.append(d)
+    return out
+
+def _start_menu_links() -> list[Path]:
+    if os.name != "nt": return []
+    roots = [Path(os.getenv(v)) / "Microsoft" / "Windows" / "Start Menu" / "Programs"
+             for v in ("APPDATA", "ProgramData") if os.getenv(v)]
+    links = []
+    for r in roots:
+        try: links += [p for p in r.glob("GNU Radio*/*.lnk") if _is_grc_launcher(str(p))]
+        except OSError: pass
+    return links
+
+def _probe_dir(d: Path) -> list[str]:
+    return [str(d / n) for n in _GRC_NAMES if _is_grc_launcher(str(d / n))]
+
+def discover_gnuradio() -> list[dict]:
+    """Every GRC launcher we can find, probed concurrently, best first (newest version, then PATH order)."""
+    dirs = _candidate_dirs()
+    with ThreadPoolExecutor(max_workers=min(16, max(1, len(dirs)))) as ex:
+        found = [p for hits in ex.map(_probe_dir, dirs) for p in hits]
+    for lnk in _start_menu_links():
+        tgt, _, _ = _resolve_shortcut(str(lnk))
+        found.append(tgt if _is_grc_launcher(tgt) else str(lnk))
+    seen, cands = set(), []
+    for order, p in enumerate(found):
+        k = os.path.normcase(os.path.realpath(p))
+        if k in seen: continue
+        seen.add(k)
+        fp = _fingerprint(p)
+        if fp: cands.append({**fp, "order": order})
+    ver = lambda c: [int(x) for x in re.findall(r"\d+", c["version"])[:4]]
+    # known versions first (newest first, 3.10 == 3.10.0), then PATH/discovery order
+    cands.sort(key=lambda c: (not ver(c), tuple(-v for v in (ver(c) + [0, 0, 0, 0])[:4]), c["order"]))
+    return cands
 
 # --------------- find GRC (exe or .lnk) ---------------
 def find_gnuradio_companion() -> str | None:
+    with span("find_gnuradio_companion") as sp:
+        path, sp["source"] = _find_grc()
+        return path
+
+def _find_grc() -> tuple[str | None, str]:
+    """(path, which tier answered): mem, env, preferred, disk (fingerprint still valid), scan or miss."""
     if _MEM["grc_path"] and _is_grc_launcher(_MEM["grc_path"]):
-        return _MEM["grc_path"]
-    try:
-        if PREFERRED_LNK and _is_grc_launcher(PREFERRED_LNK):
-            tgt,_,_= _resolve_shortcut(PREFERRED_LNK)
-            _MEM["grc_path"]=tgt or PREFERRED_LNK; _cache_set_grc_disk(_MEM["grc_path"]); return _MEM["grc_path"]
-    except Exception: pass
+        return _MEM["grc_path"], "mem"
     override=os.getenv("MMT_GRC_PATH")
     if _is_grc_launcher(override):
-        _MEM["grc_path"]=override; _cache_set_grc_disk(override); return override
+        _MEM["grc_path"]=override; _cache_set_grc_disk(override); return override, "env"
+    if PREFERRED_LNK and _is_grc_launcher(PREFERRED_LNK):
+        tgt,_,_= _resolve_shortcut(PREFERRED_LNK)
+        path = tgt if _is_grc_launcher(tgt) else PREFERRED_LNK
+        _MEM["grc_path"]=path; _cache_set_grc_disk(path); return path, "preferred"
     cached=_cache_get_grc_disk()
     if cached:
-        _MEM["grc_path"]=cached; return cached
-    path = _which(["where","gnuradio-companion.cmd"]) or _which(["where","gnuradio-companion"]) or _which(["where","gnuradio-companion.exe"])
-    if _is_grc_launcher(path):
-        _MEM["grc_path"]=path; _cache_set_grc_disk(path); return path
-    return None
+        _MEM["grc_path"]=cached; return cached, "disk"
+    with span("discover") as sp:
+        cands = discover_gnuradio(); sp["candidates"] = len(cands)
+    if cands:
+        path = cands[0]["path"]
+        _MEM["grc_path"]=path; _cache_set_grc_disk(path); return path, "scan"
+    return None, "miss"
+
+# --------------- supervised child processes ---------------
+class ProcSupervisor:
+    """
+    Owns every child we spawn. Children get their own session / process group
+    and write stdout/stderr to log files under `log_dir` (never to a pipe), so
+    they keep running, and keep printing, after the launcher exits. The logs
+    are tailed line-by-line on daemon threads and exit codes are reported once
+    they are drained, so nothing ever waits on a child from the caller's thread.
+    Listeners get fn(event, pid, payload) with event in
+    "started" (label), "output" ((stream, line)) or "exited" (returncode).
+    With `detach` set (the CLI), or without a log_dir, output goes to DEVNULL
+    and there is no "output" event.
+    """
+    TAIL_INTERVAL = 0.05   # seconds between polls of a quiet log
+    LOG_KEEP = 60          # newest child logs kept in log_dir
+
+    def __init__(self, log_dir: Path | None = None):
+        self._lock = threading.Lock()
+        self._procs: dict[int, dict] = {}   # pid -> {"proc", "label", "t0", "logs"}
+        self._listeners: list = []
+        self._seq = itertools.count(1)
+        self.log_dir = log_dir
+        self.detach = False
+
+    def subscribe(self, fn):   self._listeners.append(fn)
+    def unsubscribe(self, fn):
+        try: self._listeners.remove(fn)
+        except ValueError: pass
+
+    def _emit(self, event: str, pid: int, payload):
+        for fn in list(self._listeners):
+            try: fn(event, pid, payload)
+            except Exception: pass
+
+    def spawn(self, argv: list[str], cwd: str | None = None, label: str | None = None,
+              creationflags: int = 0, stdin_pipe: bool = False) -> subprocess.Popen:
+        env = dict(os.environ); env.setdefault("PYTHONUNBUFFERED", "1")  # line-level output from python children
+        label = label or Path(argv[0]).name
+        logs = self._open_logs(label) if not self.detach and self.log_dir else {}
+        if os.name == "nt": creationflags |= 0x00000200   # CREATE_NEW_PROCESS_GROUP
+        try:
+            proc = subprocess.Popen(
+                argv, cwd=cwd, shell=False, env=env, creationflags=creationflags,
+                stdin=(subprocess.PIPE if stdin_pipe else subprocess.DEVNULL),
+                stdout=logs.get("stdout", (None, subprocess.DEVNULL))[1],
+                stderr=logs.get("stderr", (None, subprocess.DEVNULL))[1], start_new_session=os.name != "nt"
+            )
+        finally:
+            for _, f in logs.values(): f.close()   # the child has its own handles now
+        with self._lock:
+            self._procs[proc.pid] = {"proc": proc, "label": label, "t0": time.monotonic(),
+                                     "logs": {n: str(p) for n, (p, _) in logs.items()}}
+        self._emit("started", proc.pid, label)
+        tails = [threading.Thread(target=self._tail, args=(proc, p, n), daemon=True) for n, (p, _) in logs.items()]
+        for t in tails: t.start()
+        threading.Thread(target=self._reap, args=(proc, tails), daemon=True).start()
+        return proc
+
+    def _open_logs(self, label: str) -> dict:
+        """{"stdout"/"stderr": (path, file)} for a new child, pruning the oldest logs first."""
+        try:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            old = sorted(self.log_dir.glob("*.log"), key=lambda p: p.stat().st_mtime)
+            for p in old[:max(0, len(old) - 2 * self.LOG_KEEP)]:
+                try: p.unlink()
+                except OSError: pass   # still open by a running child (Windows)
+            base = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(self._seq)}-{re.sub(r'[^A-Za-z0-9_.-]', '_', label)[:40]}"
+            return {n: (self.log_dir / f"{base}.{n}.log", open(self.log_dir / f"{base}.{n}.log", "wb"))
+                    for n in ("stdout", "stderr")}
+        except OSError:
+            return {}
+
+    def _tail(self, proc: subprocess.Popen, path: Path, name: str):
+        emit = lambda raw: self._emit("output", proc.pid, (name, raw.decode("utf-8", "replace").rstrip("\r\n")))
+        buf = b""
+        try:
+            with open(path, "rb") as f:
+                while True:
+                    chunk = f.readline()
+                    if chunk:
+                        buf += chunk
+                        if buf.endswith(b"\n"): emit(buf); buf = b""
+                        continue
+                    if proc.poll() is not None:   # exited: drain what is left and stop
+                        for line in (buf + f.read()).splitlines():
+                            emit(line)
+                        return
+                    time.sleep(self.TAIL_INTERVAL)
+        except Exception:
+            pass
+
+    def logs(self, pid: int) -> dict[str, str]:
+        """{"stdout", "stderr"} log paths of a running child (empty when it has none)."""
+        with self._lock:
+            rec = self._procs.get(pid)
+        return dict(rec["logs"]) if rec else {}
+
+    def _reap(self, proc: subprocess.Popen, tails: list):
+        code = proc.wait()
+        for t in tails: t.join(timeout=2.0)
+        with self._lock:
+            self._procs.pop(proc.pid, None)
+        self._emit("exited", proc.pid, code)
+
+    def running_argv(self) -> list[list[str]]:
+        """Command lines of the children still running."""
+        with self._lock:
+            return [list(map(str, r["proc"].args)) for r in self._procs.values()]
+
+    def running(self) -> list[tuple[int, str, float]]:
+        """[(pid, label, seconds_alive)] for every child still running."""
+        now = time.monotonic()
+        with self._lock:
+            return [(pid, r["label"], now - r["t0"]) for pid, r in self._procs.items()]
+
+    def terminate(self, pid: int) -> bool:
+        with self._lock:
+            rec = self._procs.get(pid)
+        if not rec: return False
+        try: rec["proc"].terminate(); return True
+        except Exception: return False
+
+_PROCS = ProcSupervisor(_cfg_dir() / "logs")
+
+# Warm GRC hosts print a marker once their window is up; time it against the
+# launch trace that handed off to that pid. Written by the launch worker, read
+# by the supervisor's tail/reap threads: every access holds _WINDOW_LOCK.
+_WINDOW_WAIT: dict[int, tuple["LaunchTrace", float]] = {}
+_WINDOW_LOCK = threading.Lock()
+
+def _watch_window(pid: int):
+    import launch_trace
+    tr = launch_trace.current()
+    if tr is None: return
+    with _WINDOW_LOCK: _WINDOW_WAIT[pid] = (tr, time.perf_counter())
+
+def _on_window_event(event: str, pid: int, payload):
+    if event == "output" and payload[1] == _HOST_WINDOW:
+        with _WINDOW_LOCK: hit = _WINDOW_WAIT.pop(pid, None)
+        if hit: hit[0].event("grc_window", since=hit[1])
+    elif event == "exited":
+        with _WINDOW_LOCK: _WINDOW_WAIT.pop(pid, None)
+
+_PROCS.subscribe(_on_window_event)
 
 # --------------- subprocess execution helper ---------------
 def _start_process_native(file_path: str, args: list[str] | None = None, workdir: str | None = None) -> tuple[bool, str]:
@@ -137,19 +430,35 @@ def _start_process_native(file_path: str, args: list[str] | None = None, workdir
         creationflags = 0
         if os.name == "nt":
             creationflags = 0x08000000  # CREATE_NO_WINDOW (hide console if python.exe)
-        subprocess.Popen(
-            argv,
-            cwd=(workdir or str(Path(file_path).parent)),
-            shell=False,
-            creationflags=creationflags
-        )
-        return True, f"Spawn: {Path(file_path).name} {' '.join(args or [])} (wd: {workdir or Path(file_path).parent})"
+        with span("spawn") as sp:
+            proc = _PROCS.spawn(
+                argv,
+                cwd=(workdir or str(Path(file_path).parent)),
+                label=Path(args[-1]).name if args else Path(file_path).name,
+                creationflags=creationflags
+            )
+            sp["pid"] = proc.pid
+        _SESSIONS.attach(proc.pid)
+        return True, f"Spawn [pid {proc.pid}]: {Path(file_path).name} {' '.join(args or [])} (wd: {workdir or Path(file_path).parent})"
     except FileNotFoundError as e:
         return False, f"FileNotFoundError: {e}"
     except Exception as e:
         return False, f"{type(e).__name__}: {e}"
 
 # --------------- choose best way to open WITH/without a .grc ---------------
+def _shebang_python(script: Path) -> Path | None:
+    """Interpreter named on a POSIX launcher script's #! line (the python GRC was installed for)."""
+    try:
+        with open(script, "rb") as f: line = f.readline(256).decode("utf-8", "replace").strip()
+    except OSError:
+        return None
+    if not line.startswith("#!"): return None
+    parts = line[2:].split()
+    if not parts: return None
+    if Path(parts[0]).name == "env" and len(parts) > 1:
+        found = shutil.which(parts[1]); return Path(found) if found else None
+    return Path(parts[0]) if "python" in Path(parts[0]).name and Path(parts[0]).exists() else None
+
 def _pick_module_launch(grc_launcher: str) -> tuple[str, list[str], str]:
     """
     Prefer pythonw/python to run: -m gnuradio.grc [<file>]
@@ -169,348 +478,1016 @@ def _pick_module_launch(grc_launcher: str) -> tuple[str, list[str], str]:
         return str(pyw), ["-m", "gnuradio.grc"], str(bin_dir)
     if pye.exists():
         return str(pye), ["-m", "gnuradio.grc"], str(bin_dir)
+    if os.name != "nt":
+        py = _shebang_python(base) or next((bin_dir / n for n in ("python3", "python") if (bin_dir / n).exists()), None)
+        if py:
+            return str(py), ["-m", "gnuradio.grc"], str(bin_dir)
 
     # Fallback: original launcher (args may be ignored on some builds)
     return str(base), [], str(bin_dir)
 
+# --------------- warm GRC host pool ("zygote") ---------------
+# Run by GRC's own python via -c, so the frozen launcher needs no extra file.
+# It pays the gnuradio/GTK import cost up front, announces itself, then blocks
+# on stdin: a line is a .grc path (empty line = blank editor), EOF = retire.
+_HOST_READY  = "__MMT_GRC_HOST_READY__"
+_HOST_WINDOW = "__MMT_GRC_WINDOW__"
+_HOST_LABEL  = "grc-host"      # idle hosts: not sessions, not sampled until handed a flowgraph
+_GRC_HOST_SRC = f"""
+import sys, runpy
+try:
+    from gnuradio.grc.main import main as _grc_main
+except Exception:
+    _grc_main = None
+try:
+    from gi.repository import GLib
+except Exception:
+    GLib = None
+print({_HOST_READY!r}, flush=True)
+line = sys.stdin.readline()
+if not line:
+    sys.exit(0)
+path = line.strip()
+sys.argv = ["gnuradio-companion"] + ([path] if path else [])
+if GLib is not None:
+    GLib.idle_add(lambda: print({_HOST_WINDOW!r}, flush=True) and False)
+if _grc_main is not None:
+    sys.exit(_grc_main())
+runpy.run_module("gnuradio.grc", run_name="__main__", alter_sys=True)
+"""
+
+class GrcWarmPool:
+    """
+    Keeps `size` GRC host processes imported and idle. open() hands a path to a
+    ready host over its stdin pipe and refills the pool on a background thread;
+    it returns None when nothing is ready so callers fall back to a cold spawn.
+    """
+    def __init__(self, sup: ProcSupervisor, size: int = 0):
+        self._sup = sup
+        self.size = size
+        self._lock = threading.Lock()
+        self._launcher: str | None = None
+        self._hosts: dict[int, dict] = {}   # pid -> {"proc", "ready", "t0"}
+        self._handed: dict[int, float] = {} # pid -> handoff time (monotonic)
+        self._spawning = 0                  # slots reserved by fills whose spawn is in flight
+        self.last_window_s: float | None = None
+        sup.subscribe(self._on_event)
+
+    def _host_argv(self, grc_launcher: str) -> tuple[list[str], str] | None:
+        prog, base_args, wd = _pick_module_launch(grc_launcher)
+        if base_args[:2] != ["-m", "gnuradio.grc"]:
+            return None  # no python next to GRC, can't host it ourselves
+        return [prog, "-c", _GRC_HOST_SRC], wd
+
+    def _on_event(self, event: str, pid: int, payload):
+        if event == "output" and payload[1] == _HOST_READY:
+            with self._lock:
+                if pid in self._hosts: self._hosts[pid]["ready"] = True
+        elif event == "output" and payload[1] == _HOST_WINDOW:
+            with self._lock:
+                t = self._handed.pop(pid, None)
+            if t is not None: self.last_window_s = time.monotonic() - t
+        elif event == "exited":
+            with self._lock:
+                self._hosts.pop(pid, None); self._handed.pop(pid, None)
+
+    def fill(self, grc_launcher: str):
+        """Top the pool up to `size` hosts for this launcher (spawns are cheap, imports happen in the child)."""
+        if self.size <= 0: return
+        if grc_launcher != self._launcher:
+            self.shutdown(); self._launcher = grc_launcher
+        spec = self._host_argv(grc_launcher)
+        if not spec: return
+        argv, wd = spec
+        while True:
+            with self._lock:   # reserve the slot first: concurrent fills must not overshoot `size`
+                if len(self._hosts) + self._spawning >= self.size: return
+                self._spawning += 1
+            try:
+                proc = self._sup.spawn(argv, cwd=wd, label=_HOST_LABEL, stdin_pipe=True,
+                                       creationflags=(0x08000000 if os.name == "nt" else 0))
+            except Exception:
+                with self._lock: self._spawning -= 1
+                return
+            with self._lock:
+                self._spawning -= 1
+                self._hosts[proc.pid] = {"proc": proc, "ready": False, "t0": time.monotonic()}
+
+    def fill_async(self, grc_launcher: str):
+        if self.size > 0:
+            threading.Thread(target=self.fill, args=(grc_launcher,), daemon=True).start()
+
+    def open(self, grc_launcher: str, grc_file: str | None = None) -> tuple[bool, str] | None:
+        if self.size <= 0:
+            return None
+        if grc_launcher != self._launcher:
+            self.fill_async(grc_launcher)  # warm up for next time
+            return None
+        with self._lock:
+            pid = next((p for p, h in self._hosts.items() if h["ready"] and h["proc"].poll() is None), None)
+            host = self._hosts.pop(pid, None) if pid is not None else None
+        if host is None:
+            self.fill_async(grc_launcher)
+            return None
+        try:
+            host["proc"].stdin.write(((grc_file or "") + "\n").encode("utf-8"))
+            host["proc"].stdin.close()
+        except Exception:
+            return None
+        with self._lock:
+            self._handed[pid] = time.monotonic()
+        _watch_window(pid)
+        _SESSIONS.attach(pid)
+        session_telemetry().track(pid, Path(grc_file).name if grc_file else "gnuradio.grc")
+        self.fill_async(grc_launcher)
+        return True, f"Warm start [pid {pid}]: {Path(grc_file).name if grc_file else 'blank'}"
+
+    def ready_count(self) -> int:
+        with self._lock:
+            return sum(1 for h in self._hosts.values() if h["ready"])
+
+    def shutdown(self):
+        """Retire idle hosts (EOF on stdin makes them exit cleanly)."""
+        with self._lock:
+            hosts, self._hosts = list(self._hosts.values()), {}
+        for h in hosts:
+            try: h["proc"].stdin.close()
+            except Exception: pass
+
+# --------------- session scheduler (admission control) ---------------
+class Session:
+    __slots__ = ("id", "label", "state", "pid", "slot", "t_submit", "t_start", "start", "trace", "msg", "limited", "waited")
+
+    def __init__(self, sid: int, label: str, start, limited: bool = True):
+        self.id, self.label, self.start, self.limited = sid, label, start, limited
+        self.state = "queued"      # queued -> running -> ended (or failed)
+        self.pid: int | None = None
+        self.slot: int | None = None
+        self.t_submit, self.t_start = time.monotonic(), None
+        import launch_trace
+        self.trace = launch_trace.current()
+        self.msg = ""              # start()'s message: why it failed, or what it spawned
+        self.waited = False        # went through the queue (started later, on the scheduler's thread)
+
+class SessionScheduler:
+    """
+    At most `cap` limited sessions (running flowgraphs) run at once (0 = no
+    limit); the rest wait in a FIFO and are started on a background thread as
+    slots free up (a slot frees when the session's process exits). Unlimited
+    sessions (GRC editor windows, idle most of the time) start at once and are
+    only tracked. Each running session holds a slot index, used for optional
+    CPU pinning; `nice` lowers every session's priority.
+    Listeners get fn(event, session) with event in queued/started/failed/ended.
+    """
+    def __init__(self, sup: ProcSupervisor, cap: int = 0, affinity: bool = False, nice: int = 0):
+        self.cap = max(0, cap)
+        self.affinity, self.nice = affinity, nice
+        self._sup = sup
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._queue: deque[Session] = deque()
+        self._running: dict[int, Session] = {}       # id -> session
+        self._tls = threading.local()                 # .session being started on this thread
+        self._listeners: list = []
+        sup.subscribe(self._on_proc)
+
+    def subscribe(self, fn): self._listeners.append(fn)
+    def _emit(self, event: str, sess: Session):
+        for fn in list(self._listeners):
+            try: fn(event, sess)
+            except Exception: pass
+
+    def _full(self) -> bool:
+        return bool(self.cap) and sum(1 for s in self._running.values() if s.limited) >= self.cap
+
+    def run(self, label: str, start, limited: bool = True) -> tuple[bool, str]:
+        """Start now if a slot is free (returns start()'s result), else queue and return the position."""
+        sess = Session(next(self._ids), label, start, limited)
+        with self._lock:
+            admit = not limited or (not self._full() and not self._queue)
+            if admit: self._claim(sess)
+            else:
+                self._queue.append(sess); pos = len(self._queue); sess.waited = True
+                if sess.trace is not None: sess.trace.defer()   # written when it really starts
+        if admit: return self._start(sess)
+        self._emit("queued", sess)
+        return True, f"Queued {label}: position {pos} ({self.cap} flowgraph(s) running)"
+
+    def _claim(self, sess: Session):
+        used = {s.slot for s in self._running.values()}
+        sess.slot = next(i for i in itertools.count() if i not in used)
+        sess.state = "running"; self._running[sess.id] = sess
+
+    def _start(self, sess: Session) -> tuple[bool, str]:
+        sess.t_start = time.monotonic()
+        self._tls.session = sess
+        deferred = sess.trace is not None and sess.trace.deferred
+        if sess.trace is not None: sess.trace.resume()
+        try:
+            ok, msg = sess.start()
+        except Exception as e:
+            ok, msg = False, f"{type(e).__name__}: {e}"
+        finally:
+            self._tls.session = None
+        sess.msg = msg
+        if deferred: sess.trace.finish(ok, msg)    # the launch worker returned long ago
+        if not ok or sess.pid is None:
+            sess.state = "ended" if ok else "failed"
+            self._release(sess, "ended" if ok else "failed")
+        else:
+            self._emit("started", sess)
+            if sess.pid not in {pid for pid, _, _ in self._sup.running()}:
+                self._release(sess, "ended")   # exited before we were watching
+        return ok, msg
+
+    def attach(self, pid: int):
+        """Called right after a spawn: bind the pid to the session starting on this thread."""
+        sess = getattr(self._tls, "session", None)
+        if sess is None or sess.pid is not None: return
+        sess.pid = pid
+        self._apply_limits(sess)
+
+    def _apply_limits(self, sess: Session):
+        if self.nice and hasattr(os, "setpriority"):
+            try: os.setpriority(os.PRIO_PROCESS, sess.pid, self.nice)
+            except OSError: pass
+        if self.affinity and hasattr(os, "sched_setaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+            per = max(1, len(cpus) // (self.cap or len(cpus)))
+            lo = (sess.slot * per) % len(cpus)
+            try: os.sched_setaffinity(sess.pid, cpus[lo:lo + per] or cpus)
+            except OSError: pass
+
+    def _on_proc(self, event: str, pid: int, payload):
+        if event != "exited": return
+        with self._lock:
+            sess = next((s for s in self._running.values() if s.pid == pid), None)
+        if sess:
+            sess.state = "ended"; self._release(sess, "ended")
+
+    def _release(self, sess: Session, event: str):
+        with self._lock:
+            if self._running.pop(sess.id, None) is None: return
+            nxt = self._queue.popleft() if self._queue and not self._full() else None
+            if nxt: self._claim(nxt)
+        self._emit(event, sess)
+        if nxt:
+            threading.Thread(target=self._start, args=(nxt,), daemon=True).start()
+
+    def snapshot(self) -> list[dict]:
+        """Running sessions, then the queue in order (with 1-based position)."""
+        now = time.monotonic()
+        with self._lock:
+            run = [{"id": s.id, "label": s.label, "state": s.state, "pid": s.pid, "slot": s.slot,
+                    "limited": s.limited, "age_s": now - (s.t_start or now)} for s in self._running.values()]
+            q = [{"id": s.id, "label": s.label, "state": "queued", "position": i + 1, "waited_s": now - s.t_submit}
+                 for i, s in enumerate(self._queue)]
+        return run + q
+
+    def cancel(self, sid: int) -> bool:
+        """Drop a queued session, or terminate a running one."""
+        with self._lock:
+            q = next((s for s in self._queue if s.id == sid), None)
+            if q: self._queue.remove(q)
+            r = self._running.get(sid)
+        if q:
+            q.state = "ended"; self._emit("ended", q); return True
+        return bool(r and r.pid and self._sup.terminate(r.pid))
+
+def _cfg_int(env: str, key: str, default: int) -> int:
+    try: return int(os.getenv(env) or _cfg_get(key, default))
+    except (TypeError, ValueError): return default
+
+_POOL = GrcWarmPool(_PROCS, max(0, _cfg_int("MMT_WARM_POOL", "warm_pool", WARM_POOL_SIZE)))
+_SESSIONS = SessionScheduler(_PROCS, _cfg_int("MMT_MAX_SESSIONS", "max_sessions", MAX_SESSIONS),
+                             affinity=bool(_cfg_get("session_affinity", False)),
+                             nice=_cfg_int("MMT_SESSION_NICE", "session_nice", 0))
+
+def _cfg_float(key: str, default: float) -> float:
+    try: return float(_cfg_get(key, default))
+    except (TypeError, ValueError): return default
+
+_TELEMETRY = None   # ProcTelemetry, made by the first launch (or the window, after first paint)
+_TELEMETRY_LOCK = threading.Lock()
+def session_telemetry():
+    """The sampler of every session's process tree; it subscribes to _PROCS, so it must
+    exist before the first spawn that should be measured."""
+    global _TELEMETRY
+    with _TELEMETRY_LOCK:
+        if _TELEMETRY is None:
+            from proc_telemetry import ProcTelemetry
+            cpu_budget = _cfg_float("budget_cpu_pct", BUDGET_CPU_PCT)
+            _TELEMETRY = ProcTelemetry(_PROCS, _cfg_float("telemetry_interval", TELEMETRY_INTERVAL),
+                                       int(_cfg_float("telemetry_history", 600)),
+                                       cpu_pct=((100.0 * (os.cpu_count() or 1) / _SESSIONS.cap if _SESSIONS.cap else 0.0)
+                                                if cpu_budget == 0 else max(cpu_budget, 0)),
+                                       rss_mb=_cfg_float("budget_rss_mb", BUDGET_RSS_MB), grace_s=_cfg_float("budget_grace_s", 10.0),
+                                       action=_cfg_get("budget_action", BUDGET_ACTION), untracked=(_HOST_LABEL,))
+    return _TELEMETRY
+
 def _open_with_file_fast(grc_launcher: str, grc_file: str) -> tuple[bool, str]:
-    prog, base_args, wd = _pick_module_launch(grc_launcher)
+    with span("warm_pool") as sp:
+        warm = _POOL.open(grc_launcher, grc_file); sp["cache"] = "hit" if warm else "miss"
+    if warm: return warm
+    with span("pick_module_launch"):
+        prog, base_args, wd = _pick_module_launch(grc_launcher)
     args = base_args + [grc_file] if base_args else [grc_file]
     return _start_process_native(prog, args, wd)
 
 def _open_blank_fast(grc_launcher: str) -> tuple[bool, str]:
-    prog, base_args, wd = _pick_module_launch(grc_launcher)
+    with span("warm_pool") as sp:
+        warm = _POOL.open(grc_launcher); sp["cache"] = "hit" if warm else "miss"
+    if warm: return warm
+    with span("pick_module_launch"):
+        prog, base_args, wd = _pick_module_launch(grc_launcher)
     return _start_process_native(prog, base_args, wd)
 
+def _has_grc(d: Path) -> bool:
+    """True if d holds at least one .grc (stops at the first hit)."""
+    try:
+        with os.scandir(d) as it:
+            return any(e.name.lower().endswith(".grc") and e.is_file() for e in it)
+    except OSError:
+        return False
+
 def resolve_experiments_dir() -> Path | None:
     """Resolve and return the experiments directory"""
+    with span("resolve_experiments_dir") as sp:
+        d, sp["source"] = _resolve_exp_dir()
+        return d
+
+def _resolve_exp_dir() -> tuple[Path | None, str]:
     if _MEM["exp_dir"] and _MEM["exp_dir"].is_dir():
-        return _MEM["exp_dir"]
-    
+        return _MEM["exp_dir"], "mem"
+
     # Check environment variable for experiments directory
     envd = os.getenv("MMT_EXPERIMENTS_DIR")
     if envd:
         d = Path(envd)
-        if d.is_dir() and any(d.glob("*.grc")):
+        if d.is_dir() and _has_grc(d):
             _MEM["exp_dir"] = d
             _cache_set_expdir_disk(d)
-            return d
+            return d, "env"
 
     # Check cached experiments directory
     d = _cache_get_expdir_disk()
-    if d and d.is_dir() and any(d.glob("*.grc")):
+    if d and d.is_dir() and _has_grc(d):
         _MEM["exp_dir"] = d
-        return d
+        return d, "disk"
 
     # Default directory in the application base path
     d = app_base_dir() / "experiments"
-    if d.is_dir() and any(d.glob("*.grc")):
+    if d.is_dir() and _has_grc(d):
         _MEM["exp_dir"] = d
         _cache_set_expdir_disk(d)
-        return d
+        return d, "default"
 
     # Check common locations in the home directory
     for p in [Path.home() / "Downloads/mmt-virtual-lab/experiments",
               Path.home() / "mmt-virtual-lab/experiments"]:
         p = Path(p)
-        if p.is_dir() and any(p.glob("*.grc")):
+        if p.is_dir() and _has_grc(p):
             _MEM["exp_dir"] = p
             _cache_set_expdir_disk(p)
-            return p
-
-    return None
+            return p, "home"
 
+    return None, "miss"
 
-# --------------------- threaded launcher ---------------------
-class LaunchWorker(QObject):
-    finished = Signal(bool, str)   # ok, msg
 
-    def __init__(self, mode: str, exp_name: Optional[str] = None):
-        super().__init__()
-        self.mode = mode          # "blank" or "file"
-        self.exp_name = exp_name
-
-    def run(self):
+# --------------- experiment catalog ---------------
+class ExperimentCatalog:
+    """
+    Index of the experiments folder persisted as catalog.json next to
+    config.json. Entries are keyed by file name and carry (mtime, size), so a
+    rescan costs one directory listing plus a parse of only what changed.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        data = _load_json(path)
+        self.dir: str | None = data.get("dir")
+        self.entries: dict[str, dict] = data.get("entries") or {}
+        self.packed: dict[str, dict] = {}     # "<pack id>!<file>" -> entry, from experiment_packs()
+
+    def scan(self, d: Path) -> bool:
+        """Bring the index in line with d; returns True if anything changed."""
+        from grc_flowgraph import read_meta
+        seen, changed = {}, str(d) != self.dir
+        old = {} if changed else dict(self.entries)
         try:
-            # Resolve GRC path (may be slow once; cached thereafter)
-            grc = find_gnuradio_companion()
-            if not grc:
-                self.finished.emit(False, "GNU Radio Companion was not found on this system.")
-                return
-
-            if self.mode == "file":
-                d = resolve_experiments_dir()
-                if not d:
-                    self.finished.emit(False, "Experiments folder not found.")
-                    return
-                file_abs = d / EXPERIMENTS[self.exp_name]
-                if not file_abs.exists():
-                    self.finished.emit(False, f"Flowgraph not found: {file_abs}")
-                    return
-                ok, msg = _open_with_file_fast(grc, str(file_abs))
-                self.finished.emit(ok, msg)
-                return
-
-            # blank
-            ok, msg = _open_blank_fast(grc)
-            self.finished.emit(ok, msg)
+            with os.scandir(d) as it:
+                for e in it:
+                    if not e.name.lower().endswith(".grc") or not e.is_file(): continue
+                    st = e.stat()
+                    prev = old.get(e.name)
+                    if prev and prev.get("mtime") == st.st_mtime and prev.get("size") == st.st_size:
+                        seen[e.name] = prev; continue
+                    seen[e.name] = {"mtime": st.st_mtime, "size": st.st_size, **read_meta(Path(e.path))}
+                    changed = True
+        except OSError:
+            return False
+        changed = changed or seen.keys() != old.keys()
+        if changed:
+            with self._lock:
+                self.dir, self.entries = str(d), seen
+            _save_json(self.path, {"dir": self.dir, "entries": self.entries})
+        return changed
+
+    def set_packed(self, entries: dict[str, dict]):
+        with self._lock:
+            self.packed = dict(entries)
+
+    def experiments(self) -> dict[str, str]:
+        """Display name -> file name; curated labels first, then by category/title (folder, then packs)."""
+        with self._lock:
+            entries = dict(self.entries)
+            packed = dict(self.packed)
+        known = [(EXPERIMENT_LABELS[fn], fn) for fn in EXPERIMENT_LABELS if fn in entries]
+        rest = sorted((fn for fn in entries if fn not in EXPERIMENT_LABELS),
+                      key=lambda fn: (entries[fn].get("category", "").lower(), _exp_title(fn, entries[fn]).lower()))
+        out = dict(known)
+        for fn in rest:
+            name = _exp_title(fn, entries[fn])
+            out[name if name not in out else f"{name} ({fn})"] = fn
+        for ref in sorted(packed, key=lambda r: (packed[r]["category"].lower(), packed[r]["title"].lower())):
+            name = packed[ref]["title"]
+            out[name if name not in out else f"{name} ({packed[ref]['pack']})"] = ref
+        return out
+
+    def info(self, fn: str) -> dict:
+        with self._lock:
+            return dict(self.entries.get(fn) or self.packed.get(fn) or {})
+
+def _exp_title(fn: str, entry: dict) -> str:
+    return entry.get("title") or Path(fn).stem.replace("_", " ")
+
+_CATALOG: ExperimentCatalog | None = None
+def experiment_catalog() -> ExperimentCatalog:
+    global _CATALOG
+    if _CATALOG is None: _CATALOG = ExperimentCatalog(_catalog_path())
+    return _CATALOG
+
+_PACKS = None   # PackIndex
+def experiment_packs():
+    global _PACKS
+    if _PACKS is None:
+        from exp_packs import PackIndex
+        _PACKS = PackIndex(_cfg_dir() / "packs.json", _cfg_dir() / "packcache",
+                           int(_cfg_float("pack_cache_mb", PACK_CACHE_MB) * (1 << 20)))
+    return _PACKS
+
+def experiment_file(fn: str, d: Path | None = None) -> Path | None:
+    """Flowgraph on disk for a catalog file name; pack members are extracted on first use."""
+    from exp_packs import is_pack_ref
+    if is_pack_ref(fn): return experiment_packs().extract(fn)
+    return d / fn if d else None
+
+def refresh_experiments(rescan: bool = True) -> bool:
+    """Update EXPERIMENTS from the catalog (rescanning the folder and packs first if asked). True if it changed."""
+    cat = experiment_catalog(); packs = experiment_packs()
+    if rescan:
+        d = resolve_experiments_dir()
+        if d: cat.scan(d)
+        packs.scan([d, _packs_dir()])      # stats only, unless a pack changed
+    cat.set_packed(packs.experiments())
+    names = cat.experiments()
+    with _EXP_LOCK:
+        if not names or names == EXPERIMENTS: return False
+        EXPERIMENTS.clear(); EXPERIMENTS.update(names)
+    return True
+
+# --------------- compile cache: run flowgraphs without the editor ---------------
+# grcc output is cached under compiled/<sha256(.grc bytes + GR version)>/ so a
+# flowgraph is only regenerated when its content (or GNU Radio) changes.
+COMPILED_KEEP_S = 24 * 3600   # an outdated compilation is kept this long after its last use
+def _gr_version(grc_launcher: str) -> str:
+    """GNU Radio version of the python next to GRC; cached per launcher fingerprint, so an
+    in-place upgrade (new launcher mtime/size or pkg-config version) is noticed."""
+    key = _MEM.get("gr_version")
+    if key and key[0] == grc_launcher: return key[1]
+    cached = _cfg_get("gr_version") or {}
+    fp = cached.get("fp")
+    if (cached.get("launcher") == grc_launcher and cached.get("version") and fp and _fp_valid(fp)
+            and fp.get("version") == _grc_version_hint(grc_launcher)):
+        _MEM["gr_version"] = (grc_launcher, cached["version"]); return cached["version"]
+    prog, base_args, wd = _pick_module_launch(grc_launcher)
+    ver = _grc_version_hint(grc_launcher) or "unknown"
+    if ver == "unknown" and base_args:
+        try:
+            r = subprocess.run([prog, "-c", "from gnuradio import gr; print(gr.version())"], cwd=wd,
+                               capture_output=True, text=True, timeout=60,
+                               creationflags=(0x08000000 if os.name == "nt" else 0))
+            if r.returncode == 0 and r.stdout.strip(): ver = r.stdout.strip().splitlines()[-1]
+        except Exception:
+            pass
+    if ver != "unknown": _cfg_set("gr_version", {"launcher": grc_launcher, "version": ver, "fp": _fingerprint(grc_launcher)})
+    _MEM["gr_version"] = (grc_launcher, ver)
+    return ver
+
+def _grcc_argv(grc_launcher: str) -> list[str] | None:
+    prog, base_args, _ = _pick_module_launch(grc_launcher)
+    bin_dir = Path(prog).parent
+    for name in ("grcc.exe", "grcc"):
+        if (bin_dir / name).exists(): return [str(bin_dir / name)]
+    if base_args:
+        return [prog, "-c", "import sys; from gnuradio.grc.compiler import main; sys.exit(main())"]
+    return None
 
-        except Exception as e:
-            # Guarantee we always signal the UI to close the spinner
-            self.finished.emit(False, f"Unexpected error: {type(e).__name__}: {e}")
-
-# --------------------- UI ---------------------
-class MainWindow(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle(APP_TITLE)
-        self.setMinimumSize(900, 500)
-        self.setWindowIcon(QIcon())
-        self.status = QStatusBar(); self.setStatusBar(self.status)
-        self._active_dlg = None  # track any active buffering dialog
-        self._build_ui()
-        self.setStyleSheet(QSS)
-        # Pre-warm (runs on UI thread but very quick thanks to caching)
-        self._prewarm()
-
-    def _build_ui(self):
-        root = QWidget(); self.setCentralWidget(root)
-        outer = QVBoxLayout(root); outer.setContentsMargins(16,16,16,16); outer.setSpacing(14)
-
-        # ---------- Header with LOGO above text ----------
-        # ---------- Header with LOGO above text (LEFT aligned) ----------
-        header = QFrame(objectName="Header")
-        hl = QVBoxLayout(header)  # vertical: logo -> brand -> subtitle
-        hl.setContentsMargins(16, 12, 16, 12)
-        hl.setSpacing(6)
-        # Align the whole column to the LEFT
-        hl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        logo_lbl = QLabel(objectName="Logo")
-        # LEFT align the image
-        logo_lbl.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        lp = _logo_path()
-        if lp:
-            pm = QPixmap(str(lp))
-            if not pm.isNull():
-                pm = pm.scaledToHeight(120, Qt.SmoothTransformation)  # tweak height if needed
-                logo_lbl.setPixmap(pm)
-        else:
-            logo_lbl.setText("")
-
-        brand = QLabel(APP_BRAND, objectName="Brand")
-        brand.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        sub = QLabel("Signal Processing Experiments (AM, FM, FSK, QPSK, 16-QAM)", objectName="Subtitle")
-        sub.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        hl.addWidget(logo_lbl)
-        hl.addWidget(brand)
-        hl.addWidget(sub)
-        outer.addWidget(header)
-
-
-        # ---------- Card ----------
-        card = QFrame(); card.setObjectName("Card"); card.setProperty("class", "Card")
-        card_l = QVBoxLayout(card); card_l.setContentsMargins(16,16,16,16); card_l.setSpacing(10)
-
-        section = QLabel("SELECT EXPERIMENT", objectName="SectionTitle"); section.setProperty("class","SectionTitle")
-        card_l.addWidget(section)
-
-        self.combo = QComboBox()
-        for name in EXPERIMENTS: self.combo.addItem(name)
-        card_l.addWidget(self.combo)
-
-        self.btn_open = QPushButton("Open GNU Radio"); self.btn_open.setObjectName("Primary"); self.btn_open.setProperty("class","Primary")
-        self.btn_open.clicked.connect(self.on_open)
-        card_l.addWidget(self.btn_open)
-
-        self.btn_open_blank = QPushButton("Open GNU Radio (blank)"); self.btn_open_blank.setObjectName("Primary"); self.btn_open_blank.setProperty("class","Primary")
-        self.btn_open_blank.clicked.connect(self.on_open_blank)
-        card_l.addWidget(self.btn_open_blank)
-
-        hint = QLabel("Tip: After GRC opens, press ▶ to run. Use QT GUI sinks for Time/Freq/Constellation.")
-        hint.setStyleSheet(f"color: {MUTED};"); card_l.addWidget(hint)
-
-        outer.addWidget(card)
-
-        # ---------- Footer ----------
-        footer = QHBoxLayout(); footer.addItem(QSpacerItem(20,20,QSizePolicy.Expanding,QSizePolicy.Minimum))
-        foot = QLabel(" MakeMyTechnology"); foot.setStyleSheet(f"color: {MUTED};"); footer.addWidget(foot, 0, Qt.AlignRight)
-        outer.addLayout(footer)
-
-    def _prewarm(self):
-        try: _MEM["grc_path"] = find_gnuradio_companion()
-        except Exception: pass
-        try: _MEM["exp_dir"]  = resolve_experiments_dir()
-        except Exception: pass
-
-    # ---------- buffering dialog helpers ----------
-    def _show_buffering(self, text: str = "Opening GNU Radio…") -> tuple[QProgressDialog, float]:
-        dlg = QProgressDialog(text, None, 0, 0, self)
-        dlg.setWindowTitle("Please wait")
-        dlg.setCancelButton(None)
-        dlg.setWindowModality(Qt.WindowModal)
-        dlg.setMinimumDuration(0)     # show immediately
-        dlg.setAutoClose(False)
-        dlg.setAutoReset(False)
-        dlg.show()
-        QApplication.setOverrideCursor(Qt.WaitCursor)
-        return dlg, time.monotonic()
-
-    def _close_buffering_after(self, dlg: QProgressDialog, delay_ms: int):
-        def _finish():
+def compile_flowgraph(grc_launcher: str, grc_file: Path) -> tuple[Path | None, str]:
+    """Return (cached generated script, msg); runs grcc only on a cache miss."""
+    data = grc_file.read_bytes()
+    key = hashlib.sha256(data + b"\0" + _gr_version(grc_launcher).encode()).hexdigest()[:32]
+    out = _compiled_dir() / key
+    meta = _load_json(out / "meta.json")
+    script = out / meta.get("script", "")
+    if meta.get("script") and script.is_file():
+        try: os.utime(out)     # last use, for pruning below
+        except OSError: pass
+        return script, f"cache hit ({key[:8]})"
+
+    grcc = _grcc_argv(grc_launcher)
+    if not grcc: return None, "grcc was not found next to GNU Radio Companion."
+    # private to this process/thread: a concurrent compile of the same file has its own
+    tmp = out.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"); tmp.mkdir(parents=True)
+    try:
+        r = subprocess.run(grcc + ["-o", str(tmp), str(grc_file)], cwd=str(grc_file.parent),
+                           capture_output=True, text=True, timeout=300,
+                           creationflags=(0x08000000 if os.name == "nt" else 0))
+    except Exception as e:
+        shutil.rmtree(tmp, ignore_errors=True); return None, f"grcc failed: {type(e).__name__}: {e}"
+    made = sorted(tmp.glob("*.py"))
+    if r.returncode != 0 or not made:
+        shutil.rmtree(tmp, ignore_errors=True)
+        err = (r.stderr or r.stdout or "").strip().splitlines()
+        return None, f"grcc failed ({r.returncode}): {err[-1] if err else 'no output'}"
+
+    # Drop older compilations of the same flowgraph that nothing may still run from:
+    # not used for COMPILED_KEEP_S (other launchers' sessions) and not in our children's argv
+    busy = {os.path.normcase(str(a)) for argv in _PROCS.running_argv() for a in argv}
+    for old in _compiled_dir().glob("*/meta.json"):
+        d = old.parent
+        if d.name == key or _load_json(old).get("source") != str(grc_file): continue
+        try: idle = time.time() - d.stat().st_mtime > COMPILED_KEEP_S
+        except OSError: continue
+        if idle and not any(b.startswith(os.path.normcase(str(d))) for b in busy): shutil.rmtree(d, ignore_errors=True)
+    _save_json(tmp / "meta.json", {"source": str(grc_file), "script": made[0].name, "compiled": time.time()})
+    try:
+        tmp.rename(out)        # publish atomically
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)   # a concurrent compile published the same key first
+        if not (out / made[0].name).is_file(): return None, f"compile cache: could not publish {key[:8]}"
+    return out / made[0].name, f"compiled ({key[:8]})"
+
+def _run_compiled_fast(grc_launcher: str, grc_file: Path, workdir: Path | None = None) -> tuple[bool, str]:
+    """Run the cached script in `workdir` (default: the flowgraph's folder), so relative
+    file paths in the flowgraph resolve as they do when GRC runs it, not in the cache."""
+    prog, base_args, _ = _pick_module_launch(grc_launcher)
+    if not base_args: return False, "No python interpreter found next to GNU Radio Companion."
+    with span("compile") as sp:
+        script, how = compile_flowgraph(grc_launcher, grc_file)
+        sp["cache"] = "hit" if how.startswith("cache hit") else "miss"
+    if not script: return False, how
+    ok, msg = _start_process_native(prog, [str(script)], str(workdir or grc_file.parent))
+    return ok, f"{msg} [{how}]"
+
+def precheck_flowgraph(grc_file: Path) -> tuple[bool, list[str]]:
+    """Run grc_check on a flowgraph before launch -> (may_launch, report lines)."""
+    mode = _cfg_get("precheck", PRECHECK)
+    if mode == "off": return True, []
+    from grc_check import check_file
+    found = check_file(grc_file, _cfg_get("precheck_budget"))
+    lines = [f"check {grc_file.name}: {x['level']} {x['code']} {x['block']}: {x['msg']}" for x in found]
+    blocked = mode == "block" and any(x["level"] == "error" for x in found)
+    return not blocked, lines
+
+def _pack_recording(pack_ref: str | None) -> Path | None:
+    if not pack_ref: return None
+    import zipfile
+    from grc_replay import read_recording
+    try:
+        rec = experiment_packs().recording(pack_ref)
+        if rec: read_recording(rec)
+        return rec
+    except (KeyError, OSError, ValueError, zipfile.BadZipFile):
+        return None
+
+def replay_if_needed(grc_file: Path, pack_ref: str | None = None) -> tuple[Path, str]:
+    """-> (flowgraph to launch, log note). SDR experiments without a device get a
+    copy whose source streams a recording (see grc_replay); for a pack experiment
+    the pack's own recording is extracted when there is no local one."""
+    mode = os.getenv("MMT_REPLAY") or _cfg_get("replay", REPLAY)
+    if mode == "off": return grc_file, ""
+    from grc_flowgraph import load_flowgraph, save_flowgraph
+    from grc_replay import device_present, find_recording, hw_sources, replay_variant
+    try:
+        raw = grc_file.read_bytes()
+        if b"rtlsdr_source" not in raw and b"osmosdr_source" not in raw: return grc_file, ""
+        fg = load_flowgraph(grc_file)
+    except Exception:
+        return grc_file, ""
+    hw = hw_sources(fg)
+    if not hw or (mode != "always" and device_present([b.key for b in hw]) is not False): return grc_file, ""
+    rec = find_recording(grc_file, [_cfg_get("replay_dir")]) or _pack_recording(pack_ref)
+    if not rec: return grc_file, f"replay: no SDR found and no recording for {grc_file.stem}; launching as is"
+    out = _replay_dir() / f"{grc_file.stem}_replay{grc_file.suffix}"
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = save_flowgraph(replay_variant(fg, rec), out.with_name(f"{out.name}.{os.getpid()}.{threading.get_ident()}.tmp"))
+        os.replace(tmp, out)   # concurrent launches may rewrite it; readers always see a whole file
+    except (OSError, ValueError, RuntimeError) as e:
+        return grc_file, f"replay: {e}; launching as is"
+    return out, f"replay: {'no SDR found, ' if mode != 'always' else ''}streaming {rec.name}"
+
+def native_if_needed(grc_file: Path) -> tuple[Path, str]:
+    """-> (flowgraph to launch, log note). Legacy XML flowgraphs run as their YAML
+    conversion (see grc_convert), made once per file content and cached. Only for
+    run/capture: the cached copy is replaced when the source changes, so the
+    editor always gets the real file (a student's Save must land there)."""
+    mode = os.getenv("MMT_CONVERT") or _cfg_get("convert", CONVERT)
+    from grc_convert import convert_file, library_dirs
+    from grc_flowgraph import grc_format
+    try:
+        if mode == "off" or grc_format(grc_file) != "xml": return grc_file, ""
+        r = convert_file(grc_file, _converted_dir(), library_dirs(_MEM["grc_path"]))
+    except RuntimeError:
+        return grc_file, ""     # no PyYAML: GRC converts it itself
+    except Exception as e:
+        return grc_file, f"convert: {type(e).__name__}: {e}; launching as is"
+    if not r["output"]:
+        errs = [f"{x['code']} {x['block']}: {x['msg']}" for x in r["findings"] if x["level"] == "error"]
+        return grc_file, f"convert: {grc_file.name} not converted ({'; '.join(errs)}); launching as is"
+    return Path(r["output"]), "" if r["cached"] else f"convert: {grc_file.name} -> YAML (cached until it changes)"
+
+# --------------------- one launch (GUI worker and CLI) ---------------------
+def launch(mode: str, exp_name: Optional[str] = None, notice=lambda line: None) -> tuple[bool, str]:
+    """One launch, as the window's buttons and the CLI do it: "blank", "file", "run" (compiled,
+    no editor) or "capture" (file + IQ taps). `notice(line)` gets informational lines."""
+    import zipfile
+    from exp_packs import is_pack_ref
+    session_telemetry()   # sampling before the first spawn
+    # Resolve GRC path (may be slow once; cached thereafter)
+    grc = find_gnuradio_companion()
+    if not grc:
+        return False, "GNU Radio Companion was not found on this system."
+
+    if mode in ("file", "run", "capture"):
+        fn = experiments().get(exp_name)
+        if not fn:
+            return False, f"Unknown experiment: {exp_name}"
+        d = resolve_experiments_dir()
+        if not d and not is_pack_ref(fn):
+            return False, "Experiments folder not found."
+        with span("pack") as sp:
+            if is_pack_ref(fn): sp["ref"] = fn
+            try: file_abs = experiment_file(fn, d)
+            except (KeyError, OSError, ValueError, zipfile.BadZipFile) as e:
+                return False, f"Could not extract {fn}: {e}"
+        if not file_abs.exists():
+            return False, f"Flowgraph not found: {file_abs}"
+        with span("precheck"):
+            may_launch, report = precheck_flowgraph(file_abs)
+        for line in report: notice(line)
+        if not may_launch:
+            return False, f"{file_abs.name} failed the pre-launch check:\n" + "\n".join(report)
+        src = file_abs          # "file" edits the experiment itself, never a generated copy
+        if mode in ("run", "capture"):
+            with span("replay"):
+                src, note = replay_if_needed(file_abs, fn if is_pack_ref(fn) else None)
+            if note: notice(note)
+            with span("convert") as sp:
+                conv, note = native_if_needed(src)
+                if conv != src: sp["cache"] = "miss" if note else "hit"
+                src = conv
+            if note: notice(note)
+        if mode == "run":
+            # src may be a replay/converted copy in the config dir; paths are relative to the experiment
+            return _SESSIONS.run(f"{file_abs.name} (run)", lambda: _run_compiled_fast(grc, src, file_abs.parent))
+        if mode == "capture":
+            with span("capture_variant"):
+                from iq_capture import prepare_capture   # numpy: only when capturing
+                try: variant, taps = prepare_capture(src, _captures_dir(), _cfg_float("capture_seconds", CAPTURE_SECONDS),
+                                                     int(_cfg_float("capture_mb", CAPTURE_MB) * (1 << 20)))
+                except (OSError, ValueError, RuntimeError) as e: return False, f"Capture setup failed: {e}"
+            streams = {json.loads(p.read_text(encoding="utf-8"))["file"] for p in taps}
+            notice(f"capture: {len(taps)} sink input(s), {len(streams)} stream(s) -> {variant.parent}")
+            return _SESSIONS.run(f"{file_abs.name} (capture)", lambda: _open_with_file_fast(grc, str(variant)), limited=False)
+        return _SESSIONS.run(file_abs.name, lambda: _open_with_file_fast(grc, str(file_abs)), limited=False)
+
+    # blank
+    return _SESSIONS.run("GRC (blank)", lambda: _open_blank_fast(grc), limited=False)
+
+# --------------------- single instance (local IPC) ---------------------
+# The first launcher listens on a per-user named pipe (Windows) or Unix socket;
+# later starts send their command there and exit, so a click costs one connect
+# instead of Qt start-up, discovery and a second window. Connections are
+# authenticated with a key in the config dir (multiprocessing.connection HMAC).
+def _instance_address() -> tuple[str, str]:
+    import getpass
+    try: user = getpass.getuser()
+    except Exception: user = "user"
+    user = re.sub(r"[^A-Za-z0-9_.-]", "_", user)
+    if os.name == "nt": return rf"\\.\pipe\mmt-virtual-lab-{user}", "AF_PIPE"
+    import tempfile
+    return str(Path(tempfile.gettempdir()) / f"mmt-virtual-lab-{user}.sock"), "AF_UNIX"
+
+def _instance_key() -> bytes | None:
+    try: return (_cfg_dir() / "instance.key").read_bytes().strip() or None
+    except OSError: return None
+
+def _publish_instance_key(key: bytes):
+    """Replace instance.key atomically (private to the user); only once our listener is bound."""
+    p = _cfg_dir() / "instance.key"
+    tmp = p.with_name(f"instance.key.{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f: f.write(key)
+    os.replace(tmp, p)
+
+@contextmanager
+def _instance_lock(timeout: float = 5.0):
+    """Exclusive lock (instance.lock in the config dir) around probing and binding the address;
+    yields False when it could not be taken within timeout."""
+    f = open(_cfg_dir() / "instance.lock", "a+b")
+    if os.name == "nt":
+        import msvcrt
+        lock = lambda: msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        unlock = lambda: msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        lock = lambda: fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        unlock = lambda: fcntl.flock(f, fcntl.LOCK_UN)
+    end, held = time.monotonic() + timeout, False
+    try:
+        while not held:
+            try: f.seek(0); lock(); held = True
+            except OSError:
+                if time.monotonic() > end: break
+                time.sleep(0.02)
+        yield held
+    finally:
+        if held:
+            try: f.seek(0); unlock()
+            except OSError: pass
+        f.close()
+
+def _instance_alive(addr: str, family: str) -> bool:
+    """Does a listener answer on addr? (a bare connect, no handshake)"""
+    if family == "AF_UNIX" and not os.path.exists(addr): return False
+    from multiprocessing.connection import Client
+    try:
+        Client(addr, family).close(); return True
+    except OSError:
+        return False
+
+def single_instance_enabled() -> bool:
+    v = os.getenv("MMT_SINGLE_INSTANCE")
+    return v.strip().lower() not in ("0", "off", "false", "no") if v else bool(_cfg_get("single_instance", SINGLE_INSTANCE))
+
+def forward_to_instance(msg: dict, timeout: float = 5.0) -> dict | None:
+    """Send msg to the running launcher -> its reply, or None if there is none (or it doesn't answer)."""
+    key = _instance_key()
+    addr, family = _instance_address()
+    if not key or (family == "AF_UNIX" and not os.path.exists(addr)): return None
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+    try:
+        with Client(addr, family, authkey=key) as c:
+            c.send(msg)
+            return c.recv() if c.poll(timeout) else None
+    except (OSError, EOFError, AuthenticationError):   # no server, stale socket, old key
+        return None
+
+class InstanceServer:
+    """Accepts forwarded commands on a thread; handler(msg) -> reply dict (called on that thread)."""
+    def __init__(self, handler):
+        self._handler = handler
+        self._listener = None
+
+    def start(self) -> bool:
+        """Listen unless another launcher already does; False -> run standalone."""
+        from multiprocessing.connection import Listener
+        addr, family = _instance_address()
+        key = os.urandom(32).hex().encode()
+        with _instance_lock() as held:
+            if not held or _instance_alive(addr, family): return False
+            if family == "AF_UNIX" and os.path.exists(addr):
+                try: os.unlink(addr)      # left by a launcher that died (a live one would have answered)
+                except OSError: return False
             try:
-                if dlg and dlg.isVisible():
-                    dlg.close()
-            except Exception:
-                pass
-            QApplication.restoreOverrideCursor()
-            self._active_dlg = None
-        QTimer.singleShot(delay_ms, _finish)
-
-    # ---------- thread orchestration ----------
-    def _launch_in_thread(self, mode: str, exp_name: Optional[str] = None):
-        # Close any previously stuck dialog (paranoia)
-        if self._active_dlg is not None:
-            try: self._active_dlg.close()
-            except Exception: pass
-            QApplication.restoreOverrideCursor()
-            self._active_dlg = None
-
-        # 1) Show buffering immediately (GUI thread)
-        dlg, _ = self._show_buffering("Opening GNU Radio…")
-        self._active_dlg = dlg  # keep a handle for safety
-
-        # 2) Prepare worker + thread
-        self._thr = QThread(self)
-        self._wrk = LaunchWorker(mode=mode, exp_name=exp_name)
-        self._wrk.moveToThread(self._thr)
-
-        self._thr.started.connect(self._wrk.run)
-
-        def on_finished(ok: bool, msg: str):
-            # Runs on GUI thread (QueuedConnection)
-            self._post_to_gui(lambda: self.status.showMessage(msg, 8000))
-            if not ok:
-                # Close immediately on failure
-                try:
-                    if dlg and dlg.isVisible():
-                        dlg.close()
-                except Exception:
-                    pass
-                QApplication.restoreOverrideCursor()
-                self._active_dlg = None
-                QMessageBox.critical(self, "Launch failed", msg)
-            else:
-                # Close after the fixed 2s buffer on success
-                self._close_buffering_after(dlg, CLOSE_AFTER_SUCCESS_MS)
-            self._thr.quit()
-
-        # Force queued delivery of the finish signal
-        self._wrk.finished.connect(on_finished, type=Qt.QueuedConnection)
-
-        # SAFETY NET: if the thread finishes for any reason and dialog is still up, close it.
-        def _safety_close():
+                self._listener = Listener(addr, family, authkey=key)
+                _publish_instance_key(key)
+            except OSError:
+                self.close(); return False
+        threading.Thread(target=self._serve, name="instance", daemon=True).start()
+        return True
+
+    def _serve(self):
+        from multiprocessing import AuthenticationError
+        while (ls := self._listener) is not None:
+            try: conn = ls.accept()
+            except (OSError, EOFError, AuthenticationError): continue
             try:
-                if dlg and dlg.isVisible():
-                    dlg.close()
-                QApplication.restoreOverrideCursor()
+                with conn:
+                    if conn.poll(5.0): conn.send(self._handler(conn.recv()))
             except Exception:
                 pass
-            self._active_dlg = None
-
-        self._thr.finished.connect(self._wrk.deleteLater, type=Qt.QueuedConnection)
-        self._thr.finished.connect(self._thr.deleteLater, type=Qt.QueuedConnection)
-        self._thr.finished.connect(_safety_close, type=Qt.QueuedConnection)
-
-        self._thr.start()
-
-    # Button 1: open selected .grc (threaded)
-    def on_open(self):
-        name = self.combo.currentText()
-
-        # Resolve the experiment directory to get the full path of the .grc file
-        d = resolve_experiments_dir()
-        if not d:
-            self.status.showMessage("Experiments folder not found.", 8000)
-            return
 
-        # Get the absolute path of the selected experiment file
-        file_abs = d / EXPERIMENTS[name]
-        if not file_abs.exists():
-            self.status.showMessage(f"Flowgraph not found: {file_abs}", 8000)
-            return
-
-        # Debugging: Print the file path
-        print(f"Opening GNU Radio with file: {file_abs}")
-
-        # Show buffering FIRST, then worker will validate exp path & launch
-        self._launch_in_thread("file", exp_name=name)
-
-        # Ensure we're calling the correct executable to launch the file
-        grc_path = find_gnuradio_companion()  # Get the path of the GNU Radio Companion executable
-        if not grc_path:
-            self.status.showMessage("GNU Radio Companion was not found.", 8000)
-            return
-
-        # Debugging: Print the executable path
-        print(f"Launching GNU Radio from: {grc_path}")
+    def close(self):
+        ls, self._listener = self._listener, None
+        if ls is not None:
+            try: ls.close()
+            except OSError: pass
+
+def handle_forwarded(msg: dict, post) -> dict:
+    """Validate a forwarded command and hand it to the window via post(cmd, exp_name)."""
+    cmd, query = msg.get("cmd", "show"), msg.get("exp")
+    if cmd not in ("show", "blank", "file", "run", "capture"): return {"ok": False, "msg": f"unknown command {cmd!r}"}
+    name = None
+    if cmd in ("file", "run", "capture"):
+        name = find_experiment(query or "")
+        if not name: return {"ok": False, "msg": f"No experiment matches {query!r} (see --list)"}
+    post(cmd, name)
+    return {"ok": True, "msg": f"handed to the running launcher (pid {os.getpid()})" + (f": {name}" if name else "")}
+
+# --------------------- command line (no Qt) ---------------------
+# Everything below main()'s GUI branch: listing, opening and checking a machine
+# from scripts. Never imports PySide6; children are detached so they outlive us.
+#   virtual_lab_launcher --list | --open EXP | --run EXP | --blank | --doctor  [--json]
+def find_experiment(query: str) -> str | None:
+    """Display name for `query`: a display name, file name or stem, or a unique part of a name."""
+    q = query.strip().lower()
+    names = experiments()
+    for name, fn in names.items():
+        if q in (name.lower(), fn.lower(), Path(fn).stem.lower()): return name
+    hits = [name for name in names if q in name.lower()]
+    return hits[0] if len(hits) == 1 else None
+
+def _print(doc, as_json: bool, text: str):
+    print(json.dumps(doc, indent=2, default=str) if as_json else text)
+
+def _cli_list(as_json: bool) -> int:
+    d = resolve_experiments_dir()
+    if not d:
+        _print({"error": "experiments folder not found"}, as_json, "Experiments folder not found."); return 1
+    refresh_experiments()
+    from exp_packs import is_pack_ref
+    cat = experiment_catalog()
+    packs = {p: e["path"] for p, e in experiment_packs().active.items()}
+    rows = [{"name": name, "file": fn, "path": str(d / fn) if not is_pack_ref(fn) else packs.get(fn.split("!")[0], ""),
+             **{k: cat.info(fn).get(k, "") for k in ("title", "category", "description")}}
+            for name, fn in experiments().items()]
+    w = max((len(r["name"]) for r in rows), default=0) + 2
+    _print(rows, as_json, "\n".join(f"{r['name']:<{w}}{r['file']}" for r in rows)); return 0
+
+def _doctor() -> list[dict]:
+    from grc_check import check_file
+    from grc_replay import device_present
+    checks = []
+    def add(name: str, ok: bool, detail: str, required: bool = True):
+        checks.append({"check": name, "ok": bool(ok), "required": required, "detail": detail})
+    grc, tier = _find_grc()
+    add("GNU Radio Companion", grc, f"{grc} ({tier})" if grc else "not found (set MMT_GRC_PATH)")
+    if grc:
+        prog, base_args, _ = _pick_module_launch(grc)
+        add("GNU Radio python", base_args, prog if base_args else "no python next to GRC; opening via the launcher only", False)
+        ver = _gr_version(grc); add("GNU Radio version", ver != "unknown", ver, False)
+        grcc = _grcc_argv(grc); add("grcc (Run directly)", grcc, grcc[0] if grcc else "not found", False)
+    d, tier = _resolve_exp_dir()
+    add("experiments folder", d, f"{d} ({tier})" if d else "not found (set MMT_EXPERIMENTS_DIR)")
+    if d:
+        refresh_experiments()
+        errs, names = [], experiments()
+        for fn in names.values():
+            try: errs += [f"{fn}: {x['code']} {x['block']}" for x in check_file(experiment_file(fn, d)) if x["level"] == "error"]
+            except Exception as e: errs.append(f"{fn}: {type(e).__name__}: {e}")
+        add("flowgraphs", not errs, f"{len(names)} experiment(s)" + (f", errors: {'; '.join(errs)}" if errs else ""), False)
+    packs = experiment_packs(); bad_packs = packs.errors(); n, size = packs.cache_size()
+    add("experiment packs", not bad_packs, f"{len(packs.active)} pack(s), cache {n} file(s) {size / 1e6:.0f} MB of "
+        f"{packs.limit / 1e6:.0f}" + (f", unreadable: {'; '.join(f'{Path(p).name}: {e}' for p, e in bad_packs.items())}" if bad_packs else ""), False)
+    try:
+        probe = _cfg_dir() / f".probe{os.getpid()}"; probe.write_text("ok"); probe.unlink()
+        add("config folder", True, str(_cfg_dir()))
+    except OSError as e:
+        add("config folder", False, f"{_cfg_dir()}: {e}")
+    for mod, pkg, why in (("PySide6", "PySide6", "launcher window"), ("numpy", "numpy", "captures, reference models"),
+                          ("yaml", "pyyaml", "YAML flowgraphs, XML conversion")):
+        found = importlib.util.find_spec(mod) is not None or getattr(sys, "frozen", False)
+        add(f"{pkg}", found, f"{'ok' if found else 'missing'} ({why})", False)
+    tel = session_telemetry()
+    add("session telemetry", tel.enabled,
+        f"{tel.backend}, every {tel.interval:g} s" if tel.enabled
+        else "off (no /proc or Win32 here; pip install psutil)", False)
+    sdr = device_present(["rtlsdr_source"])
+    add("RTL-SDR dongle", True, {True: "present", False: "absent (FR experiment uses a recording)", None: "unknown"}[sdr], False)
+    return checks
+
+def _cli_doctor(as_json: bool) -> int:
+    checks = _doctor()
+    bad = [c for c in checks if c["required"] and not c["ok"]]
+    _print({"ok": not bad, "checks": checks}, as_json,
+           "\n".join(f"{'ok' if c['ok'] else ('ERR' if c['required'] else 'warn'):<6}{c['check']:<22}{c['detail']}" for c in checks))
+    return 1 if bad else 0
+
+def _cli_launch(mode: str, query: Optional[str], as_json: bool, forward: bool = True) -> int:
+    r = forward_to_instance({"cmd": mode, "exp": query}) if forward else None
+    if r is not None:
+        _print({**r, "mode": mode, "forwarded": True}, as_json, r.get("msg", "")); return 0 if r.get("ok") else 1
+    name = None
+    if query is not None:
+        resolve_experiments_dir(); refresh_experiments()
+        name = find_experiment(query)
+        if not name:
+            msg = f"No experiment matches {query!r} (see --list)"
+            _print({"ok": False, "error": msg}, as_json, msg); return 2
+    notes: list[str] = []
+    _PROCS.detach = True
+    from launch_trace import LaunchTrace
+    trace = LaunchTrace(mode, name); trace.activate()
+    ok, msg = launch(mode, name, notes.append if as_json else lambda line: print(line, file=sys.stderr))
+    trace.finish(ok, msg)
+    _print({"ok": ok, "mode": mode, "experiment": name, "message": msg, "notices": notes}, as_json, msg)
+    return 0 if ok else 1
+
+def _attach_console():
+    # The --noconsole EXE starts without stdout; borrow the calling console (cmd/PowerShell), if any.
+    if os.name == "nt" and sys.stdout is None and ctypes.windll.kernel32.AttachConsole(-1):
+        sys.stdout = open("CONOUT$", "w", encoding="utf-8"); sys.stderr = sys.stdout
+    if sys.stdout is None: sys.stdout = open(os.devnull, "w")
+    if sys.stderr is None: sys.stderr = sys.stdout
+
+def cli(a) -> int:
+    if a.list: return _cli_list(a.json)
+    if a.doctor: return _cli_doctor(a.json)
+    fwd = single_instance_enabled() and not a.new_instance
+    if a.blank: return _cli_launch("blank", None, a.json, fwd)
+    return _cli_launch("run" if a.run else "file", a.run or a.open, a.json, fwd)
+
+# --------------------- startup profile ---------------------
+_STARTUP: list[tuple[str, float]] = [("launcher module", time.perf_counter() - _T0)]
+
+def startup_mark(stage: str):
+    _STARTUP.append((stage, time.perf_counter() - _T0))
+
+def _process_age() -> float | None:
+    """Seconds since this process was created (interpreter start-up, and unpacking for frozen builds)."""
+    try:
+        if os.name == "nt":
+            k = ctypes.windll.kernel32; ft = [ctypes.c_ulonglong() for _ in range(4)]
+            if not k.GetProcessTimes(k.GetCurrentProcess(), *map(ctypes.byref, ft)): return None
+            now = ctypes.c_ulonglong(); k.GetSystemTimeAsFileTime(ctypes.byref(now))
+            return (now.value - ft[0].value) / 1e7
+        ticks = int(Path("/proc/self/stat").read_text().rsplit(")", 1)[1].split()[19])
+        return float(Path("/proc/uptime").read_text().split()[0]) - ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+_age = _process_age()
+_BEFORE_T0 = _age - (time.perf_counter() - _T0) if _age is not None else None
+
+def startup_report() -> dict:
+    """Print the stage timings (stderr) and keep them in startup_profile.json."""
+    rows, prev = [], 0.0
+    for stage, t in sorted(_STARTUP, key=lambda r: r[1]):
+        rows.append({"stage": stage, "at_s": round(t, 4), "dur_s": round(t - prev, 4)}); prev = t
+    doc = {"ts": time.time(), "frozen": bool(getattr(sys, "frozen", False)),
+           "before_python_s": round(_BEFORE_T0, 4) if _BEFORE_T0 is not None else None,
+           "stages": rows}
+    _save_json(_cfg_dir() / "startup_profile.json", doc)
+    if doc["before_python_s"] is not None:
+        print(f"{'process start -> launcher module':<36}{doc['before_python_s'] * 1000:8.0f} ms", file=sys.stderr)
+    for r in rows:
+        print(f"{r['stage']:<36}{r['dur_s'] * 1000:8.0f} ms   (at {r['at_s'] * 1000:.0f} ms)", file=sys.stderr)
+    sys.stderr.flush()
+    return doc
 
-        try:
-            # Launch GNU Radio Companion with the full path to the .grc file using Python
-            result = subprocess.run(
-                [grc_path, "-m", "gnuradio.grc", str(file_abs)],
-                cwd=str(Path(grc_path).parent),
-                capture_output=True,
-                text=True
-            )
-    
-            if result.returncode != 0:
-                print(f"Error: {result.stderr}")  # Error message from stderr
-                print(f"Output: {result.stdout}")  # Output from stdout
-            else:
-                print(f"Success: {result.stdout}")
-    
-            # Debugging: Check the output from the command
-            print("GNU Radio Companion output:")
-            print(result.stdout)  # stdout output
-            print(result.stderr)  # stderr output
-    
-            self.status.showMessage(f"Opening {file_abs}", 8000)
-    
-        except subprocess.CalledProcessError as e:
-            # Capture and display the error
-            self.status.showMessage(f"Failed to open GRC file: {e}", 8000)
-            print(f"Error: {e}")
-            print(f"Stdout: {e.stdout}")
-            print(f"Stderr: {e.stderr}")
-
-
-
-
-    # Button 2: open blank (threaded)
-    def on_open_blank(self):
-        self._launch_in_thread("blank")
-
-    def _post_to_gui(self, fn):
-        QTimer.singleShot(0, fn)
-
-    # Ensure cursor/dialog are cleaned up if window is closed mid-launch
-    def closeEvent(self, event):
-        try:
-            if self._active_dlg is not None:
-                self._active_dlg.close()
-            QApplication.restoreOverrideCursor()
-        except Exception:
-            pass
-        super().closeEvent(event)
 
 def main():
-    app = QApplication(sys.argv)
-    win = MainWindow()
-    win.show()
-    sys.exit(app.exec())
+    if sys.argv[1:]: _attach_console()   # --help, CLI commands and --profile-startup print
+    ap = argparse.ArgumentParser(description=APP_TITLE)
+    ap.add_argument("--profile-startup", action="store_true",
+                    help="print import/init timings up to first paint (also saved as startup_profile.json)")
+    cmd = ap.add_argument_group("command line (no window)").add_mutually_exclusive_group()
+    cmd.add_argument("--list", action="store_true", help="list the experiments")
+    cmd.add_argument("--open", metavar="EXP", help="open an experiment in GNU Radio Companion (name, file or stem)")
+    cmd.add_argument("--run", metavar="EXP", help="run an experiment without the editor")
+    cmd.add_argument("--blank", action="store_true", help="open GNU Radio Companion without a flowgraph")
+    cmd.add_argument("--doctor", action="store_true", help="check GNU Radio, the experiments folder and dependencies")
+    ap.add_argument("--json", action="store_true", help="machine-readable output for the commands above")
+    ap.add_argument("--new-instance", action="store_true", help="don't hand over to an already running launcher")
+    a, qt_args = ap.parse_known_args()
+    if a.list or a.open or a.run or a.blank or a.doctor:
+        sys.exit(cli(a))
+    if a.json: ap.error("--json needs --list/--open/--run/--blank/--doctor")
+    single = single_instance_enabled() and not a.new_instance
+    if single and (forward_to_instance({"cmd": "show"}) or {}).get("ok"):
+        sys.exit(0)   # the running window came to the front
+    # Run as a script this module is __main__; make `import virtual_lab_launcher` find it
+    # instead of loading a second copy (with its own process supervisor and sessions).
+    sys.modules.setdefault("virtual_lab_launcher", sys.modules[__name__])
+    import PySide6.QtWidgets  # noqa: F401  (timed on its own)
+    startup_mark("import PySide6")
+    import lab_window
+    startup_mark("import lab_window")
+    sys.exit(lab_window.run([sys.argv[0]] + qt_args, a.profile_startup, single))
 
 if __name__ == "__main__":
     main()
@@ -1,42 +1,150 @@
-# make_installer_assets.py
-from PIL import Image, ImageMath
+# make_installer_assets.py — installer icon, wizard bitmaps and header logos from assets/mmt_logo.png
+#
+# Incremental: each output is recorded in assets/.asset_manifest.json with the
+# hash of the source PNG and of its spec (size, format, scale). An output is
+# only rendered again when one of those changed or the file is gone, so a
+# rebuild with nothing changed writes nothing. Everything that has to be
+# rendered (every icon size, every bitmap) is resized in parallel from one
+# decode of the source; alpha is premultiplied with one numpy operation.
+#
+# Hi-DPI: --scales 1,2 (the default) also writes @2x variants: the wizard
+# bitmaps (Inno Setup 6 picks by DPI from "WizardImageFile=a.bmp,a@2x.bmp")
+# and the launcher's header logo (launcher/assets/mmt_logo_header[@2x].png,
+# LOGO_HEIGHT tall, used as-is instead of scaling the big PNG at start-up).
+#
+#   python make_installer_assets.py [--force] [--scales 1,2] [--jobs N]
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-ASSETS = Path("assets")
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent
+ASSETS = ROOT / "assets"
 SRC = ASSETS / "mmt_logo.png"
-ASSETS.mkdir(exist_ok=True)
+MANIFEST = ASSETS / ".asset_manifest.json"
+RECIPE = 2                                  # bump when the rendering below changes
+LOGO_HEIGHT = 120                           # keep in step with lab_window.LOGO_HEIGHT
+
+ICO_SIZES = (256, 128, 64, 48, 32, 16)
+# name -> (directory, format, (w, h) at 1x or None to keep aspect at height h, premultiply, scalable)
+OUTPUTS = {
+    "cots.ico":            (ASSETS, "ICO", None, False, False),
+    "wizard-big.bmp":      (ASSETS, "BMP", (240, 459), True, True),
+    "wizard-small.bmp":    (ASSETS, "BMP", (147, 147), True, True),
+    "mmt_logo_header.png": (ROOT / "launcher" / "assets", "PNG", (None, LOGO_HEIGHT), False, True),
+}
 
-if not SRC.exists():
-    raise FileNotFoundError(f"Put your PNG at {SRC}")
 
 def premultiply_alpha(img: Image.Image) -> Image.Image:
-    """Return an RGBA image with premultiplied RGB (better for Inno alpha)."""
-    img = img.convert("RGBA")
-    r, g, b, a = img.split()
-    r = ImageMath.eval("convert(r*a/255, 'L')", r=r, a=a)
-    g = ImageMath.eval("convert(g*a/255, 'L')", g=g, a=a)
-    b = ImageMath.eval("convert(b*a/255, 'L')", b=b, a=a)
-    return Image.merge("RGBA", (r, g, b, a))
-
-# Load once
-base = Image.open(SRC).convert("RGBA")
-
-# --- 1) ICO for installer/uninstaller/app icon (multi-size) ---
-sizes = [(256,256),(128,128),(64,64),(48,48),(32,32),(16,16)]
-ico_out = ASSETS / "cots.ico"
-base.save(ico_out, sizes=sizes)
-print(f"✔ wrote {ico_out}")
-
-# --- 2) Wizard images (BMP) ---
-# Big left banner (good hi-DPI size)
-big_size = (240, 459)
-small_size = (147, 147)
-
-def save_bmp(out_path: Path, size):
-    im = base.resize(size, Image.LANCZOS)
-    im = premultiply_alpha(im)
-    im.save(out_path, format="BMP")
-    print(f"✔ wrote {out_path}")
-
-save_bmp(ASSETS / "wizard-big.bmp", big_size)
-save_bmp(ASSETS / "wizard-small.bmp", small_size)
+    """RGBA image with premultiplied RGB (better for Inno alpha)."""
+    px = np.array(img.convert("RGBA"), dtype=np.uint16)
+    px[..., :3] = px[..., :3] * px[..., 3:] // 255
+    return Image.fromarray(px.astype(np.uint8), "RGBA")
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+    return h.hexdigest()
+
+
+def _at(name: str, scale: int) -> str:
+    stem, ext = name.rsplit(".", 1)
+    return name if scale == 1 else f"{stem}@{scale}x.{ext}"
+
+
+def plan(scales) -> dict:
+    """Output path -> spec, for every output at every requested scale."""
+    out = {}
+    for name, (folder, fmt, size, pm, scalable) in OUTPUTS.items():
+        for s in (scales if scalable else (1,)):
+            spec = {"format": fmt, "premultiply": pm, "recipe": RECIPE}
+            if size: spec["size"] = [v * s if v else None for v in size]
+            else: spec["sizes"] = list(ICO_SIZES)
+            out[folder / _at(name, s)] = spec
+    return out
+
+
+def _spec_key(spec: dict) -> str:
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _load_manifest() -> dict:
+    try: return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    except (OSError, ValueError): return {}
+
+
+def _fresh(path: Path, rec: dict | None, src_hash: str, key: str) -> bool:
+    if not rec or rec.get("src") != src_hash or rec.get("spec") != key: return False
+    try: return path.stat().st_size == rec.get("bytes")
+    except OSError: return False
+
+
+def _resize(base: Image.Image, size) -> Image.Image:
+    w, h = size
+    if w is None: w = max(1, round(base.width * h / base.height))
+    return base.resize((w, h), Image.LANCZOS)
+
+
+def _save(img: Image.Image, path: Path, fmt: str, **kw):
+    # Write next to the target and rename, so an interrupted run never leaves half a file
+    tmp = path.with_name(path.name + ".tmp")
+    img.save(tmp, format=fmt, **kw)
+    os.replace(tmp, path)
+
+
+def build(force=False, scales=(1, 2), jobs=None) -> list[Path]:
+    """Render the outputs that are missing or stale; returns the paths written."""
+    if not SRC.exists():
+        raise FileNotFoundError(f"Put your PNG at {SRC}")
+    src_hash = _sha256(SRC)
+    manifest = _load_manifest()
+    todo = {p: s for p, s in plan(scales).items()
+            if force or not _fresh(p, manifest.get(p.relative_to(ROOT).as_posix()), src_hash, _spec_key(s))}
+    if not todo: return []
+
+    base = Image.open(SRC).convert("RGBA"); base.load()
+    # One task per image to resize: every ICO size and every bitmap/logo (Pillow's resample runs without the GIL)
+    tasks = {(p, tuple(sz)): sz for p, s in todo.items()
+             for sz in ([(n, n) for n in s["sizes"]] if "sizes" in s else [s["size"]])}
+    with ThreadPoolExecutor(max_workers=jobs or min(len(tasks), os.cpu_count() or 1)) as ex:
+        imgs = dict(zip(tasks, ex.map(lambda sz: _resize(base, sz), tasks.values())))
+
+    written = []
+    for path, spec in todo.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if "sizes" in spec:
+            frames = [imgs[(path, (n, n))] for n in spec["sizes"]]
+            _save(frames[0], path, "ICO", sizes=[f.size for f in frames], append_images=frames[1:])
+        else:
+            img = imgs[(path, tuple(spec["size"]))]
+            _save(premultiply_alpha(img) if spec["premultiply"] else img, path, spec["format"])
+        manifest[path.relative_to(ROOT).as_posix()] = {"src": src_hash, "spec": _spec_key(spec), "bytes": path.stat().st_size}
+        written.append(path)
+    tmp = MANIFEST.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8"); os.replace(tmp, MANIFEST)
+    return written
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Build the installer icon, wizard bitmaps and header logos.")
+    ap.add_argument("--force", action="store_true", help="render everything, ignoring the manifest")
+    ap.add_argument("--scales", default="1,2", help="hi-DPI scales for bitmaps and the header logo (default 1,2)")
+    ap.add_argument("--jobs", type=int, default=None, help="parallel resizes (default: one per core)")
+    a = ap.parse_args(argv)
+    scales = sorted({int(s) for s in a.scales.split(",") if s.strip()} | {1})
+    written = build(a.force, scales, a.jobs)
+    for p in written: print(f"✔ wrote {p.relative_to(ROOT)}")
+    if not written: print("assets up to date")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())